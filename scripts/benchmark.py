@@ -0,0 +1,226 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+#     "jinja2>=3.0",
+# ]
+# ///
+"""
+Benchmark the repository scripts against synthetic corpora of growing size.
+
+For every corpus size, a synthetic corpus is generated (or reused) with
+generate_synthetic_corpus.py. Each script then runs as a subprocess with
+KB_PROJECTS_DIR pointing at that corpus, and its wall time, CPU time and
+peak RSS are recorded, along with the per-stage breakdown each script reports
+through instrumentation.py. Results are written as JSON (one file per run,
+named after the current commit) so regressions can be tracked across
+commits.
+
+Usage:
+    ./scripts/benchmark.py                                # 10, 1k, 10k, 100k projects
+    ./scripts/benchmark.py --sizes 10 1000 --repeat 3
+    ./scripts/benchmark.py --only research_status         # Benchmarks whose name contains this
+    ./scripts/benchmark.py --compare tmp/bench/old.json   # Print ratios against an earlier run
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from generate_synthetic_corpus import DEFAULT_OUTPUT as CORPUS_DIR, generate_corpus, project_name
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+RESULTS_DIR = REPO_ROOT / "tmp" / "bench"
+
+DEFAULT_SIZES = [10, 1_000, 10_000, 100_000]
+RESULTS_SCHEMA_VERSION = 1
+
+
+def benchmarks(output_dir: Path) -> list[tuple[str, list[str]]]:
+    """(name, argv) for every script mode; report output goes to output_dir."""
+    first = project_name(0)
+    snapshot = str(output_dir / "corpus.snapshot")
+    return [
+        ("verify_yamls", ["verify_yamls.py"]),
+        ("research_status", ["research_status.py"]),
+        ("research_status --project", ["research_status.py", "--project", first]),
+        ("research_status --project -v", ["research_status.py", "--project", first, "--verbose"]),
+        ("research_status --checklist", ["research_status.py", "--checklist", "cli-flags"]),
+        ("research_status --missing", ["research_status.py", "--missing"]),
+        # First run builds the query index for this corpus, the second reuses it
+        ("research_status --query (cold)", ["research_status.py", "--query", "integration_types = cli", "--format", "names"]),
+        ("research_status --query (warm)", ["research_status.py", "--query", "integration_types = cli", "--format", "names"]),
+        ("reports --format md", ["regenerate_comparison_tables_and_reports.py", "--format", "md", "-o", str(output_dir)]),
+        ("reports --format json", ["regenerate_comparison_tables_and_reports.py", "--format", "json", "-o", str(output_dir)]),
+        ("reports --format html", ["regenerate_comparison_tables_and_reports.py", "--format", "html", "-o", str(output_dir)]),
+        ("approach pages", ["generate_approach_pages.py", "-o", str(output_dir / "approaches")]),
+        # The snapshot is written once, then the same views start from it
+        ("snapshot", ["snapshot_corpus.py", "-o", snapshot]),
+        ("snapshot: research_status", ["research_status.py", "--snapshot", snapshot]),
+        ("snapshot: research_status --project", ["research_status.py", "--snapshot", snapshot, "--project", first]),
+        ("snapshot: reports --format json", ["regenerate_comparison_tables_and_reports.py", "--snapshot", snapshot,
+                                             "--format", "json", "-o", str(output_dir)]),
+    ]
+
+
+def run_once(argv: list[str], env: dict[str, str], timeout: float) -> dict[str, Any]:
+    """Run one script and return wall/CPU seconds, peak RSS, exit status and its own stage timings."""
+    # stderr goes to a file so a chatty script cannot block on a full pipe
+    with tempfile.TemporaryFile() as err, tempfile.NamedTemporaryFile("r", suffix=".jsonl") as timings:
+        env = dict(env, KB_TIMINGS_JSON=timings.name)
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, str(SCRIPTS_DIR / argv[0]), *argv[1:]], env=env,
+                                stdout=subprocess.DEVNULL, stderr=err)
+        deadline = started + timeout
+        while True:
+            # wait4 reports this child's own rusage (getrusage(RUSAGE_CHILDREN) would accumulate)
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() > deadline:
+                proc.kill()
+                os.wait4(proc.pid, 0)
+                return {"wall_s": None, "timed_out": True}
+            time.sleep(0.005)
+        wall = time.perf_counter() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        stderr = err.read().decode(errors="replace")
+        lines = timings.read().splitlines()
+        stages = json.loads(lines[-1])["stages"] if lines else []
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_kib = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return {
+        "wall_s": round(wall, 4),
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 4),
+        "max_rss_mib": round(rss_kib / 1024, 1),
+        "exit_code": proc.returncode,
+        "stderr_tail": stderr.strip().splitlines()[-1] if proc.returncode and stderr.strip() else None,
+        "stages": {s["stage"]: s["wall_s"] for s in stages if s["stage"] != "total"},
+    }
+
+
+def summarize(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    ok = [r for r in runs if r.get("wall_s") is not None]
+    if not ok:
+        return {"timed_out": True, "runs": len(runs)}
+    walls = [r["wall_s"] for r in ok]
+    return {
+        "runs": len(runs),
+        "wall_s_min": min(walls),
+        "wall_s_median": round(statistics.median(walls), 4),
+        "cpu_s_median": round(statistics.median(r["cpu_s"] for r in ok), 4),
+        "max_rss_mib": max(r["max_rss_mib"] for r in ok),
+        "exit_code": ok[-1]["exit_code"],
+        "error": next((r["stderr_tail"] for r in ok if r.get("stderr_tail")), None),
+        # Per-stage wall seconds reported by the script itself (see instrumentation.py), median over runs
+        "stages_wall_s": {name: round(statistics.median(r["stages"].get(name, 0.0) for r in ok), 4)
+                          for name in ok[-1]["stages"]},
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "-C", str(REPO_ROOT), "rev-parse", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def load_previous(path: Path) -> dict[tuple[int, str], float]:
+    data = json.loads(path.read_text())
+    return {(r["size"], r["benchmark"]): r["wall_s_median"]
+            for r in data.get("results", []) if r.get("wall_s_median") is not None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scripts on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Corpus sizes (projects)")
+    parser.add_argument("--repeat", "-r", type=int, default=1, help="Runs per benchmark (median is reported)")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text")
+    parser.add_argument("--timeout", type=float, default=1800, help="Per-run timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic corpus seed")
+    parser.add_argument("--output", "-o", type=Path, help="Results JSON path (default: tmp/bench/{commit}-{time}.json)")
+    parser.add_argument("--compare", type=Path, metavar="JSON", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    previous = load_previous(args.compare) if args.compare else {}
+    results = []
+
+    table = Table(title="Benchmarks")
+    table.add_column("Projects", justify="right")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("CPU (s)", justify="right")
+    table.add_column("Peak RSS (MiB)", justify="right")
+    if previous:
+        table.add_column("vs. baseline", justify="right")
+
+    report_dir = Path(tempfile.mkdtemp(prefix="kb-bench-"))
+    try:
+        for size in args.sizes:
+            corpus = CORPUS_DIR / str(size)
+            started = time.perf_counter()
+            if generate_corpus(size, corpus, seed=args.seed):
+                console.print(f"[dim]Generated {size} projects in {time.perf_counter() - started:.1f}s[/dim]")
+            env = dict(os.environ, KB_PROJECTS_DIR=str(corpus))
+
+            for name, argv in benchmarks(report_dir / str(size)):
+                if args.only and args.only not in name:
+                    continue
+                summary = summarize([run_once(argv, env, args.timeout) for _ in range(args.repeat)])
+                results.append({"size": size, "benchmark": name, **summary})
+
+                if summary.get("timed_out"):
+                    table.add_row(str(size), name, "[red]timeout[/red]", "", "")
+                    continue
+                wall = f"{summary['wall_s_median']:.3f}"
+                if summary["exit_code"]:
+                    wall += f" [red](exit {summary['exit_code']})[/red]"
+                row = [f"{size:,}", name, wall, f"{summary['cpu_s_median']:.3f}", f"{summary['max_rss_mib']:.0f}"]
+                if previous:
+                    before = previous.get((size, name))
+                    row.append(f"{summary['wall_s_median'] / before:.2f}×" if before else "–")
+                table.add_row(*row)
+    finally:
+        shutil.rmtree(report_dir, ignore_errors=True)
+
+    console.print(table)
+
+    output = args.output or RESULTS_DIR / f"{(commit or 'unknown')[:12]}-{datetime.now():%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "commit": commit,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }, indent=2) + "\n")
+    console.print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
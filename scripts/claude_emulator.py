@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+A stand-in `claude` executable for measuring the CLI integration approaches.
+
+It accepts the command lines the approaches in generate_approach_pages.py
+document and answers with canned text, but with realistic timing: a startup
+delay, a time to first token, a token rate and a number of agent turns per
+request. Nothing is sent anywhere. cli_latency_lab.py puts it on PATH as
+`claude` and drives it the way each approach does.
+
+    claude_emulator.py -p "prompt"                                    # text
+    claude_emulator.py -p "prompt" --output-format json               # one result object
+    claude_emulator.py -p --output-format stream-json --verbose       # prompt on stdin, NDJSON events
+    claude_emulator.py --input-format stream-json --output-format stream-json --verbose
+                                                                      # persistent: one user message per line
+
+Timing comes from the environment, so the callers' command lines stay as
+documented:
+
+    CLAUDE_EMULATOR_STARTUP_MS          process startup before any output (default 400)
+    CLAUDE_EMULATOR_FIRST_TOKEN_MS      per turn, before the first token (default 250)
+    CLAUDE_EMULATOR_TOKENS_PER_SECOND   output token rate (default 80)
+    CLAUDE_EMULATOR_OUTPUT_TOKENS       tokens per assistant turn (default 40)
+    CLAUDE_EMULATOR_TURNS               agent turns per request; --max-turns caps it (default 1)
+
+Only the standard library is used so that interpreter startup, not imports,
+is the floor of every spawn.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+
+WORDS = ("the", "change", "keeps", "the", "request", "path", "short", "and", "moves", "parsing",
+         "into", "a", "helper", "so", "each", "caller", "reuses", "it")
+
+
+def env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+STARTUP_MS = env_number("CLAUDE_EMULATOR_STARTUP_MS", 400)
+FIRST_TOKEN_MS = env_number("CLAUDE_EMULATOR_FIRST_TOKEN_MS", 250)
+TOKENS_PER_SECOND = env_number("CLAUDE_EMULATOR_TOKENS_PER_SECOND", 80)
+OUTPUT_TOKENS = int(env_number("CLAUDE_EMULATOR_OUTPUT_TOKENS", 40))
+TURNS = int(env_number("CLAUDE_EMULATOR_TURNS", 1))
+
+
+def parse_args(argv: list[str]) -> dict:
+    """The flags that change behaviour; everything else (--model, --verbose, ...) is accepted and ignored."""
+    args = {"print": False, "prompt": None, "input_format": "text", "output_format": "text", "max_turns": None}
+    takes_value = {"--model", "--system-prompt", "--append-system-prompt", "--allowedTools", "--disallowedTools",
+                   "--permission-mode", "--mcp-config", "--resume", "--session-id", "--cwd", "--add-dir"}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-p", "--print"):
+            args["print"] = True
+            if i + 1 < len(argv) and not argv[i + 1].startswith("-"):
+                args["prompt"] = argv[i + 1]
+                i += 1
+        elif arg in ("--input-format", "--output-format", "--max-turns") and i + 1 < len(argv):
+            args[arg[2:].replace("-", "_")] = argv[i + 1]
+            i += 1
+        elif arg in takes_value:
+            i += 1
+        elif not arg.startswith("-"):
+            args["prompt"] = arg
+        i += 1
+    if args["max_turns"] is not None:
+        args["max_turns"] = int(args["max_turns"])
+    return args
+
+
+def emit(event: dict):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def prompt_text(message: dict) -> str:
+    content = message.get("message", {}).get("content", "")
+    if isinstance(content, list):
+        return " ".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return str(content)
+
+
+def generate(tokens: int) -> str:
+    """Wait as long as producing `tokens` tokens would take and return that much text."""
+    time.sleep(FIRST_TOKEN_MS / 1000 + (tokens / TOKENS_PER_SECOND if TOKENS_PER_SECOND > 0 else 0))
+    return " ".join(WORDS[i % len(WORDS)] for i in range(tokens))
+
+
+def respond(prompt: str, turns: int, session_id: str, stream: bool) -> dict:
+    """Run one request; stream its events if asked, and return the result event."""
+    started = time.perf_counter()
+    text = ""
+    for turn in range(1, turns + 1):
+        text = generate(OUTPUT_TOKENS)
+        content = [{"type": "text", "text": text}]
+        tool_id = f"toolu_{uuid.uuid4().hex[:24]}"
+        if turn < turns:
+            content.append({"type": "tool_use", "id": tool_id, "name": "Read", "input": {"file_path": "README.md"}})
+        if stream:
+            emit({"type": "assistant", "session_id": session_id,
+                  "message": {"role": "assistant", "content": content,
+                              "usage": {"input_tokens": len(prompt.split()), "output_tokens": OUTPUT_TOKENS}}})
+            if turn < turns:
+                emit({"type": "user", "session_id": session_id,
+                      "message": {"role": "user", "content": [
+                          {"type": "tool_result", "tool_use_id": tool_id, "content": "(emulated)"}]}})
+    return {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "result": text,
+        "session_id": session_id,
+        "num_turns": turns,
+        "duration_ms": round((time.perf_counter() - started) * 1000),
+        "total_cost_usd": 0.0,
+    }
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    turns = max(1, min(TURNS, args["max_turns"]) if args["max_turns"] else TURNS)
+    session_id = str(uuid.uuid4())
+    stream = args["output_format"] == "stream-json"
+
+    time.sleep(STARTUP_MS / 1000)
+    if stream:
+        emit({"type": "system", "subtype": "init", "session_id": session_id, "model": "emulator",
+              "tools": ["Read", "Write", "Edit", "Bash"]})
+
+    if args["input_format"] == "stream-json":
+        # Persistent mode: answer every user message until stdin closes
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if message.get("type") != "user":
+                continue
+            result = respond(prompt_text(message), turns, session_id, stream)
+            if stream:
+                emit(result)
+            else:
+                print(result["result"], flush=True)
+        return
+
+    prompt = args["prompt"] if args["prompt"] is not None else sys.stdin.read()
+    result = respond(prompt, turns, session_id, stream)
+    if stream:
+        emit(result)
+    elif args["output_format"] == "json":
+        print(json.dumps(result))
+    else:
+        print(result["result"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Measure the CLI integration approaches against a local `claude` emulator.
+
+Each subprocess approach from the taxonomy in generate_approach_pages.py is
+driven the way its example documents it, with claude_emulator.py on PATH as
+`claude`, so the numbers isolate what the integration pattern itself costs
+(process startup, per-request spawn, parallelism) from model latency:
+
+    persistent-subprocess           one process, one stream-json message per request
+    per-request-spawn-simple        `claude -p PROMPT` per request, text on stdout
+    per-request-spawn-structured    `claude --output-format stream-json -p` per request
+    multi-instance-orchestration    per-request spawns, --concurrency at a time
+
+Per approach: throughput, p50/p99 request latency (send to result) and the
+peak RSS of one claude process. Results are written as JSON; by default to
+reports/measurements/cli-latency.json, which generate_approach_pages.py
+publishes in approaches.md.
+
+    ./scripts/cli_latency_lab.py                                   # 40 requests per approach
+    ./scripts/cli_latency_lab.py --requests 200 --concurrency 8
+    ./scripts/cli_latency_lab.py --startup-ms 1500 --tokens-per-second 60 --turns 3
+    ./scripts/cli_latency_lab.py --only persistent -o /tmp/lab.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+EMULATOR = Path(__file__).parent / "claude_emulator.py"
+DEFAULT_OUTPUT = REPO_ROOT / "reports" / "measurements" / "cli-latency.json"
+RESULTS_SCHEMA_VERSION = 1
+
+PROMPT = "Explain the failing test in tests/test_auth.py"
+
+
+class Lab:
+    """Runs `claude` commands against the emulator and records each process's peak RSS."""
+
+    def __init__(self, bin_dir: Path, env: dict[str, str], turns: int = 1):
+        self.env = dict(env, PATH=f"{bin_dir}{os.pathsep}{env.get('PATH', '')}")
+        # Agent turns every approach runs per request, so their latencies compare
+        self.turns = turns
+        self.rss_kib: list[int] = []
+        self.lock = threading.Lock()
+
+    def spawn(self, argv: list[str], stdin_data: str | None = None) -> subprocess.Popen:
+        return subprocess.Popen(["claude", *argv], env=self.env, text=True,
+                                stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def reap(self, proc: subprocess.Popen):
+        # wait4 reports this child's own rusage (getrusage(RUSAGE_CHILDREN) would accumulate)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode:
+            raise RuntimeError(f"claude exited with {proc.returncode}")
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        with self.lock:
+            self.rss_kib.append(usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss)
+
+    def run(self, argv: list[str], stdin_data: str | None = None) -> str:
+        """Spawn, feed stdin, read stdout to EOF and reap; returns stdout."""
+        proc = self.spawn(argv, stdin_data)
+        if stdin_data is not None:
+            proc.stdin.write(stdin_data)
+            proc.stdin.close()
+        out = proc.stdout.read()
+        proc.stdout.close()
+        self.reap(proc)
+        return out
+
+
+def result_event(ndjson: str) -> dict[str, Any]:
+    for line in reversed(ndjson.splitlines()):
+        event = json.loads(line)
+        if event.get("type") == "result":
+            return event
+    raise RuntimeError("no result event in the stream-json output")
+
+
+# ── Approaches ───────────────────────────────────────────────────────────────
+# Each returns the latency in seconds of every request it sent.
+
+def run_persistent(lab: Lab, requests: int, concurrency: int) -> list[float]:
+    proc = lab.spawn(["--input-format", "stream-json", "--output-format", "stream-json", "--verbose",
+                      "--system-prompt", "You are a helpful coding assistant."], stdin_data="")
+    message = json.dumps({"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": PROMPT}]}})
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        proc.stdin.write(message + "\n")
+        proc.stdin.flush()
+        for line in proc.stdout:
+            if json.loads(line).get("type") == "result":
+                break
+        else:
+            raise RuntimeError("claude closed stdout before answering")
+        latencies.append(time.perf_counter() - started)
+    proc.stdin.close()
+    proc.stdout.read()
+    proc.stdout.close()
+    lab.reap(proc)
+    return latencies
+
+
+def run_simple(lab: Lab, requests: int, concurrency: int) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        if not lab.run(["--dangerously-skip-permissions", "-p", PROMPT]).strip():
+            raise RuntimeError("empty response")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_structured(lab: Lab, requests: int, concurrency: int) -> list[float]:
+    messages = json.dumps([{"role": "user", "content": PROMPT}])
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        result_event(lab.run(["--output-format", "stream-json", "--verbose", "--max-turns", str(lab.turns),
+                              "--disallowedTools", "Bash,Write,Edit", "-p"], stdin_data=messages))
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_multi_instance(lab: Lab, requests: int, concurrency: int) -> list[float]:
+    def one(_: int) -> float:
+        started = time.perf_counter()
+        result_event(lab.run(["--print", "--output-format", "stream-json", "--verbose",
+                              "--dangerously-skip-permissions", PROMPT]))
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+# (approach id in generate_approach_pages.APPROACHES, runner)
+APPROACH_RUNNERS: list[tuple[str, Callable[[Lab, int, int], list[float]]]] = [
+    ("persistent-subprocess", run_persistent),
+    ("per-request-spawn-simple", run_simple),
+    ("per-request-spawn-structured", run_structured),
+    ("multi-instance-orchestration", run_multi_instance),
+]
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def measure(approach: str, runner: Callable[[Lab, int, int], list[float]], bin_dir: Path, env: dict[str, str],
+            requests: int, concurrency: int, turns: int = 1) -> dict[str, Any]:
+    lab = Lab(bin_dir, env, turns)
+    started = time.perf_counter()
+    latencies = runner(lab, requests, concurrency)
+    wall = time.perf_counter() - started
+    return {
+        "approach": approach,
+        "requests": len(latencies),
+        "concurrency": concurrency if runner is run_multi_instance else 1,
+        "processes": len(lab.rss_kib),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_ms_p50": round(percentile(latencies, 50) * 1000, 1),
+        "latency_ms_p99": round(percentile(latencies, 99) * 1000, 1),
+        "process_rss_mib": round(max(lab.rss_kib) / 1024, 1),
+    }
+
+
+def install_shim(bin_dir: Path):
+    """Put the emulator on PATH as `claude`, run by this interpreter."""
+    shim = bin_dir / "claude"
+    shim.write_text(f"#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(str(EMULATOR))} \"$@\"\n")
+    shim.chmod(0o755)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the CLI integration approaches against a claude emulator")
+    parser.add_argument("--requests", "-n", type=int, default=40, help="Requests per approach")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Parallel instances for multi-instance")
+    parser.add_argument("--startup-ms", type=float, default=400, help="Emulated process startup")
+    parser.add_argument("--first-token-ms", type=float, default=250, help="Emulated time to first token, per turn")
+    parser.add_argument("--tokens-per-second", type=float, default=80, help="Emulated output token rate")
+    parser.add_argument("--output-tokens", type=int, default=40, help="Emulated tokens per assistant turn")
+    parser.add_argument("--turns", type=int, default=1, help="Emulated agent turns per request")
+    parser.add_argument("--only", help="Run only approaches whose id contains this text")
+    parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
+                        help="Results JSON path (default: reports/measurements/cli-latency.json)")
+    args = parser.parse_args()
+
+    if args.requests < 1 or args.concurrency < 1 or args.turns < 1:
+        parser.error("--requests, --concurrency and --turns must be at least 1")
+
+    emulator = {
+        "startup_ms": args.startup_ms,
+        "first_token_ms": args.first_token_ms,
+        "tokens_per_second": args.tokens_per_second,
+        "output_tokens": args.output_tokens,
+        "turns": args.turns,
+    }
+    env = dict(os.environ, **{f"CLAUDE_EMULATOR_{key.upper()}": str(value) for key, value in emulator.items()})
+
+    table = Table(title=f"CLI approaches against the emulator ({args.requests} requests each)")
+    table.add_column("Approach", style="cyan")
+    table.add_column("Throughput (req/s)", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    table.add_column("RSS/process (MiB)", justify="right")
+    table.add_column("Processes", justify="right")
+
+    results = []
+    bin_dir = Path(tempfile.mkdtemp(prefix="kb-claude-"))
+    try:
+        install_shim(bin_dir)
+        for approach, runner in APPROACH_RUNNERS:
+            if args.only and args.only not in approach:
+                continue
+            console.print(f"[dim]Running {approach}...[/dim]")
+            try:
+                r = measure(approach, runner, bin_dir, env, args.requests, args.concurrency, args.turns)
+            except (OSError, RuntimeError, ValueError) as e:
+                console.print(f"[red]{approach}: {e}[/red]")
+                continue
+            results.append(r)
+            table.add_row(approach, f"{r['throughput_rps']:.2f}", f"{r['latency_ms_p50']:.0f}",
+                          f"{r['latency_ms_p99']:.0f}", f"{r['process_rss_mib']:.1f}", str(r["processes"]))
+    finally:
+        shutil.rmtree(bin_dir, ignore_errors=True)
+
+    console.print(table)
+    if not results:
+        sys.exit(1)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "emulator": emulator,
+        "results": results,
+    }, indent=2) + "\n")
+    console.print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
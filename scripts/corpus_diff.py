@@ -0,0 +1,429 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+#     "jinja2>=3.0",
+# ]
+# ///
+"""
+Semantic diff of the corpus between two git refs, for reviewing PRs.
+
+Instead of raw YAML hunks this reports what changed in analysis terms:
+invocations and SDK usages added or removed, flags added to or dropped from
+an invocation, analysis_status promotions, references whose path or lines
+moved, and the comparison-matrix cells (comparison.md) that flip. A document
+that does not parse on either side is reported as a parse error and left out
+of the comparison, rather than read as empty.
+
+Nothing is checked out. `git diff-tree` lists the files under projects/
+whose blob differs between the refs, only those blobs are read (one
+`git cat-file --batch`), and each document is compared with its own
+counterpart: a changed cli.cli-integration.yaml cannot change a status or
+an SDK cell, so the cost follows the change set, not the corpus.
+
+    ./scripts/corpus_diff.py origin/main                  # origin/main..HEAD as Markdown
+    ./scripts/corpus_diff.py v1.0 v1.1 --format json
+    ./scripts/corpus_diff.py HEAD~10 -o tmp/review.md
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+
+from corpus_history import DOCUMENTS, NULL_SHA, YAML_LOADER, BlobReader, corpus_location, git, split_path
+from corpus_model import (
+    CliIntegration, CodeReference, CodeReferenceFile, Invocation, Project, ProjectMetadata, Reference,
+    SdkIntegration, SdkUsage,
+)
+from regenerate_comparison_tables_and_reports import (
+    KNOWN_FLAGS, KNOWN_PATTERNS, project_cli_flags, project_sdk_patterns,
+)
+
+console = Console(stderr=True)
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+
+DIFF_SCHEMA_VERSION = 2
+# analysis_status enum of specs/project.spec.yaml, least to most complete
+STATUS_ORDER = ["pending", "minimal", "in-progress", "comprehensive"]
+CODE_REFERENCE_SUFFIX = ".code-reference.yaml"
+
+
+@dataclass(slots=True)
+class Change:
+    project: str
+    # e.g. "invocation-added", "status-promoted", "reference-moved", "matrix-cell", "parse-error"
+    kind: str
+    # What changed: an invocation/usage/reference id, a field, a matrix column
+    subject: str = ""
+    before: Any = None
+    after: Any = None
+
+
+# ── Reading the two sides ────────────────────────────────────────────────────
+
+def resolve(root: Path, rev: str) -> str:
+    try:
+        return git(root, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}").strip()
+    except RuntimeError:
+        raise ValueError(f"unknown revision: {rev}") from None
+
+
+def changed_files(root: Path, prefix: str, base: str, head: str) -> dict[str, dict[str, tuple[str, str]]]:
+    """project -> file name -> (old blob, new blob); NULL_SHA on the side where the file is absent."""
+    out = git(root, "diff-tree", "-r", "-z", "--no-renames", base, head, "--", f"{prefix}/")
+    tokens = out.split("\0")
+    changed: dict[str, dict[str, tuple[str, str]]] = {}
+    for header, path in zip(tokens[0::2], tokens[1::2]):
+        parts = split_path(prefix, path)
+        if parts:
+            _, _, old, new, _ = header.lstrip(":").split()
+            changed.setdefault(parts[0], {})[parts[1]] = (old, new)
+    return changed
+
+
+def existing_projects(root: Path, rev: str, prefix: str, names: list[str]) -> set[str]:
+    """Which of names have a directory under prefix/ at rev."""
+    found = set()
+    # Chunked to stay under the argument length limit on very large change sets
+    for i in range(0, len(names), 500):
+        out = git(root, "ls-tree", "-z", "--name-only", rev, "--", *(f"{prefix}/{n}" for n in names[i:i + 500]))
+        found.update(path.rsplit("/", 1)[-1] for path in out.split("\0") if path)
+    return found
+
+
+def parse_blob(content: bytes) -> tuple[dict[str, Any] | None, str | None]:
+    """(document, None), or (None, the YAML error) for a blob that does not parse."""
+    try:
+        doc = yaml.load(content, Loader=YAML_LOADER)
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark or e.context_mark
+        return None, f"{e.problem or e.context}" + (f" (line {mark.line + 1})" if mark else "")
+    except yaml.YAMLError as e:
+        return None, str(e).splitlines()[0] if str(e) else type(e).__name__
+    return (doc if isinstance(doc, dict) else {}), None
+
+
+def parse_errors(name: str, files: dict[str, tuple[str, str]], errors: dict[str, str]) -> list[Change]:
+    """One change per file that does not parse on a side; before/after hold each side's error."""
+    return [Change(name, "parse-error", filename, errors.get(old), errors.get(new))
+            for filename, (old, new) in sorted(files.items()) if old in errors or new in errors]
+
+
+def side(name: str, files: dict[str, tuple[str, str]], documents: dict[str, Any], index: int) -> Project:
+    """The changed documents of one side (0 = base, 1 = head) as a partial Project."""
+    docs = {arg: documents.get(files[filename][index]) for filename, arg in DOCUMENTS.items() if filename in files}
+    return Project.from_documents(name, **docs)
+
+
+def code_reference_file(documents: dict[str, Any], sha: str) -> CodeReferenceFile | None:
+    doc = documents.get(sha)
+    return CodeReferenceFile.from_dict(doc) if isinstance(doc, dict) and doc else None
+
+
+# ── Comparing ────────────────────────────────────────────────────────────────
+
+def where(ref: Reference | CodeReference | None) -> str | None:
+    if not ref or not ref.path:
+        return None
+    if not ref.lines:
+        return ref.path
+    start, end = ref.lines[0], ref.lines[-1]
+    return f"{ref.path}:{start}" if start == end else f"{ref.path}:{start}-{end}"
+
+
+def edited(old: Any, new: Any, handled: set[str]) -> list[str]:
+    """Names of the remaining dataclass fields that differ."""
+    return [f.name for f in fields(old) if f.name not in handled and getattr(old, f.name) != getattr(new, f.name)]
+
+
+def by_id(entries: list[Any]) -> dict[str, Any]:
+    return {entry.id or f"#{i}": entry for i, entry in enumerate(entries)}
+
+
+def diff_keyed(name: str, what: str, old: list[Any], new: list[Any], compare) -> list[Change]:
+    """Added/removed entries by id; compare(old, new) reports what changed in the ones kept."""
+    old_by_id, new_by_id = by_id(old), by_id(new)
+    changes = [Change(name, f"{what}-removed", key, before=describe(entry))
+               for key, entry in old_by_id.items() if key not in new_by_id]
+    changes += [Change(name, f"{what}-added", key, after=describe(entry))
+                for key, entry in new_by_id.items() if key not in old_by_id]
+    for key, entry in old_by_id.items():
+        if key in new_by_id and entry != new_by_id[key]:
+            changes += compare(name, key, entry, new_by_id[key])
+    return changes
+
+
+def describe(entry: Invocation | SdkUsage | CodeReference) -> str | None:
+    if isinstance(entry, Invocation):
+        return entry.command_pattern or where(entry.reference)
+    if isinstance(entry, SdkUsage):
+        return entry.pattern or where(entry.reference)
+    return where(entry)
+
+
+def diff_reference(name: str, key: str, old: Reference | CodeReference | None,
+                   new: Reference | CodeReference | None) -> list[Change]:
+    before, after = where(old), where(new)
+    return [Change(name, "reference-moved", key, before, after)] if before != after else []
+
+
+def diff_invocation(name: str, key: str, old: Invocation, new: Invocation) -> list[Change]:
+    changes = []
+    old_flags, new_flags = {f.flag for f in old.flags_used}, {f.flag for f in new.flags_used}
+    if old_flags != new_flags:
+        changes.append(Change(name, "flags", key, sorted(old_flags - new_flags), sorted(new_flags - old_flags)))
+    if old.command_pattern != new.command_pattern:
+        changes.append(Change(name, "command-pattern", key, old.command_pattern, new.command_pattern))
+    changes += diff_reference(name, key, old.reference, new.reference)
+    if rest := edited(old, new, {"id", "flags_used", "command_pattern", "reference"}):
+        changes.append(Change(name, "invocation-edited", key, after=rest))
+    return changes
+
+
+def diff_usage(name: str, key: str, old: SdkUsage, new: SdkUsage) -> list[Change]:
+    changes = []
+    if old.pattern != new.pattern:
+        changes.append(Change(name, "pattern", key, old.pattern, new.pattern))
+    old_params, new_params = {p.name for p in old.parameters}, {p.name for p in new.parameters}
+    if old_params != new_params:
+        changes.append(Change(name, "parameters", key, sorted(old_params - new_params), sorted(new_params - old_params)))
+    changes += diff_reference(name, key, old.reference, new.reference)
+    if rest := edited(old, new, {"id", "pattern", "parameters", "reference"}):
+        changes.append(Change(name, "usage-edited", key, after=rest))
+    return changes
+
+
+def diff_code_reference(name: str, key: str, old: CodeReference, new: CodeReference) -> list[Change]:
+    changes = diff_reference(name, key, old, new)
+    if rest := edited(old, new, {"id", "path", "lines", "commit"}):
+        changes.append(Change(name, "code-reference-edited", key, after=rest))
+    return changes
+
+
+def status_direction(before: str | None, after: str | None) -> str:
+    if before in STATUS_ORDER and after in STATUS_ORDER:
+        return "promoted" if STATUS_ORDER.index(after) > STATUS_ORDER.index(before) else "demoted"
+    return "changed"
+
+
+def diff_metadata(name: str, old: ProjectMetadata | None, new: ProjectMetadata | None) -> list[Change]:
+    old, new = old or ProjectMetadata(), new or ProjectMetadata()
+    changes = []
+    if old.analysis_status != new.analysis_status:
+        changes.append(Change(name, f"status-{status_direction(old.analysis_status, new.analysis_status)}",
+                              "analysis_status", old.analysis_status, new.analysis_status))
+    if old.analyzed_commit != new.analyzed_commit:
+        changes.append(Change(name, "analyzed-commit", "analyzed_commit", old.analyzed_commit, new.analyzed_commit))
+    if rest := edited(old, new, {"analysis_status", "analyzed_commit"}):
+        changes.append(Change(name, "metadata-edited", after=rest))
+    return changes
+
+
+def diff_cli(name: str, old: CliIntegration | None, new: CliIntegration | None) -> list[Change]:
+    old, new = old or CliIntegration(), new or CliIntegration()
+    changes = []
+    if old.cli_integration_detected != new.cli_integration_detected:
+        changes.append(Change(name, "cli-detected", "cli_integration_detected",
+                              old.cli_integration_detected, new.cli_integration_detected))
+    return changes + diff_keyed(name, "invocation", old.invocations, new.invocations, diff_invocation)
+
+
+def diff_sdk(name: str, old: SdkIntegration | None, new: SdkIntegration | None) -> list[Change]:
+    old, new = old or SdkIntegration(), new or SdkIntegration()
+    changes = []
+    if old.sdk_integration_detected != new.sdk_integration_detected:
+        changes.append(Change(name, "sdk-detected", "sdk_integration_detected",
+                              old.sdk_integration_detected, new.sdk_integration_detected))
+    old_sdks, new_sdks = {s.name for s in old.sdks_used}, {s.name for s in new.sdks_used}
+    if old_sdks != new_sdks:
+        changes.append(Change(name, "sdks", "sdks_used", sorted(old_sdks - new_sdks), sorted(new_sdks - old_sdks)))
+    return changes + diff_keyed(name, "usage", old.sdk_usage, new.sdk_usage, diff_usage)
+
+
+def matrix_cells(name: str, old: Project, new: Project, files: dict[str, tuple[str, str]]) -> list[Change]:
+    """Cells of the comparison.md flag and pattern matrices that flip."""
+    changes = []
+    if "cli.cli-integration.yaml" in files:
+        before, after = project_cli_flags(old), project_cli_flags(new)
+        changes += [Change(name, "matrix-cell", flag, flag in before, flag in after)
+                    for flag in KNOWN_FLAGS if (flag in before) != (flag in after)]
+    if "sdk.sdk-integration.yaml" in files:
+        before, after = project_sdk_patterns(old), project_sdk_patterns(new)
+        changes += [Change(name, "matrix-cell", pattern, pattern in before, pattern in after)
+                    for pattern in KNOWN_PATTERNS if (pattern in before) != (pattern in after)]
+    return changes
+
+
+def diff_project(name: str, files: dict[str, tuple[str, str]], documents: dict[str, Any]) -> list[Change]:
+    old, new = side(name, files, documents, 0), side(name, files, documents, 1)
+    changes = []
+    if "metadata.project.yaml" in files:
+        changes += diff_metadata(name, old.metadata, new.metadata)
+    if "cli.cli-integration.yaml" in files:
+        changes += diff_cli(name, old.cli, new.cli)
+    if "sdk.sdk-integration.yaml" in files:
+        changes += diff_sdk(name, old.sdk, new.sdk)
+    for filename, (old_sha, new_sha) in sorted(files.items()):
+        if filename.endswith(CODE_REFERENCE_SUFFIX):
+            old_file, new_file = code_reference_file(documents, old_sha), code_reference_file(documents, new_sha)
+            changes += diff_keyed(name, "code-reference", old_file.references if old_file else [],
+                                  new_file.references if new_file else [], diff_code_reference)
+        elif filename == "notes.md":
+            changes.append(Change(name, "notes", filename))
+    return changes + matrix_cells(name, old, new, files)
+
+
+def corpus_diff(projects_dir: Path, base: str, head: str) -> dict[str, Any]:
+    root, prefix = corpus_location(projects_dir)
+    base_sha, head_sha = resolve(root, base), resolve(root, head)
+    changed = changed_files(root, prefix, base_sha, head_sha)
+
+    wanted = dict.fromkeys(
+        sha for files in changed.values() for filename, shas in files.items()
+        if filename in DOCUMENTS or filename.endswith(CODE_REFERENCE_SUFFIX)
+        for sha in shas if sha != NULL_SHA
+    )
+    documents: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    with BlobReader(root) as reader:
+        for sha, content in reader.read_many(list(wanted)):
+            documents[sha], error = parse_blob(content)
+            if error:
+                errors[sha] = error
+
+    names = sorted(changed)
+    before, after = existing_projects(root, base_sha, prefix, names), existing_projects(root, head_sha, prefix, names)
+    changes = []
+    for name in names:
+        # An unparsable side is reported as such; diffing it as an empty document would
+        # list every entry of the other side as removed or added
+        broken = parse_errors(name, changed[name], errors)
+        changes += broken
+        files = {filename: shas for filename, shas in changed[name].items()
+                 if filename not in {c.subject for c in broken}}
+        if name in before and name in after:
+            changes += diff_project(name, files, documents)
+            continue
+        # A whole project: its status and matrix cells, not a field-by-field listing
+        old, new = side(name, files, documents, 0), side(name, files, documents, 1)
+        kept = new if name in after else old
+        changes.append(Change(name, "project-added" if name in after else "project-removed",
+                              before=kept.metadata.analysis_status if kept.metadata and kept is old else None,
+                              after=kept.metadata.analysis_status if kept.metadata and kept is new else None))
+        changes += matrix_cells(name, old, new, files)
+
+    return {
+        "schema_version": DIFF_SCHEMA_VERSION,
+        "base": base,
+        "head": head,
+        "base_commit": base_sha,
+        "head_commit": head_sha,
+        "files_changed": sum(len(files) for files in changed.values()),
+        "projects_changed": len(names),
+        "changes": [asdict(c) for c in changes],
+    }
+
+
+# ── Markdown ─────────────────────────────────────────────────────────────────
+
+def code(value: Any) -> str:
+    return f"`{value}`" if value not in (None, "") else "-"
+
+
+def code_list(values: list[str]) -> str:
+    return ", ".join(f"`{v}`" for v in values)
+
+
+def change_line(c: dict[str, Any]) -> str:
+    kind, subject, before, after = c["kind"], c["subject"], c["before"], c["after"]
+    if kind in ("project-added", "project-removed"):
+        return f"**Project {kind.split('-')[1]}** (status {code(after if kind == 'project-added' else before)})"
+    if kind.startswith("status-"):
+        return f"**Status {kind.split('-')[1]}**: {code(before)} → {code(after)}"
+    if kind.endswith("-added"):
+        return f"{kind[:-6].replace('-', ' ').capitalize()} added: `{subject}` ({code(after)})"
+    if kind.endswith("-removed"):
+        return f"{kind[:-8].replace('-', ' ').capitalize()} removed: `{subject}` ({code(before)})"
+    if kind in ("flags", "parameters", "sdks"):
+        parts = [f"+{code_list(after)}" if after else "", f"−{code_list(before)}" if before else ""]
+        return f"`{subject}`: {kind} " + " ".join(p for p in parts if p)
+    if kind.endswith("-edited"):
+        return f"{('`' + subject + '`') if subject else kind[:-7].capitalize()}: edited {code_list(after)}"
+    if kind == "notes":
+        return "notes.md edited"
+    if kind == "parse-error":
+        broken = [f"{label}: {error}" for label, error in (("base", before), ("head", after)) if error]
+        return f"**`{subject}` does not parse**, not compared ({'; '.join(broken)})"
+    return f"`{subject}`: {kind.replace('-', ' ')} {code(before)} → {code(after)}"
+
+
+def render_markdown(diff: dict[str, Any]) -> str:
+    lines = [
+        f"# Corpus diff `{diff['base']}`..`{diff['head']}`",
+        "",
+        f"{diff['files_changed']} file(s) changed in {diff['projects_changed']} project(s)"
+        f" (`{diff['base_commit'][:8]}`..`{diff['head_commit'][:8]}`).",
+        "",
+    ]
+    changes = diff["changes"]
+    if not changes:
+        lines.append("No semantic changes.")
+        return "\n".join(lines) + "\n"
+
+    cells = [c for c in changes if c["kind"] == "matrix-cell"]
+    if cells:
+        lines += ["## Comparison Matrix", "", "| Project | Flag / Pattern | Before | After |",
+                  "|---------|----------------|:------:|:-----:|"]
+        lines += [f"| {c['project']} | `{c['subject']}` | {'✓' if c['before'] else '-'} | {'✓' if c['after'] else '-'} |"
+                  for c in cells]
+        lines.append("")
+
+    by_project: dict[str, list[dict[str, Any]]] = {}
+    for c in changes:
+        if c["kind"] != "matrix-cell":
+            by_project.setdefault(c["project"], []).append(c)
+    for name, project_changes in by_project.items():
+        lines += [f"## {name}", ""]
+        lines += [f"* {change_line(c)}" for c in project_changes]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic diff of projects/ between two git refs")
+    parser.add_argument("base", help="Base revision (e.g. origin/main)")
+    parser.add_argument("head", nargs="?", default="HEAD", help="Head revision (default: HEAD)")
+    parser.add_argument("--format", choices=["md", "json"], default="md", help="Output format")
+    parser.add_argument("--output", "-o", type=Path, help="Write to this file instead of stdout")
+    args = parser.parse_args()
+
+    try:
+        diff = corpus_diff(PROJECTS_DIR, args.base, args.head)
+    except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+
+    content = json.dumps(diff, indent=2) + "\n" if args.format == "json" else render_markdown(diff)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(content)
+        console.print(f"[green]Generated:[/green] {args.output}")
+    else:
+        sys.stdout.write(content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+#     "jinja2>=3.0",
+# ]
+# ///
+"""
+Trend reports built from the git history of projects/.
+
+summary.json describes the corpus as it is now; this replays every commit
+that touched projects/ (first-parent, oldest first) and records, after each
+one, how many projects are in each analysis_status and how many use each
+CLI flag and SDK pattern.
+
+The walk never checks anything out:
+
+* one `git log --raw` lists, per commit, the blob each changed file now
+  points to, so the tree at every commit is kept up to date incrementally;
+* every historical metadata/cli/sdk YAML blob is read through a single
+  long-lived `git cat-file --batch` process;
+* blobs are parsed once per distinct content hash, and a project's counts
+  are derived once per distinct combination of its blobs. A commit then
+  only adjusts the counters of the projects it touched.
+
+Output is history.json (one point per commit) and history.md (a Markdown
+trend section, also embedded in comparison.md by
+`regenerate_comparison_tables_and_reports.py --history`).
+
+    ./scripts/corpus_history.py                        # reports/generated/history.{json,md}
+    ./scripts/corpus_history.py --rev origin/main --format json
+    ./scripts/corpus_history.py --format md --top 5 -o /tmp/history
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+
+from corpus_model import Project
+from regenerate_comparison_tables_and_reports import project_cli_flags, project_sdk_patterns
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+GENERATED_DIR = REPO_ROOT / "reports" / "generated"
+
+HISTORY_SCHEMA_VERSION = 1
+# file name -> Project.from_documents() argument; other files only make a project exist
+DOCUMENTS = {
+    "metadata.project.yaml": "metadata",
+    "cli.cli-integration.yaml": "cli",
+    "sdk.sdk-integration.yaml": "sdk",
+}
+SKIP = {"_template"}
+NULL_SHA = "0" * 40
+# libyaml when available: history parses far more documents than one report
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SPARK = "▁▂▃▄▅▆▇█"
+SPARK_POINTS = 32
+
+
+@dataclass(slots=True)
+class Commit:
+    sha: str
+    timestamp: int
+    # path -> new blob SHA (NULL_SHA when deleted)
+    changes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectFacts:
+    status: str
+    flags: frozenset[str]
+    patterns: frozenset[str]
+
+
+# ── Git plumbing ─────────────────────────────────────────────────────────────
+
+def git(root: Path, *args: str) -> str:
+    # The status is checked here so that the error carries git's message, not just the exit status
+    result = subprocess.run(["git", "-C", str(root), *args], capture_output=True, text=True, check=False)
+    if result.returncode:
+        raise RuntimeError(f"git {args[0]}: {result.stderr.strip() or result.returncode}")
+    return result.stdout
+
+
+def corpus_location(projects_dir: Path) -> tuple[Path, str]:
+    """(repository top level, projects/ path inside it)."""
+    top = Path(git(projects_dir, "rev-parse", "--show-toplevel").strip())
+    return top, projects_dir.resolve().relative_to(top.resolve()).as_posix()
+
+
+def iter_commits(root: Path, prefix: str, rev: str) -> Iterator[Commit]:
+    """Commits touching prefix/, oldest first, with the blob every changed file now points to."""
+    proc = subprocess.Popen(
+        ["git", "-C", str(root), "log", "--first-parent", "--diff-merges=first-parent", "--reverse", "--root",
+         "--raw", "-z", "--no-renames", "--no-abbrev", "--format=%H %ct", rev, "--", f"{prefix}/"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    commit = None
+    raw_header = None
+    # -z output: "sha ts", then ":modes shas status" / path pairs, all NUL-separated
+    for token in proc.stdout.read().decode("utf-8", "surrogateescape").split("\0"):
+        token = token.lstrip("\n")
+        if raw_header is not None:
+            commit.changes[token] = raw_header.split()[3]
+            raw_header = None
+        elif token.startswith(":"):
+            raw_header = token
+        elif token:
+            if commit:
+                yield commit
+            sha, timestamp = token.split()
+            commit = Commit(sha, int(timestamp))
+    if proc.wait():
+        raise RuntimeError(f"git log: {proc.stderr.read().decode().strip()}")
+    if commit:
+        yield commit
+
+
+class BlobReader:
+    """One `git cat-file --batch` process for every blob read."""
+
+    def __init__(self, root: Path):
+        self.proc = subprocess.Popen(["git", "-C", str(root), "cat-file", "--batch"],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read_many(self, shas: list[str]) -> Iterator[tuple[str, bytes | None]]:
+        """(sha, content or None if missing), in order; requests are written while answers are read."""
+        def feed():
+            self.proc.stdin.write("".join(f"{sha}\n" for sha in shas).encode())
+            self.proc.stdin.flush()
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        for sha in shas:
+            header = self.proc.stdout.readline().split()
+            if len(header) < 3 or header[1] == b"missing":
+                yield sha, None
+                continue
+            content = self.proc.stdout.read(int(header[2]))
+            self.proc.stdout.read(1)
+            yield sha, content
+        writer.join()
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── Replay ───────────────────────────────────────────────────────────────────
+
+def parse_document(content: bytes | None) -> dict[str, Any] | None:
+    if content is None:
+        return None
+    try:
+        doc = yaml.load(content, Loader=YAML_LOADER)
+    except yaml.YAMLError:
+        return None
+    return doc if isinstance(doc, dict) else {}
+
+
+def project_facts(project: Project) -> ProjectFacts:
+    return ProjectFacts(
+        status=(project.metadata.analysis_status if project.metadata else None) or "pending",
+        flags=frozenset(project_cli_flags(project)),
+        patterns=frozenset(p for p in project_sdk_patterns(project) if p),
+    )
+
+
+def split_path(prefix: str, path: str) -> tuple[str, str] | None:
+    """(project, file name) for prefix/{project}/{file}, else None."""
+    parts = path[len(prefix) + 1:].split("/")
+    if len(parts) != 2 or parts[0] in SKIP:
+        return None
+    return parts[0], parts[1]
+
+
+def count(facts: ProjectFacts, counters: tuple[Counter, Counter, Counter], sign: int):
+    status, flags, patterns = counters
+    status[facts.status] += sign
+    for flag in facts.flags:
+        flags[flag] += sign
+    for pattern in facts.patterns:
+        patterns[pattern] += sign
+
+
+def point(commit: Commit, projects: int, counters: tuple[Counter, Counter, Counter]) -> dict[str, Any]:
+    status, flags, patterns = counters
+    return {
+        "commit": commit.sha,
+        "date": datetime.fromtimestamp(commit.timestamp, timezone.utc).isoformat(timespec="seconds"),
+        "projects": projects,
+        "analysis_status": {k: v for k, v in sorted(status.items()) if v},
+        "cli_flags": {k: v for k, v in sorted(flags.items()) if v},
+        "sdk_patterns": {k: v for k, v in sorted(patterns.items()) if v},
+    }
+
+
+def collect_history(projects_dir: Path = PROJECTS_DIR, rev: str = "HEAD") -> dict[str, Any]:
+    """Replay the history of projects_dir up to rev; returns the history.json document."""
+    started = time.perf_counter()
+    root, prefix = corpus_location(projects_dir)
+    commits = list(iter_commits(root, prefix, rev))
+
+    # Every distinct document blob, read and parsed once
+    wanted = dict.fromkeys(
+        sha for c in commits for path, sha in c.changes.items()
+        if sha != NULL_SHA and (parts := split_path(prefix, path)) and parts[1] in DOCUMENTS
+    )
+    with BlobReader(root) as reader:
+        documents = {sha: parse_document(content) for sha, content in reader.read_many(list(wanted))}
+
+    # project -> file name -> blob SHA, as of the commit being replayed
+    trees: dict[str, dict[str, str]] = {}
+    current: dict[str, ProjectFacts] = {}
+    facts_cache: dict[tuple[str | None, ...], ProjectFacts] = {}
+    counters = (Counter(), Counter(), Counter())
+    series = []
+    for commit in commits:
+        touched = set()
+        for path, sha in commit.changes.items():
+            parts = split_path(prefix, path)
+            if not parts:
+                continue
+            name, filename = parts
+            files = trees.setdefault(name, {})
+            if sha == NULL_SHA:
+                files.pop(filename, None)
+            else:
+                files[filename] = sha
+            touched.add(name)
+
+        for name in touched:
+            if name in current:
+                count(current.pop(name), counters, -1)
+            files = trees[name]
+            if not files:
+                del trees[name]
+                continue
+            key = tuple(files.get(filename) for filename in DOCUMENTS)
+            facts = facts_cache.get(key)
+            if facts is None:
+                docs = {arg: documents.get(sha) for sha, arg in zip(key, DOCUMENTS.values()) if sha}
+                facts = facts_cache[key] = project_facts(Project.from_documents(name, **docs))
+            current[name] = facts
+            count(facts, counters, +1)
+
+        if touched:
+            series.append(point(commit, len(current), counters))
+
+    return {
+        "schema_version": HISTORY_SCHEMA_VERSION,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "rev": rev,
+        "commits": len(series),
+        "blobs_parsed": len(documents),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "series": series,
+    }
+
+
+# ── Markdown ─────────────────────────────────────────────────────────────────
+
+def sparkline(values: list[int]) -> str:
+    """At most SPARK_POINTS blocks; each shows the last value of its slice of the series."""
+    if len(values) > SPARK_POINTS:
+        values = [values[(i + 1) * len(values) // SPARK_POINTS - 1] for i in range(SPARK_POINTS)]
+    top = max(values, default=0)
+    if not top:
+        return SPARK[0] * len(values)
+    return "".join(SPARK[v * (len(SPARK) - 1) // top] for v in values)
+
+
+def trend_table(series: list[dict[str, Any]], key: str, label: str, top: int | None) -> list[str]:
+    latest = series[-1][key]
+    names = sorted({n for p in series for n in p[key]}, key=lambda n: (-latest.get(n, 0), n))
+    hidden = len(names) - top if top and len(names) > top else 0
+    if hidden:
+        names = names[:top]
+    lines = [f"| {label} | First | Latest | Change | Trend |", "|---|---:|---:|---:|---|"]
+    for name in names:
+        values = [p[key].get(name, 0) for p in series]
+        lines.append(f"| `{name}` | {values[0]} | {values[-1]} | {values[-1] - values[0]:+d} | {sparkline(values)} |")
+    if hidden:
+        lines.append(f"\n*and {hidden} more*")
+    return lines
+
+
+def render_trend_section(history: dict[str, Any], top: int | None = 10) -> str:
+    series = history["series"]
+    if not series:
+        return "## Trends\n\nNo commits touch the projects directory yet.\n"
+    first, last = series[0], series[-1]
+    lines = [
+        "## Trends",
+        "",
+        f"{history['commits']} commit(s) touching projects/ between {first['date'][:10]} and {last['date'][:10]}"
+        f" (`{first['commit'][:8]}`..`{last['commit'][:8]}`). Counts are projects; each trend has one block"
+        f" per slice of the history.",
+        "",
+        f"**Projects**: {first['projects']} → {last['projects']} {sparkline([p['projects'] for p in series])}",
+        "",
+        "### Analysis Status",
+        "",
+        *trend_table(series, "analysis_status", "Status", None),
+        "",
+        "### CLI Flag Adoption",
+        "",
+        *trend_table(series, "cli_flags", "Flag", top),
+        "",
+        "### SDK Pattern Adoption",
+        "",
+        *trend_table(series, "sdk_patterns", "Pattern", top),
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def write_history(history: dict[str, Any], output_dir: Path, formats: Iterable[str], top: int | None = 10):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if "json" in formats:
+        path = output_dir / "history.json"
+        path.write_text(json.dumps(history, indent=1) + "\n")
+        console.print(f"[green]Generated:[/green] {path}")
+    if "md" in formats:
+        path = output_dir / "history.md"
+        path.write_text(f"# Corpus History\n\nGenerated: {history['generated_at']}\n\n"
+                        + render_trend_section(history, top))
+        console.print(f"[green]Generated:[/green] {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trend reports from the git history of projects/")
+    parser.add_argument("--rev", default="HEAD", help="Replay history up to this revision (default: HEAD)")
+    parser.add_argument("--format", choices=["json", "md", "all"], default="all", help="Output format")
+    parser.add_argument("--output", "-o", type=Path, default=GENERATED_DIR, help="Output directory")
+    parser.add_argument("--top", type=int, default=10, help="Flags and patterns listed in the trend tables")
+    args = parser.parse_args()
+
+    try:
+        history = collect_history(PROJECTS_DIR, args.rev)
+    except (RuntimeError, ValueError) as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    console.print(f"{history['commits']} commit(s), {history['blobs_parsed']} distinct blob(s) parsed "
+                  f"in {history['elapsed_s']:.2f} s")
+    write_history(history, args.output, ["json", "md"] if args.format == "all" else [args.format], args.top)
+
+
+if __name__ == "__main__":
+    main()
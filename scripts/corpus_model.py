@@ -0,0 +1,504 @@
+"""
+Typed in-memory model of the project corpus.
+
+One slotted dataclass per document and item type in specs/*.spec.yaml,
+built from parsed YAML with the from_dict() constructors. Keys the specs do
+not define are dropped, and missing optional fields become None or empty.
+The spec field `class` is stored as `cls`.
+
+Short, highly repeated strings (flag names, value types, languages,
+statuses, SDK names and patterns, repositories, commits, paths) are
+interned, so the thousands of copies in a large corpus share one object.
+
+Jinja templates can use these objects exactly like the dicts they replace
+(`p.metadata.repository`). spec_drift() lists spec fields the model does
+not carry, and verify_yamls.py reports it so the two stay in step.
+
+load_project()/load_projects() read a projects/{name}/ directory (all four
+spec types plus notes.md); every script that renders the corpus loads it
+through them, and links references with github_permalink().
+"""
+
+import sys
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+intern = sys.intern
+
+
+def text(value: Any) -> str | None:
+    """Optional scalar -> str (YAML may give numbers for versions etc.)."""
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def name(value: Any) -> str | None:
+    """Categorical scalar -> interned str."""
+    value = text(value)
+    return intern(value) if value is not None else None
+
+
+def names(values: Any) -> list[str]:
+    return [intern(v) if isinstance(v, str) else intern(str(v)) for v in values or [] if v is not None]
+
+
+def strings(values: Any) -> list[str]:
+    return [text(v) for v in values or [] if v is not None]
+
+
+def items(values: Any) -> list[dict[str, Any]]:
+    return [v for v in values or [] if isinstance(v, dict)]
+
+
+def lines_of(value: Any) -> list[int]:
+    return [v for v in value or [] if isinstance(v, int)] if isinstance(value, list) else []
+
+
+# ── Shared ───────────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Reference:
+    """A location in an analyzed repository (invocation/usage/import references)."""
+    repository: str | None = None
+    commit: str | None = None
+    path: str | None = None
+    lines: list[int] = field(default_factory=list)
+    function: str | None = None
+    cls: str | None = None
+    module: str | None = None
+    language: str | None = None
+    snippet: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: Any) -> "Reference | None":
+        if not isinstance(d, dict):
+            return None
+        return cls(
+            repository=name(d.get("repository")),
+            commit=name(d.get("commit")),
+            path=name(d.get("path")),
+            lines=lines_of(d.get("lines")),
+            function=text(d.get("function")),
+            cls=text(d.get("class")),
+            module=text(d.get("module")),
+            language=name(d.get("language")),
+            snippet=text(d.get("snippet")),
+        )
+
+
+# ── project.spec.yaml ────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class ProjectMetadata:
+    name: str | None = None
+    display_name: str | None = None
+    repository: str | None = None
+    description: str | None = None
+    analyzed_commit: str | None = None
+    analyzed_at: str | None = None
+    updated_at: str | None = None
+    website: str | None = None
+    documentation: str | None = None
+    license: str | None = None
+    primary_language: str | None = None
+    languages: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    integration_types: list[str] = field(default_factory=list)
+    analysis_status: str | None = None
+    notes: str | None = None
+    related_projects: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "ProjectMetadata":
+        return cls(
+            name=text(d.get("name")),
+            display_name=text(d.get("display_name")),
+            repository=name(d.get("repository")),
+            description=text(d.get("description")),
+            analyzed_commit=name(d.get("analyzed_commit")),
+            analyzed_at=text(d.get("analyzed_at")),
+            updated_at=text(d.get("updated_at")),
+            website=text(d.get("website")),
+            documentation=text(d.get("documentation")),
+            license=name(d.get("license")),
+            primary_language=name(d.get("primary_language")),
+            languages=names(d.get("languages")),
+            tags=names(d.get("tags")),
+            integration_types=names(d.get("integration_types")),
+            analysis_status=name(d.get("analysis_status")),
+            notes=text(d.get("notes")),
+            related_projects=names(d.get("related_projects")),
+        )
+
+
+# ── cli-integration.spec.yaml ────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Flag:
+    flag: str = ""
+    value_type: str | None = None
+    value_options: list[str] = field(default_factory=list)
+    purpose: str | None = None
+    checklist_ref: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "Flag":
+        return cls(
+            flag=name(d.get("flag")) or "",
+            value_type=name(d.get("value_type")),
+            value_options=names(d.get("value_options")),
+            purpose=text(d.get("purpose")),
+            checklist_ref=name(d.get("checklist_ref")),
+        )
+
+
+@dataclass(slots=True)
+class EnvironmentVariable:
+    name: str = ""
+    purpose: str | None = None
+    default: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "EnvironmentVariable":
+        return cls(name=name(d.get("name")) or "", purpose=text(d.get("purpose")), default=text(d.get("default")))
+
+
+@dataclass(slots=True)
+class Invocation:
+    id: str = ""
+    description: str | None = None
+    reference: Reference | None = None
+    command_pattern: str | None = None
+    flags_used: list[Flag] = field(default_factory=list)
+    snippet: str | None = None
+    environment_variables: list[EnvironmentVariable] = field(default_factory=list)
+    notes: str | None = None
+    related_invocations: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "Invocation":
+        return cls(
+            id=text(d.get("id")) or "",
+            description=text(d.get("description")),
+            reference=Reference.from_dict(d.get("reference")),
+            command_pattern=text(d.get("command_pattern")),
+            flags_used=[Flag.from_dict(f) for f in items(d.get("flags_used"))],
+            snippet=text(d.get("snippet")),
+            environment_variables=[EnvironmentVariable.from_dict(e) for e in items(d.get("environment_variables"))],
+            notes=text(d.get("notes")),
+            related_invocations=strings(d.get("related_invocations")),
+        )
+
+
+@dataclass(slots=True)
+class FlagSummary:
+    used: bool = False
+    invocation_ids: list[str] = field(default_factory=list)
+    notes: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: Any) -> "FlagSummary":
+        d = d if isinstance(d, dict) else {}
+        return cls(used=bool(d.get("used")), invocation_ids=strings(d.get("invocation_ids")), notes=text(d.get("notes")))
+
+
+@dataclass(slots=True)
+class CliIntegration:
+    project: str | None = None
+    cli_integration_detected: bool = False
+    summary: str | None = None
+    invocations: list[Invocation] = field(default_factory=list)
+    flags_summary: dict[str, FlagSummary] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "CliIntegration":
+        flags_summary = d.get("flags_summary")
+        return cls(
+            project=text(d.get("project")),
+            cli_integration_detected=bool(d.get("cli_integration_detected")),
+            summary=text(d.get("summary")),
+            invocations=[Invocation.from_dict(i) for i in items(d.get("invocations"))],
+            flags_summary={intern(str(k)): FlagSummary.from_dict(v) for k, v in flags_summary.items()}
+            if isinstance(flags_summary, dict) else {},
+        )
+
+
+# ── sdk-integration.spec.yaml ────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class SdkUsed:
+    name: str = ""
+    package: str | None = None
+    version_constraint: str | None = None
+    import_reference: Reference | None = None
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "SdkUsed":
+        return cls(
+            name=name(d.get("name")) or "",
+            package=name(d.get("package")),
+            version_constraint=text(d.get("version_constraint")),
+            import_reference=Reference.from_dict(d.get("import_reference")),
+        )
+
+
+@dataclass(slots=True)
+class Parameter:
+    name: str = ""
+    value_type: str | None = None
+    purpose: str | None = None
+    example_value: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "Parameter":
+        return cls(name=name(d.get("name")) or "", value_type=name(d.get("value_type")),
+                   purpose=text(d.get("purpose")), example_value=text(d.get("example_value")))
+
+
+@dataclass(slots=True)
+class SdkUsage:
+    id: str = ""
+    sdk: str | None = None
+    pattern: str | None = None
+    description: str | None = None
+    reference: Reference | None = None
+    api_methods: list[str] = field(default_factory=list)
+    parameters: list[Parameter] = field(default_factory=list)
+    snippet: str | None = None
+    notes: str | None = None
+    checklist_refs: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "SdkUsage":
+        return cls(
+            id=text(d.get("id")) or "",
+            sdk=name(d.get("sdk")),
+            pattern=name(d.get("pattern")),
+            description=text(d.get("description")),
+            reference=Reference.from_dict(d.get("reference")),
+            api_methods=names(d.get("api_methods")),
+            parameters=[Parameter.from_dict(p) for p in items(d.get("parameters"))],
+            snippet=text(d.get("snippet")),
+            notes=text(d.get("notes")),
+            checklist_refs=names(d.get("checklist_refs")),
+        )
+
+
+@dataclass(slots=True)
+class SdkIntegration:
+    project: str | None = None
+    sdk_integration_detected: bool = False
+    summary: str | None = None
+    sdks_used: list[SdkUsed] = field(default_factory=list)
+    sdk_usage: list[SdkUsage] = field(default_factory=list)
+    # Free-form nested feature flags; kept as parsed
+    agents_sdk_features: dict[str, Any] = field(default_factory=dict)
+    patterns_summary: dict[str, bool] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "SdkIntegration":
+        features = d.get("agents_sdk_features")
+        patterns = d.get("patterns_summary")
+        return cls(
+            project=text(d.get("project")),
+            sdk_integration_detected=bool(d.get("sdk_integration_detected")),
+            summary=text(d.get("summary")),
+            sdks_used=[SdkUsed.from_dict(s) for s in items(d.get("sdks_used"))],
+            sdk_usage=[SdkUsage.from_dict(u) for u in items(d.get("sdk_usage"))],
+            agents_sdk_features=features if isinstance(features, dict) else {},
+            patterns_summary={intern(str(k)): bool(v) for k, v in patterns.items()}
+            if isinstance(patterns, dict) else {},
+        )
+
+
+# ── code-reference.spec.yaml ─────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class CodeReference:
+    id: str = ""
+    title: str | None = None
+    description: str | None = None
+    claim: str | None = None
+    repository: str | None = None
+    commit: str | None = None
+    path: str | None = None
+    lines: list[int] = field(default_factory=list)
+    function: str | None = None
+    cls: str | None = None
+    module: str | None = None
+    language: str | None = None
+    snippet: str | None = None
+    highlights: list[dict[str, Any]] = field(default_factory=list)
+    notes: str | None = None
+    tags: list[str] = field(default_factory=list)
+    related_refs: list[str] = field(default_factory=list)
+    checklist_refs: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "CodeReference":
+        return cls(
+            id=text(d.get("id")) or "",
+            title=text(d.get("title")),
+            description=text(d.get("description")),
+            claim=text(d.get("claim")),
+            repository=name(d.get("repository")),
+            commit=name(d.get("commit")),
+            path=name(d.get("path")),
+            lines=lines_of(d.get("lines")),
+            function=text(d.get("function")),
+            cls=text(d.get("class")),
+            module=text(d.get("module")),
+            language=name(d.get("language")),
+            snippet=text(d.get("snippet")),
+            highlights=items(d.get("highlights")),
+            notes=text(d.get("notes")),
+            tags=names(d.get("tags")),
+            related_refs=strings(d.get("related_refs")),
+            checklist_refs=names(d.get("checklist_refs")),
+        )
+
+
+def github_permalink(ref: Reference | CodeReference) -> str:
+    """Build a GitHub permalink from a reference, or '' if it lacks a repository, commit or path."""
+    repo, commit, path = ref.repository, ref.commit, ref.path
+    if not repo or not commit or not path:
+        return ""
+    url = f"{repo}/blob/{commit}/{path}"
+    lines = ref.lines
+    if len(lines) >= 2:
+        url += f"#L{lines[0]}-L{lines[1]}"
+    elif len(lines) == 1:
+        url += f"#L{lines[0]}"
+    return url
+
+
+@dataclass(slots=True)
+class CodeReferenceFile:
+    project: str | None = None
+    topic: str | None = None
+    description: str | None = None
+    references: list[CodeReference] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "CodeReferenceFile":
+        return cls(
+            project=text(d.get("project")),
+            topic=text(d.get("topic")),
+            description=text(d.get("description")),
+            references=[CodeReference.from_dict(r) for r in items(d.get("references"))],
+        )
+
+
+# ── Aggregate ────────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Project:
+    """Everything known about one projects/{name}/ directory."""
+    name: str
+    metadata: ProjectMetadata | None = None
+    cli: CliIntegration | None = None
+    sdk: SdkIntegration | None = None
+    code_references: list[CodeReferenceFile] = field(default_factory=list)
+    notes: str = ""
+
+    @classmethod
+    def from_documents(cls, name: str, metadata: dict[str, Any] | None = None,
+                       cli: dict[str, Any] | None = None, sdk: dict[str, Any] | None = None,
+                       code_references: list[dict[str, Any]] | None = None, notes: str = "") -> "Project":
+        """Build from parsed YAML documents (None or {} = file missing, unreadable or empty)."""
+        return cls(
+            name=name,
+            metadata=ProjectMetadata.from_dict(metadata) if isinstance(metadata, dict) and metadata else None,
+            cli=CliIntegration.from_dict(cli) if isinstance(cli, dict) and cli else None,
+            sdk=SdkIntegration.from_dict(sdk) if isinstance(sdk, dict) and sdk else None,
+            code_references=[CodeReferenceFile.from_dict(d) for d in code_references or [] if isinstance(d, dict)],
+            notes=notes,
+        )
+
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+def load_yaml(path: Path) -> dict[str, Any] | None:
+    """Load and parse a YAML file."""
+    try:
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+    except (yaml.YAMLError, FileNotFoundError):
+        return None
+
+
+def load_documents(project_dir: Path) -> dict[str, Any]:
+    """Parsed documents of one project directory, as Project.from_documents() arguments."""
+    notes_path = project_dir / "notes.md"
+    return {
+        "metadata": load_yaml(project_dir / "metadata.project.yaml"),
+        "cli": load_yaml(project_dir / "cli.cli-integration.yaml"),
+        "sdk": load_yaml(project_dir / "sdk.sdk-integration.yaml"),
+        "code_references": [
+            doc for doc in map(load_yaml, sorted(project_dir.glob("*.code-reference.yaml"))) if doc
+        ],
+        # Free-form analysis notes (indexed by the HTML search)
+        "notes": notes_path.read_text() if notes_path.exists() else "",
+    }
+
+
+def load_project(project_dir: Path) -> Project:
+    return Project.from_documents(project_dir.name, **load_documents(project_dir))
+
+
+def load_projects(projects_dir: Path, skip: set[str] = frozenset()) -> list[Project]:
+    """Every project directory under projects_dir, sorted by name."""
+    if not projects_dir.exists():
+        return []
+    return [
+        load_project(project_dir)
+        for project_dir in sorted(projects_dir.iterdir())
+        if project_dir.is_dir() and project_dir.name not in skip
+    ]
+
+
+# spec type, dotted item path -> model class
+SPEC_CLASSES: dict[tuple[str, str], type] = {
+    ("project", ""): ProjectMetadata,
+    ("cli-integration", ""): CliIntegration,
+    ("cli-integration", "invocations"): Invocation,
+    ("cli-integration", "invocations.flags_used"): Flag,
+    ("cli-integration", "invocations.environment_variables"): EnvironmentVariable,
+    ("cli-integration", "flags_summary"): FlagSummary,
+    ("sdk-integration", ""): SdkIntegration,
+    ("sdk-integration", "sdks_used"): SdkUsed,
+    ("sdk-integration", "sdk_usage"): SdkUsage,
+    ("sdk-integration", "sdk_usage.parameters"): Parameter,
+    ("code-reference", ""): CodeReferenceFile,
+    ("code-reference", "references"): CodeReference,
+}
+
+
+def spec_fields(spec: dict[str, Any], path: str) -> dict[str, Any]:
+    """Field definitions of the object at a dotted item path of a spec."""
+    current = spec.get("fields", {})
+    for part in filter(None, path.split(".")):
+        entry = current.get(part, {})
+        current = entry.get("item_fields") or entry.get("value_fields") or entry.get("fields") or {}
+    return current
+
+
+def spec_drift(specs: dict[str, dict[str, Any]]) -> list[str]:
+    """Spec fields with no attribute on their model class, as 'spec:path.field' strings."""
+    missing = []
+    for (spec_type, path), model in SPEC_CLASSES.items():
+        spec = specs.get(spec_type)
+        if not spec:
+            continue
+        attributes = {f.name for f in fields(model)}
+        for field_name, definition in spec_fields(spec, path).items():
+            if not isinstance(definition, dict):
+                continue
+            attribute = "cls" if field_name == "class" else field_name
+            if attribute not in attributes:
+                missing.append(f"{spec_type}:{path + '.' if path else ''}{field_name}")
+    return missing
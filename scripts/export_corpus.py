@@ -0,0 +1,584 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Export the whole corpus into an indexed SQLite database for ad-hoc queries.
+
+Metadata, invocations, flags, environment variables, SDK usages and code
+references are normalized into one table each. The export is incremental:
+only projects whose YAML files changed since the last run are re-imported.
+
+Usage:
+    ./scripts/export_corpus.py                                  # Update reports/generated/corpus.sqlite
+    ./scripts/export_corpus.py --db /tmp/corpus.sqlite          # Custom database path
+    ./scripts/export_corpus.py --rebuild                        # Drop and re-import everything
+    ./scripts/export_corpus.py --parquet reports/generated/parquet/   # Also write one Parquet file per table
+    ./scripts/export_corpus.py --sql "SELECT project FROM invocation_flags WHERE flag = '--mcp-config'"
+
+Example question ("which projects use stream-json output together with --mcp-config?"):
+
+    SELECT DISTINCT f1.project
+    FROM invocation_flags f1
+    JOIN invocation_flags f2 ON f2.project = f1.project
+    JOIN invocations i ON i.project = f1.project AND i.invocation_id = f1.invocation_id
+    WHERE f1.flag = '--output-format' AND i.command_pattern LIKE '%stream-json%'
+      AND f2.flag = '--mcp-config'
+
+The Parquet option needs pyarrow: `uv run --with pyarrow scripts/export_corpus.py --parquet DIR`.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from corpus_model import Project
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+DEFAULT_DB = REPO_ROOT / "reports" / "generated" / "corpus.sqlite"
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    spec_type TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    spec_type TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    display_name TEXT,
+    repository TEXT,
+    description TEXT,
+    analyzed_commit TEXT,
+    analyzed_at TEXT,
+    updated_at TEXT,
+    license TEXT,
+    primary_language TEXT,
+    analysis_status TEXT,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS project_integration_types (
+    project TEXT NOT NULL,
+    integration_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_languages (
+    project TEXT NOT NULL,
+    language TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS invocations (
+    project TEXT NOT NULL,
+    invocation_id TEXT NOT NULL,
+    description TEXT,
+    command_pattern TEXT,
+    snippet TEXT,
+    notes TEXT,
+    ref_repository TEXT,
+    ref_commit TEXT,
+    ref_path TEXT,
+    ref_line_start INTEGER,
+    ref_line_end INTEGER,
+    ref_function TEXT,
+    ref_class TEXT,
+    ref_language TEXT
+);
+CREATE TABLE IF NOT EXISTS invocation_flags (
+    project TEXT NOT NULL,
+    invocation_id TEXT NOT NULL,
+    flag TEXT NOT NULL,
+    value_type TEXT,
+    purpose TEXT,
+    checklist_ref TEXT
+);
+CREATE TABLE IF NOT EXISTS invocation_env_vars (
+    project TEXT NOT NULL,
+    invocation_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    purpose TEXT,
+    default_value TEXT
+);
+CREATE TABLE IF NOT EXISTS sdks_used (
+    project TEXT NOT NULL,
+    name TEXT,
+    package TEXT,
+    version_constraint TEXT
+);
+CREATE TABLE IF NOT EXISTS sdk_usages (
+    project TEXT NOT NULL,
+    usage_id TEXT NOT NULL,
+    sdk TEXT,
+    pattern TEXT,
+    description TEXT,
+    snippet TEXT,
+    notes TEXT,
+    ref_repository TEXT,
+    ref_commit TEXT,
+    ref_path TEXT,
+    ref_line_start INTEGER,
+    ref_line_end INTEGER,
+    ref_function TEXT,
+    ref_class TEXT,
+    ref_language TEXT
+);
+CREATE TABLE IF NOT EXISTS sdk_usage_api_methods (
+    project TEXT NOT NULL,
+    usage_id TEXT NOT NULL,
+    method TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS code_references (
+    project TEXT NOT NULL,
+    file TEXT NOT NULL,
+    topic TEXT,
+    ref_id TEXT NOT NULL,
+    title TEXT,
+    claim TEXT,
+    repository TEXT,
+    "commit" TEXT,
+    path TEXT,
+    line_start INTEGER,
+    line_end INTEGER,
+    function TEXT,
+    class TEXT,
+    language TEXT,
+    snippet TEXT,
+    notes TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_files_project ON files(project);
+CREATE INDEX IF NOT EXISTS idx_documents_project ON documents(project);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(analysis_status);
+CREATE INDEX IF NOT EXISTS idx_projects_language ON projects(primary_language);
+CREATE INDEX IF NOT EXISTS idx_integration_types ON project_integration_types(integration_type, project);
+CREATE INDEX IF NOT EXISTS idx_languages ON project_languages(language, project);
+CREATE INDEX IF NOT EXISTS idx_invocations ON invocations(project, invocation_id);
+CREATE INDEX IF NOT EXISTS idx_flags_flag ON invocation_flags(flag, project);
+CREATE INDEX IF NOT EXISTS idx_flags_invocation ON invocation_flags(project, invocation_id);
+CREATE INDEX IF NOT EXISTS idx_env_vars_name ON invocation_env_vars(name, project);
+CREATE INDEX IF NOT EXISTS idx_sdks_used_name ON sdks_used(name, project);
+CREATE INDEX IF NOT EXISTS idx_sdk_usages_pattern ON sdk_usages(pattern, project);
+CREATE INDEX IF NOT EXISTS idx_api_methods ON sdk_usage_api_methods(method, project);
+CREATE INDEX IF NOT EXISTS idx_code_references_class ON code_references(class, project);
+CREATE INDEX IF NOT EXISTS idx_code_references_path ON code_references(path, project);
+"""
+
+# Tables holding rows derived from project YAML, cleared per project on re-import
+PROJECT_TABLES = {
+    "projects": "name",
+    "project_integration_types": "project",
+    "project_languages": "project",
+    "invocations": "project",
+    "invocation_flags": "project",
+    "invocation_env_vars": "project",
+    "sdks_used": "project",
+    "sdk_usages": "project",
+    "sdk_usage_api_methods": "project",
+    "code_references": "project",
+    "documents": "project",
+    "files": "project",
+}
+
+
+def load_yaml(path: Path) -> dict[str, Any] | None:
+    """Load and parse a YAML file."""
+    try:
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+    except (yaml.YAMLError, FileNotFoundError):
+        return None
+
+
+def get_spec_type_from_filename(filename: str) -> str | None:
+    """Extract spec type from filename pattern: name.{type}.yaml"""
+    parts = filename.rsplit(".", 2)
+    if len(parts) >= 3 and parts[-1] == "yaml":
+        return parts[-2]
+    return None
+
+
+def open_db(db_path: Path, rebuild: bool = False) -> sqlite3.Connection:
+    """Open (and if needed create) the export database."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if rebuild and db_path.exists():
+        db_path.unlink()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        conn.close()
+        db_path.unlink()
+        conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def project_file_stats(project_dir: Path) -> dict[str, tuple[int, int]]:
+    """Return {relative path: (mtime_ns, size)} for a project's YAML files and notes.md."""
+    stats = {}
+    for path in sorted([*project_dir.glob("*.yaml"), *project_dir.glob("notes.md")]):
+        st = path.stat()
+        stats[str(path.relative_to(PROJECTS_DIR.parent))] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def project_is_current(conn: sqlite3.Connection, project: str, stats: dict[str, tuple[int, int]]) -> bool:
+    """Check whether the database already holds this exact version of a project."""
+    rows = conn.execute(
+        "SELECT path, mtime_ns, size, sha256 FROM files WHERE project = ?", (project,)
+    ).fetchall()
+    stored = {path: (mtime_ns, size, sha) for path, mtime_ns, size, sha in rows}
+    if set(stored) != set(stats):
+        return False
+
+    for path, (mtime_ns, size) in stats.items():
+        old_mtime, old_size, old_sha = stored[path]
+        if size != old_size:
+            return False
+        if mtime_ns != old_mtime:
+            # Touched but possibly unchanged: fall back to a content hash
+            if hashlib.sha256((PROJECTS_DIR.parent / path).read_bytes()).hexdigest() != old_sha:
+                return False
+            conn.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (mtime_ns, path))
+    return True
+
+
+def delete_project(conn: sqlite3.Connection, project: str):
+    """Remove every row derived from a project."""
+    for table, column in PROJECT_TABLES.items():
+        conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (project,))
+
+
+def reference_columns(ref: dict[str, Any] | None) -> tuple:
+    """Flatten a reference object into (repository, commit, path, start, end, function, class, language)."""
+    ref = ref or {}
+    lines = ref.get("lines") or []
+    return (
+        ref.get("repository"),
+        ref.get("commit"),
+        ref.get("path"),
+        lines[0] if len(lines) >= 1 else None,
+        lines[-1] if len(lines) >= 1 else None,
+        ref.get("function"),
+        ref.get("class"),
+        ref.get("language"),
+    )
+
+
+def text(value: Any) -> str | None:
+    """Coerce optional scalar YAML values to text."""
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def import_metadata(conn: sqlite3.Connection, project: str, meta: dict[str, Any]):
+    conn.execute(
+        "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            project,
+            text(meta.get("display_name")),
+            text(meta.get("repository")),
+            text(meta.get("description")),
+            text(meta.get("analyzed_commit")),
+            text(meta.get("analyzed_at")),
+            text(meta.get("updated_at")),
+            text(meta.get("license")),
+            text(meta.get("primary_language")),
+            text(meta.get("analysis_status", "pending")),
+            text(meta.get("notes")),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO project_integration_types VALUES (?, ?)",
+        [(project, t) for t in meta.get("integration_types") or []],
+    )
+    conn.executemany(
+        "INSERT INTO project_languages VALUES (?, ?)",
+        [(project, lang) for lang in meta.get("languages") or []],
+    )
+
+
+def import_cli(conn: sqlite3.Connection, project: str, cli: dict[str, Any]):
+    for inv in cli.get("invocations") or []:
+        inv_id = inv.get("id", "unknown")
+        conn.execute(
+            "INSERT INTO invocations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project,
+                inv_id,
+                text(inv.get("description")),
+                text(inv.get("command_pattern")),
+                text(inv.get("snippet")),
+                text(inv.get("notes")),
+                *reference_columns(inv.get("reference")),
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO invocation_flags VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (project, inv_id, f.get("flag", ""), text(f.get("value_type")),
+                 text(f.get("purpose")), text(f.get("checklist_ref")))
+                for f in inv.get("flags_used") or []
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO invocation_env_vars VALUES (?, ?, ?, ?, ?)",
+            [
+                (project, inv_id, e.get("name", ""), text(e.get("purpose")), text(e.get("default")))
+                for e in inv.get("environment_variables") or []
+            ],
+        )
+
+
+def import_sdk(conn: sqlite3.Connection, project: str, sdk: dict[str, Any]):
+    conn.executemany(
+        "INSERT INTO sdks_used VALUES (?, ?, ?, ?)",
+        [
+            (project, text(s.get("name")), text(s.get("package")), text(s.get("version_constraint")))
+            for s in sdk.get("sdks_used") or []
+        ],
+    )
+    for usage in sdk.get("sdk_usage") or []:
+        usage_id = usage.get("id", "unknown")
+        conn.execute(
+            "INSERT INTO sdk_usages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project,
+                usage_id,
+                text(usage.get("sdk")),
+                text(usage.get("pattern")),
+                text(usage.get("description")),
+                text(usage.get("snippet")),
+                text(usage.get("notes")),
+                *reference_columns(usage.get("reference")),
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO sdk_usage_api_methods VALUES (?, ?, ?)",
+            [(project, usage_id, m) for m in usage.get("api_methods") or []],
+        )
+
+
+def import_code_references(conn: sqlite3.Connection, project: str, file_name: str, data: dict[str, Any]):
+    topic = text(data.get("topic"))
+    for ref in data.get("references") or []:
+        lines = ref.get("lines") or []
+        conn.execute(
+            "INSERT INTO code_references VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project,
+                file_name,
+                topic,
+                ref.get("id", "unknown"),
+                text(ref.get("title")),
+                text(ref.get("claim")),
+                text(ref.get("repository")),
+                text(ref.get("commit")),
+                text(ref.get("path")),
+                lines[0] if len(lines) >= 1 else None,
+                lines[-1] if len(lines) >= 1 else None,
+                text(ref.get("function")),
+                text(ref.get("class")),
+                text(ref.get("language")),
+                text(ref.get("snippet")),
+                text(ref.get("notes")),
+            ),
+        )
+
+
+def import_project(conn: sqlite3.Connection, project_dir: Path, stats: dict[str, tuple[int, int]]):
+    """Re-import every YAML file of one project."""
+    project = project_dir.name
+    delete_project(conn, project)
+
+    for rel_path, (mtime_ns, size) in stats.items():
+        path = PROJECTS_DIR.parent / rel_path
+        raw = path.read_bytes()
+        spec_type = "notes" if path.name == "notes.md" else get_spec_type_from_filename(path.name)
+        conn.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (rel_path, project, spec_type, mtime_ns, size, hashlib.sha256(raw).hexdigest()),
+        )
+        if spec_type == "notes":
+            # Stored as a JSON string so that the documents table round-trips every project input
+            conn.execute("INSERT INTO documents VALUES (?, ?, ?, ?)",
+                         (rel_path, project, spec_type, json.dumps(raw.decode(errors="replace"))))
+            continue
+
+        try:
+            data = yaml.safe_load(raw) or {}
+        except yaml.YAMLError as e:
+            console.print(f"[red]YAML parse error in {rel_path}:[/red] {e}")
+            continue
+        if not isinstance(data, dict):
+            continue
+
+        conn.execute(
+            "INSERT INTO documents VALUES (?, ?, ?, ?)",
+            (rel_path, project, spec_type, json.dumps(data, default=str)),
+        )
+        if spec_type == "project":
+            import_metadata(conn, project, data)
+        elif spec_type == "cli-integration":
+            import_cli(conn, project, data)
+        elif spec_type == "sdk-integration":
+            import_sdk(conn, project, data)
+        elif spec_type == "code-reference":
+            import_code_references(conn, project, path.name, data)
+
+
+def export_corpus(conn: sqlite3.Connection) -> tuple[int, int, int]:
+    """Bring the database in sync with projects/. Returns (imported, unchanged, removed)."""
+    imported = unchanged = removed = 0
+    seen = set()
+
+    with conn:
+        if PROJECTS_DIR.exists():
+            for project_dir in sorted(PROJECTS_DIR.iterdir()):
+                # Every directory, like corpus_model.load_projects(), so --from-db reports match
+                if not project_dir.is_dir():
+                    continue
+                seen.add(project_dir.name)
+                stats = project_file_stats(project_dir)
+                if project_is_current(conn, project_dir.name, stats):
+                    unchanged += 1
+                    continue
+                import_project(conn, project_dir, stats)
+                imported += 1
+
+        stored = {row[0] for row in conn.execute("SELECT DISTINCT project FROM files")}
+        for project in sorted(stored - seen):
+            delete_project(conn, project)
+            removed += 1
+
+    return imported, unchanged, removed
+
+
+def load_projects_from_db(db_path: Path) -> list[Project]:
+    """Rebuild the get_all_project_data() projects from the exported documents."""
+    conn = sqlite3.connect(db_path)
+    projects: dict[str, dict[str, Any]] = {}
+    rows = conn.execute("SELECT project, path, spec_type, data FROM documents ORDER BY project, path")
+    for project, path, spec_type, data in rows:
+        p = projects.setdefault(project, {
+            "name": project,
+            "metadata": None,
+            "cli": None,
+            "sdk": None,
+            "code_references": [],
+            "notes": "",
+        })
+        doc = json.loads(data)
+        if spec_type == "project":
+            p["metadata"] = doc
+        elif spec_type == "cli-integration":
+            p["cli"] = doc
+        elif spec_type == "sdk-integration":
+            p["sdk"] = doc
+        elif spec_type == "code-reference":
+            p["code_references"].append(doc)
+        elif spec_type == "notes":
+            p["notes"] = doc
+    conn.close()
+    return [Project.from_documents(**p) for p in projects.values()]
+
+
+def export_parquet(conn: sqlite3.Connection, output_dir: Path) -> bool:
+    """Write one Parquet file per table (column-oriented copy of the database)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        console.print("[yellow]pyarrow not installed; skipping Parquet export[/yellow]")
+        console.print("  Run: uv run --with pyarrow scripts/export_corpus.py --parquet DIR")
+        return False
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for table in PROJECT_TABLES:
+        if table in ("files", "documents"):
+            continue
+        cursor = conn.execute(f"SELECT * FROM {table}")
+        columns = [c[0] for c in cursor.description]
+        rows = cursor.fetchall()
+        arrays = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+        pq.write_table(pa.table(arrays), output_dir / f"{table}.parquet", compression="zstd")
+        console.print(f"  [green]Generated:[/green] {output_dir / table}.parquet ({len(rows)} rows)")
+    return True
+
+
+def run_sql(conn: sqlite3.Connection, sql: str):
+    """Run an ad-hoc query and print the result as a table."""
+    started = time.perf_counter()
+    cursor = conn.execute(sql)
+    rows = cursor.fetchall()
+    elapsed = (time.perf_counter() - started) * 1000
+
+    table = Table()
+    for column in cursor.description or []:
+        table.add_column(column[0])
+    for row in rows:
+        table.add_row(*("" if v is None else str(v) for v in row))
+    console.print(table)
+    console.print(f"[dim]{len(rows)} row(s) in {elapsed:.1f} ms[/dim]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the corpus to SQLite (and optionally Parquet)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB,
+                        help="SQLite database path (default: reports/generated/corpus.sqlite)")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the database and re-import everything")
+    parser.add_argument("--parquet", type=Path, metavar="DIR", help="Also write one Parquet file per table")
+    parser.add_argument("--sql", help="Run an ad-hoc SQL query after the export")
+
+    args = parser.parse_args()
+
+    conn = open_db(args.db, rebuild=args.rebuild)
+
+    started = time.perf_counter()
+    imported, unchanged, removed = export_corpus(conn)
+    elapsed = (time.perf_counter() - started) * 1000
+    console.print(
+        f"[green]Exported:[/green] {args.db} "
+        f"({imported} imported, {unchanged} unchanged, {removed} removed, {elapsed:.0f} ms)"
+    )
+
+    if args.parquet:
+        if not export_parquet(conn, args.parquet):
+            sys.exit(1)
+
+    if args.sql:
+        run_sql(conn, args.sql)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
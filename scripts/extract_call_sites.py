@@ -0,0 +1,797 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Extract Claude CLI spawn sites and SDK call sites from submodules by parsing.
+
+Unlike scan_submodules.py (text matching), this parses source files, so
+mentions inside comments and strings are ignored. It also rebuilds argument
+lists assembled through variables (cmd = [...]; cmd.append(...)) into the
+spec's flags_used structure.
+
+* Python: stdlib `ast` (always available)
+* TypeScript/JavaScript and Rust: tree-sitter, used when the grammars are
+  installed locally, e.g.
+      uv run --with tree-sitter --with tree-sitter-typescript --with tree-sitter-rust \\
+          scripts/extract_call_sites.py
+
+Results are cached per git blob SHA of the parsed content under
+tmp/cache/call-sites/, so after a submodule bump only files whose content
+changed are parsed again; locally modified files are keyed by their own hash.
+
+Usage:
+    ./scripts/extract_call_sites.py                     # All checked-out submodules
+    ./scripts/extract_call_sites.py goose cline         # Selected submodules
+    ./scripts/extract_call_sites.py --no-cache          # Ignore (and overwrite) cached results
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from scan_submodules import (
+    DEFAULT_OUTPUT,
+    LANGUAGES,
+    REPO_ROOT,
+    SKIP_DIRS,
+    SUBMODULES_DIR,
+    SWITCH_FLAGS,
+    draft_id,
+    head_commit,
+    project_repository,
+    read_gitmodules,
+    read_snippet,
+    value_type_for,
+    write_draft,
+)
+
+console = Console()
+
+CACHE_DIR = REPO_ROOT / "tmp" / "cache" / "call-sites"
+# Bump whenever extraction output changes, so stale cache entries are ignored
+EXTRACTOR_VERSION = 4
+
+PYTHON_SUFFIXES = {".py"}
+TS_SUFFIXES = {".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs"}
+RUST_SUFFIXES = {".rs"}
+
+PY_SPAWN_FUNCTIONS = {
+    "subprocess.run", "subprocess.Popen", "subprocess.call", "subprocess.check_call",
+    "subprocess.check_output", "asyncio.create_subprocess_exec", "os.execvp", "os.execv",
+    "os.spawnvp", "anyio.run_process", "anyio.open_process", "trio.run_process", "pexpect.spawn",
+}
+# These take the program and its arguments as separate positional parameters
+PY_VARARGS_SPAWN = {"asyncio.create_subprocess_exec"}
+
+TS_SPAWN_FUNCTIONS = {"spawn", "spawnSync", "execa", "execaSync", "execFile", "execFileSync", "fork", "Bun.spawn"}
+
+SDK_METHOD_PATTERNS = {
+    "messages.stream": "messages-stream",
+    "messages.create": "messages-create",
+}
+AGENT_SDK_PATTERNS = {
+    "query": "agent-run",
+    "ClaudeSDKClient": "agent-create",
+}
+AGENT_SDK_PATTERN_NAMES = set(AGENT_SDK_PATTERNS.values())
+# sdk_usage.sdk for client calls, by source language
+CLIENT_SDK_NAMES = {
+    "python": "anthropic-python",
+    "typescript": "anthropic-typescript",
+    "javascript": "anthropic-typescript",
+    "rust": "anthropic-rust",
+}
+
+
+# ── Flag reconstruction ──────────────────────────────────────────────────────
+
+def is_claude_program(text: str) -> bool:
+    """'claude', '/usr/bin/claude', claudePath, self.claude_bin ..."""
+    base = text.strip().strip("'\"").rsplit("/", 1)[-1].lower()
+    return "claude" in base
+
+
+def build_flags(args: list[tuple[str, bool]]) -> tuple[list[dict[str, Any]], str]:
+    """Turn [(text, is_literal)] after the program into (flags_used, command_pattern).
+
+    Alternatives such as `"--a" if x else "--b"` arrive as "--a|--b".
+    """
+    flags: list[dict[str, Any]] = []
+    pattern = ["claude"]
+    i = 0
+    while i < len(args):
+        text, literal = args[i]
+        if literal and text.startswith("-"):
+            names = text.split("|")
+            value = None
+            value_literal = False
+            if "=" in names[0] and names[0].startswith("--"):
+                name, value = names[0].split("=", 1)
+                names = [name]
+                value_literal = True
+            # A switch never takes the next argument: that is the prompt or another flag
+            elif (i + 1 < len(args) and not all(name in SWITCH_FLAGS for name in names)
+                  and not (args[i + 1][1] and args[i + 1][0].startswith("-"))):
+                value, value_literal = args[i + 1]
+                i += 1
+            for name in names:
+                vtype, options = value_type_for(name, None if name in SWITCH_FLAGS else value, value_literal)
+                entry = {"flag": name, "value_type": vtype}
+                if options:
+                    entry["value_options"] = options
+                if not any(f["flag"] == name for f in flags):
+                    flags.append(entry)
+            pattern.append("[" + "|".join(names) + "]" if len(names) > 1 else names[0])
+            if value is not None:
+                pattern.append(value if value_literal else f"{{{value}}}")
+        else:
+            pattern.append(text if literal else f"{{{text}}}")
+        i += 1
+    return flags, " ".join(pattern)
+
+
+def spawn_finding(kind_args: list[tuple[str, bool]], line: int, end_line: int,
+                  function: str | None, cls: str | None) -> dict[str, Any]:
+    flags, command_pattern = build_flags(kind_args)
+    return {
+        "kind": "cli",
+        "lines": [line, end_line],
+        "function": function,
+        "class": cls,
+        "command_pattern": command_pattern,
+        "flags_used": flags,
+    }
+
+
+def sdk_finding(method: str, pattern: str, parameters: list[str], line: int, end_line: int,
+                function: str | None, cls: str | None) -> dict[str, Any]:
+    return {
+        "kind": "sdk",
+        "lines": [line, end_line],
+        "function": function,
+        "class": cls,
+        "api_method": method,
+        "pattern": pattern,
+        "parameters": parameters,
+    }
+
+
+# ── Python (ast) ─────────────────────────────────────────────────────────────
+
+class PythonExtractor(ast.NodeVisitor):
+    """Single pass over a module, tracking imports, scopes and list-valued locals."""
+
+    def __init__(self):
+        self.aliases: dict[str, str] = {}
+        self.scopes: list[dict[str, list[ast.expr]]] = [{}]
+        self.functions: list[str] = []
+        self.classes: list[str] = []
+        self.findings: list[dict[str, Any]] = []
+
+    # Imports -> canonical dotted names
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.aliases[alias.asname or alias.name.split(".")[0]] = alias.name if alias.asname else alias.name.split(".")[0]
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            self.aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}" if node.module else alias.name
+
+    def dotted(self, node: ast.expr) -> str:
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if isinstance(node, ast.Name):
+            parts.append(self.aliases.get(node.id, node.id))
+        elif isinstance(node, ast.Call):
+            parts.append(self.dotted(node.func) + "()")
+        else:
+            parts.append("?")
+        return ".".join(reversed(parts))
+
+    # Scopes
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        self.functions.append(node.name)
+        self.scopes.append({})
+        self.generic_visit(node)
+        self.scopes.pop()
+        self.functions.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.classes.append(node.name)
+        self.generic_visit(node)
+        self.classes.pop()
+
+    def lookup(self, name: str) -> list[ast.expr] | None:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    # List-building statements
+    def visit_Assign(self, node: ast.Assign):
+        if isinstance(node.value, (ast.List, ast.Tuple)):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.scopes[-1][target.id] = list(node.value.elts)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign):
+        if isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name) \
+                and isinstance(node.value, (ast.List, ast.Tuple)):
+            elements = self.lookup(node.target.id)
+            if elements is not None:
+                elements.extend(node.value.elts)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) \
+                and func.attr in ("append", "extend", "insert"):
+            elements = self.lookup(func.value.id)
+            if elements is not None:
+                if func.attr == "append" and node.args:
+                    elements.append(node.args[0])
+                elif func.attr == "extend" and node.args and isinstance(node.args[0], (ast.List, ast.Tuple)):
+                    elements.extend(node.args[0].elts)
+                elif func.attr == "insert" and len(node.args) == 2 and isinstance(node.args[0], ast.Constant) \
+                        and isinstance(node.args[0].value, int):
+                    elements.insert(node.args[0].value, node.args[1])
+
+        name = self.dotted(func)
+        if name in PY_SPAWN_FUNCTIONS:
+            self.check_spawn(name, node)
+        else:
+            self.check_sdk(name, node)
+        self.generic_visit(node)
+
+    def element_text(self, node: ast.expr) -> list[tuple[str, bool]]:
+        """Render one argv element as [(text, is_literal)]; starred lists are expanded."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (str, int)):
+            return [(str(node.value), True)]
+        if isinstance(node, ast.IfExp):
+            body, orelse = self.element_text(node.body), self.element_text(node.orelse)
+            if len(body) == len(orelse) == 1 and body[0][1] and orelse[0][1]:
+                return [(f"{body[0][0]}|{orelse[0][0]}", True)]
+        if isinstance(node, ast.Starred) and isinstance(node.value, ast.Name):
+            elements = self.lookup(node.value.id)
+            if elements is not None:
+                return [t for e in elements for t in self.element_text(e)]
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "str" and node.args:
+            return self.element_text(node.args[0])
+        return [(ast.unparse(node), False)]
+
+    def argv(self, name: str, node: ast.Call) -> list[ast.expr] | None:
+        if name in PY_VARARGS_SPAWN:
+            return list(node.args)
+        if not node.args:
+            return None
+        first = node.args[0]
+        if isinstance(first, (ast.List, ast.Tuple)):
+            return list(first.elts)
+        if isinstance(first, ast.Name):
+            return self.lookup(first.id)
+        if isinstance(first, ast.Constant) and isinstance(first.value, str):
+            try:
+                return [ast.Constant(part) for part in shlex.split(first.value)]
+            except ValueError:
+                return None
+        return None
+
+    def check_spawn(self, name: str, node: ast.Call):
+        elements = self.argv(name, node)
+        if not elements:
+            return
+        argv = [t for e in elements for t in self.element_text(e)]
+        # Also matches wrapped names such as shutil.which("claude") or self.claude_path
+        if not is_claude_program(argv[0][0]):
+            return
+        self.findings.append(spawn_finding(
+            argv[1:], node.lineno, node.end_lineno or node.lineno,
+            self.functions[-1] if self.functions else None,
+            self.classes[-1] if self.classes else None,
+        ))
+
+    def check_sdk(self, name: str, node: ast.Call):
+        pattern = None
+        for suffix, sdk_pattern in SDK_METHOD_PATTERNS.items():
+            if name.endswith("." + suffix):
+                pattern = sdk_pattern
+                if sdk_pattern == "messages-create" and any(
+                        k.arg == "stream" and isinstance(k.value, ast.Constant) and k.value.value is True
+                        for k in node.keywords):
+                    pattern = "messages-stream"
+        short = name.rsplit(".", 1)[-1]
+        if pattern is None and short in AGENT_SDK_PATTERNS and name.startswith(("claude_agent_sdk.", "claude_code_sdk.")):
+            pattern = AGENT_SDK_PATTERNS[short]
+        if pattern is None:
+            return
+        self.findings.append(sdk_finding(
+            name, pattern, [k.arg for k in node.keywords if k.arg],
+            node.lineno, node.end_lineno or node.lineno,
+            self.functions[-1] if self.functions else None,
+            self.classes[-1] if self.classes else None,
+        ))
+
+
+def extract_python(source: bytes) -> list[dict[str, Any]]:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    extractor = PythonExtractor()
+    extractor.visit(tree)
+    return extractor.findings
+
+
+# ── TypeScript / Rust (tree-sitter, optional) ────────────────────────────────
+
+_PARSERS: dict[str, Any] = {}
+
+
+def tree_sitter_parser(language: str) -> Any | None:
+    """Return a tree-sitter parser for 'typescript', 'tsx' or 'rust', or None if unavailable."""
+    if language in _PARSERS:
+        return _PARSERS[language]
+    parser = None
+    try:
+        from tree_sitter import Language, Parser
+        if language == "rust":
+            import tree_sitter_rust
+            grammar = tree_sitter_rust.language()
+        else:
+            import tree_sitter_typescript
+            grammar = (tree_sitter_typescript.language_tsx() if language == "tsx"
+                       else tree_sitter_typescript.language_typescript())
+        parser = Parser(Language(grammar))
+    except (ImportError, AttributeError, TypeError, ValueError):
+        parser = None
+    _PARSERS[language] = parser
+    return parser
+
+
+def node_text(source: bytes, node: Any) -> str:
+    return source[node.start_byte:node.end_byte].decode(errors="replace")
+
+
+def walk(node: Any):
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current.children))
+
+
+def enclosing_names(node: Any, source: bytes, function_types: set[str], class_types: set[str]) -> tuple[str | None, str | None]:
+    function = cls = None
+    current = node.parent
+    while current is not None:
+        name = current.child_by_field_name("name")
+        if name is not None:
+            if function is None and current.type in function_types:
+                function = node_text(source, name)
+            elif cls is None and current.type in class_types:
+                cls = node_text(source, name)
+        current = current.parent
+    return function, cls
+
+
+def ts_literal(source: bytes, node: Any) -> tuple[str, bool]:
+    if node.type == "string":
+        return node_text(source, node)[1:-1], True
+    if node.type == "template_string" and not any(c.type == "template_substitution" for c in node.children):
+        return node_text(source, node)[1:-1], True
+    if node.type == "number":
+        return node_text(source, node), True
+    if node.type == "ternary_expression":
+        consequence = node.child_by_field_name("consequence")
+        alternative = node.child_by_field_name("alternative")
+        if consequence is not None and alternative is not None:
+            a, a_lit = ts_literal(source, consequence)
+            b, b_lit = ts_literal(source, alternative)
+            if a_lit and b_lit:
+                return f"{a}|{b}", True
+    return node_text(source, node), False
+
+
+def extract_typescript(source: bytes, tsx: bool) -> list[dict[str, Any]]:
+    parser = tree_sitter_parser("tsx" if tsx else "typescript")
+    if parser is None:
+        return []
+    root = parser.parse(source).root_node
+    function_types = {"function_declaration", "method_definition", "function_expression", "generator_function_declaration"}
+    class_types = {"class_declaration", "class"}
+
+    arrays: dict[str, list[Any]] = {}
+    imports_agent_sdk = b"@anthropic-ai/claude-agent-sdk" in source or b"@anthropic-ai/claude-code" in source
+    findings = []
+
+    for node in walk(root):
+        if node.type == "variable_declarator":
+            name, value = node.child_by_field_name("name"), node.child_by_field_name("value")
+            if name is not None and value is not None and value.type == "array":
+                arrays[node_text(source, name)] = [c for c in value.named_children]
+            continue
+        if node.type != "call_expression":
+            continue
+
+        func = node.child_by_field_name("function")
+        args_node = node.child_by_field_name("arguments")
+        if func is None or args_node is None:
+            continue
+        func_name = node_text(source, func)
+        args = [c for c in args_node.named_children]
+        function, cls = enclosing_names(node, source, function_types, class_types)
+        line, end_line = node.start_point[0] + 1, node.end_point[0] + 1
+
+        if func_name.rsplit(".", 1)[-1] in TS_SPAWN_FUNCTIONS and args:
+            program, _ = ts_literal(source, args[0])
+            if not is_claude_program(program):
+                continue
+            argv_nodes: list[Any] = []
+            if len(args) > 1:
+                if args[1].type == "array":
+                    argv_nodes = list(args[1].named_children)
+                elif args[1].type == "identifier":
+                    argv_nodes = arrays.get(node_text(source, args[1]), [])
+            argv = []
+            for element in argv_nodes:
+                inner = node_text(source, element.named_children[0]) if element.type == "spread_element" else None
+                if inner in arrays:
+                    argv.extend(ts_literal(source, e) for e in arrays[inner])
+                elif inner is not None:
+                    argv.append((inner + "...", False))
+                else:
+                    argv.append(ts_literal(source, element))
+            findings.append(spawn_finding(argv, line, end_line, function, cls))
+            continue
+
+        pattern = None
+        for suffix, sdk_pattern in SDK_METHOD_PATTERNS.items():
+            if func_name.endswith("." + suffix):
+                pattern = sdk_pattern
+        if pattern is None and imports_agent_sdk and func_name in AGENT_SDK_PATTERNS:
+            pattern = AGENT_SDK_PATTERNS[func_name]
+        if pattern is None:
+            continue
+        parameters = []
+        if args and args[0].type == "object":
+            for pair in args[0].named_children:
+                key = pair.child_by_field_name("key")
+                if key is not None:
+                    parameters.append(node_text(source, key))
+                elif pair.type == "shorthand_property_identifier":
+                    parameters.append(node_text(source, pair))
+        if "stream" in parameters and pattern == "messages-create" and b"stream: true" in source[node.start_byte:node.end_byte]:
+            pattern = "messages-stream"
+        findings.append(sdk_finding(func_name, pattern, parameters, line, end_line, function, cls))
+
+    return findings
+
+
+def rust_literal(source: bytes, node: Any) -> tuple[str, bool]:
+    if node.type == "string_literal":
+        return node_text(source, node)[1:-1], True
+    if node.type == "integer_literal":
+        return node_text(source, node), True
+    return node_text(source, node), False
+
+
+def rust_argv(source: bytes, method: str, args: list[Any]) -> list[tuple[str, bool]]:
+    if method == "arg":
+        return [rust_literal(source, a) for a in args[:1]]
+    argv = []
+    for a in args[:1]:
+        while a.type == "reference_expression" and a.named_children:
+            a = a.named_children[-1]
+        if a.type == "array_expression":
+            argv.extend(rust_literal(source, e) for e in a.named_children)
+        elif a.type == "macro_invocation":
+            tokens = [c for c in walk(a) if c.type in ("string_literal", "integer_literal")]
+            argv.extend(rust_literal(source, t) for t in tokens)
+        else:
+            argv.append((node_text(source, a) + "...", False))
+    return argv
+
+
+def extract_rust(source: bytes) -> list[dict[str, Any]]:
+    parser = tree_sitter_parser("rust")
+    if parser is None:
+        return []
+    root = parser.parse(source).root_node
+
+    # Command::new("claude") calls and the variables they are bound to
+    roots: dict[int, Any] = {}
+    bound: dict[str, int] = {}
+    for node in walk(root):
+        if node.type != "call_expression":
+            continue
+        func = node.child_by_field_name("function")
+        args_node = node.child_by_field_name("arguments")
+        if func is None or args_node is None or not node_text(source, func).endswith("Command::new"):
+            continue
+        args = args_node.named_children
+        if not args or not is_claude_program(rust_literal(source, args[0])[0]):
+            continue
+        roots[node.start_byte] = node
+        parent = node.parent
+        while parent is not None and parent.type in ("call_expression", "field_expression", "try_expression"):
+            parent = parent.parent
+        if parent is not None and parent.type == "let_declaration":
+            pattern = parent.child_by_field_name("pattern")
+            if pattern is not None:
+                bound[node_text(source, pattern).replace("mut ", "").strip()] = node.start_byte
+
+    # .arg(...) / .args(...) calls, attributed to the Command they configure
+    collected: dict[int, list[tuple[int, list[tuple[str, bool]]]]] = {key: [] for key in roots}
+    for node in walk(root):
+        if node.type != "call_expression":
+            continue
+        func = node.child_by_field_name("function")
+        if func is None or func.type != "field_expression":
+            continue
+        field = func.child_by_field_name("field")
+        if field is None or node_text(source, field) not in ("arg", "args"):
+            continue
+        base = func.child_by_field_name("value")
+        while base is not None and base.type == "call_expression":
+            inner = base.child_by_field_name("function")
+            if inner is None or inner.type != "field_expression":
+                break
+            base = inner.child_by_field_name("value")
+        if base is None:
+            continue
+        key = base.start_byte if base.start_byte in roots else bound.get(node_text(source, base))
+        if key is None:
+            continue
+        args = node.child_by_field_name("arguments").named_children
+        collected[key].append((node.start_byte, rust_argv(source, node_text(source, field), args)))
+
+    findings = []
+    function_types = {"function_item"}
+    class_types = {"impl_item", "struct_item"}
+    for key, command in roots.items():
+        calls = sorted(collected[key])
+        argv = [a for _, args in calls for a in args]
+        end_line = command.end_point[0] + 1
+        if calls:
+            last = max(start for start, _ in calls)
+            end_line = max(end_line, source.count(b"\n", 0, last) + 1)
+        function, cls = enclosing_names(command, source, function_types, class_types)
+        findings.append(spawn_finding(argv, command.start_point[0] + 1, end_line, function, cls))
+    return findings
+
+
+# ── Per-file work with blob-hash cache ───────────────────────────────────────
+
+def extract_source(path: str, source: bytes) -> list[dict[str, Any]]:
+    """Dispatch on the file suffix; unsupported files yield no findings."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in PYTHON_SUFFIXES:
+        return extract_python(source)
+    if suffix in TS_SUFFIXES:
+        return extract_typescript(source, tsx=suffix in (".tsx", ".jsx"))
+    if suffix in RUST_SUFFIXES:
+        return extract_rust(source)
+    return []
+
+
+def is_parseable(path: str) -> bool:
+    suffix = os.path.splitext(path)[1].lower()
+    return suffix in PYTHON_SUFFIXES | TS_SUFFIXES | RUST_SUFFIXES and not path.endswith(".min.js")
+
+
+def cache_path(blob: str) -> Path:
+    return CACHE_DIR / blob[:2] / f"{blob}.json"
+
+
+def write_cache(blob: str, findings: list[dict[str, Any]]):
+    target = cache_path(blob)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps({"version": EXTRACTOR_VERSION, "findings": findings}))
+
+
+def blob_sha(data: bytes) -> str:
+    """The SHA git gives a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def extract_blob(job: tuple[str, str]) -> tuple[str, list[dict[str, Any]]]:
+    """Parse one file and store its findings under the SHA of the bytes parsed."""
+    blob, path = job
+    with open(path, "rb") as f:
+        data = f.read()
+    findings = extract_source(path, data)
+    # A file edited since it was listed is not cached under the listed SHA
+    if blob_sha(data) == blob:
+        write_cache(blob, findings)
+    return blob, findings
+
+
+def read_cache(blob: str) -> list[dict[str, Any]] | None:
+    try:
+        cached = json.loads(cache_path(blob).read_text())
+    except (OSError, ValueError):
+        return None
+    return cached["findings"] if cached.get("version") == EXTRACTOR_VERSION else None
+
+
+def modified_paths(root: Path) -> set[str]:
+    """Tracked paths whose working-tree file may differ from the index."""
+    result = subprocess.run(["git", "-C", str(root), "diff-files", "--name-only", "-z"],
+                            capture_output=True, check=True)
+    return {p.decode(errors="replace") for p in result.stdout.split(b"\0") if p}
+
+
+def tracked_sources(root: Path) -> list[tuple[str, str]]:
+    """Return [(blob sha, relative path)] for parseable tracked files.
+
+    The SHA is that of the working-tree content, which is what gets parsed:
+    the index SHA for clean files, a fresh hash for modified ones.
+    """
+    result = subprocess.run(["git", "-C", str(root), "ls-files", "-s", "-z"],
+                            capture_output=True, check=True)
+    modified = modified_paths(root)
+    files = []
+    for record in result.stdout.split(b"\0"):
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        mode, blob, _ = meta.split()
+        rel = path.decode(errors="replace")
+        parts = rel.split("/")
+        if mode == b"160000" or any(p in SKIP_DIRS for p in parts[:-1]):
+            continue
+        if not is_parseable(rel):
+            continue
+        if rel in modified:
+            try:
+                files.append((blob_sha((root / rel).read_bytes()), rel))
+            except OSError:
+                continue  # deleted from the working tree
+        else:
+            files.append((blob.decode(), rel))
+    return files
+
+
+def extract_repository(pool: ProcessPoolExecutor, root: Path, use_cache: bool) -> tuple[dict[str, list[dict[str, Any]]], int, int]:
+    """Return ({path: findings}, files, parsed) for one checked-out tree."""
+    files = tracked_sources(root)
+    by_path: dict[str, list[dict[str, Any]]] = {}
+    misses: dict[str, list[str]] = {}
+    for blob, rel in files:
+        cached = read_cache(blob) if use_cache else None
+        if cached is None:
+            misses.setdefault(blob, []).append(rel)
+        elif cached:
+            by_path[rel] = cached
+
+    jobs = [(blob, str(root / paths[0])) for blob, paths in misses.items()]
+    for blob, findings in pool.map(extract_blob, jobs, chunksize=32):
+        if findings:
+            for rel in misses[blob]:
+                by_path[rel] = findings
+    return by_path, len(files), len(jobs)
+
+
+def build_documents(name: str, root: Path, repository: str, commit: str,
+                    by_path: dict[str, list[dict[str, Any]]]) -> tuple[dict[str, Any], dict[str, Any]]:
+    invocations, usages = [], []
+    for rel in sorted(by_path):
+        for finding in by_path[rel]:
+            start, end = finding["lines"]
+            reference = {
+                "repository": repository,
+                "commit": commit,
+                "path": rel,
+                "lines": [start, end],
+                "language": LANGUAGES.get(Path(rel).suffix.lower(), "other"),
+            }
+            if finding.get("function"):
+                reference["function"] = finding["function"]
+            if finding.get("class"):
+                reference["class"] = finding["class"]
+            entry_id = draft_id(rel, start).replace("scan-", "parsed-", 1)
+            if finding["kind"] == "cli":
+                invocations.append({
+                    "id": entry_id,
+                    "description": "DRAFT: Claude Code CLI spawn found by extract_call_sites.py",
+                    "reference": reference,
+                    "command_pattern": finding["command_pattern"],
+                    "flags_used": finding["flags_used"],
+                    "snippet": read_snippet(root, rel, start, end),
+                })
+            else:
+                sdk = ("claude-agents-sdk" if finding["pattern"] in AGENT_SDK_PATTERN_NAMES
+                       else CLIENT_SDK_NAMES.get(reference["language"], "other"))
+                usages.append({
+                    "id": entry_id,
+                    "sdk": sdk,
+                    "pattern": finding["pattern"],
+                    "description": "DRAFT: SDK call found by extract_call_sites.py",
+                    "reference": reference,
+                    "api_methods": [finding["api_method"]],
+                    "parameters": [{"name": p} for p in finding["parameters"]],
+                    "snippet": read_snippet(root, rel, start, end),
+                })
+
+    cli_doc = {"project": name, "cli_integration_detected": bool(invocations), "summary": "",
+               "invocations": invocations}
+    sdk_doc = {"project": name, "sdk_integration_detected": bool(usages), "summary": "",
+               "sdk_usage": usages}
+    return cli_doc, sdk_doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser-based extraction of Claude CLI/SDK call sites")
+    parser.add_argument("names", nargs="*", help="Submodule names (default: all)")
+    parser.add_argument("--submodules-dir", type=Path, default=SUBMODULES_DIR,
+                        help="Directory holding the checked-out submodules")
+    parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
+                        help="Draft output directory (default: tmp/scan/)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Worker processes")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every file")
+    args = parser.parse_args()
+
+    modules = read_gitmodules()
+    if args.names:
+        modules = [m for m in modules if m["name"] in set(args.names)]
+
+    available = [lang for lang in ("typescript", "rust") if tree_sitter_parser(lang) is not None]
+    console.print(f"[bold]Parsers:[/bold] python{''.join(', ' + lang for lang in available)}")
+    if len(available) < 2:
+        console.print("[yellow]tree-sitter grammars missing for: "
+                      f"{', '.join(sorted({'typescript', 'rust'} - set(available)))}; those files are skipped[/yellow]")
+
+    table = Table(title="Call-site extraction")
+    table.add_column("Submodule", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Parsed", justify="right")
+    table.add_column("CLI spawns", justify="right")
+    table.add_column("SDK calls", justify="right")
+    table.add_column("Seconds", justify="right")
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for module in modules:
+            root = args.submodules_dir / module["name"]
+            commit = head_commit(root) if root.is_dir() else ""
+            if not commit:
+                console.print(f"[yellow]Skipping {module['name']}:[/yellow] not checked out")
+                continue
+            started = time.perf_counter()
+            by_path, file_count, parsed = extract_repository(pool, root, not args.no_cache)
+            cli_doc, sdk_doc = build_documents(
+                module["name"], root, project_repository(module["name"], module["url"]), commit, by_path)
+            header = (f"# DRAFT generated by scripts/extract_call_sites.py from {module['path']} @ {commit}\n"
+                      f"# Review every entry before copying it into projects/{module['name']}/\n\n")
+            out_dir = args.output / module["name"]
+            write_draft(out_dir / "cli.parsed.yaml", header, cli_doc)
+            write_draft(out_dir / "sdk.parsed.yaml", header, sdk_doc)
+            table.add_row(module["name"], str(file_count), str(parsed), str(len(cli_doc["invocations"])),
+                          str(len(sdk_doc["sdk_usage"])), f"{time.perf_counter() - started:.2f}")
+
+    console.print(table)
+    console.print(f"Drafts written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
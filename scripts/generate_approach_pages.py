@@ -12,38 +12,70 @@ Generate per-project detail pages and approaches index from YAML data.
 
 Produces:
   - reports/generated/projects/{name}.md  -- per-project code quotes + GitHub permalinks
+  - reports/generated/projects/{name}.refs-{n}.md  -- code references of projects with many of them
   - reports/generated/approaches.md       -- approaches index with educational examples
 
 Usage:
     ./scripts/generate_approach_pages.py
     ./scripts/generate_approach_pages.py --output reports/generated/
+    ./scripts/generate_approach_pages.py --watch     # Re-render pages on project edits
+    ./scripts/generate_approach_pages.py --snapshot tmp/corpus.snapshot
 """
 
 import argparse
+import json
+import os
 import textwrap
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import yaml
 from jinja2 import Environment, BaseLoader
 from rich.console import Console
 
+import corpus_model
+import instrumentation
+from corpus_model import (
+    CliIntegration, CodeReference, Project, ProjectMetadata, Reference, SdkIntegration,
+    github_permalink, load_project, load_projects,
+)
+from invocation_graph import GraphInputs, InvocationGraph, related_by_project
+from snippet_clusters import ClusterInputs, Duplicate, SnippetKey, cluster_snippets, duplicates_by_project
+
 console = Console()
 
 REPO_ROOT = Path(__file__).parent.parent
-PROJECTS_DIR = REPO_ROOT / "projects"
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
 DEFAULT_OUTPUT = REPO_ROOT / "reports" / "generated"
+# Written by cli_latency_lab.py; published on approaches.md when present
+LATENCY_RESULTS = REPO_ROOT / "reports" / "measurements" / "cli-latency.json"
+
+# Projects with more code references than this list them in a table on their
+# page and move the full entries to {name}.refs-{n}.md pages of this size
+REFERENCES_PER_PAGE = 25
+# Snippets longer than this are collapsed in a <details> block
+SNIPPET_FOLD_LINES = 20
+# Member projects shown per approach in the overview table and in its section
+APPROACH_LINKS_LISTED = 10
+APPROACH_ROWS_LISTED = 100
 
 # ── Approach taxonomy (curated) ──────────────────────────────────────────────
 
+# Texts and examples are curated; which projects use an approach is derived
+# from its "signature" over project features (see project_features()): a
+# project matches if it has every "all" feature, at least one "any" feature
+# (when given) and no "none" feature.
 APPROACHES: list[dict[str, Any]] = [
     # ── CLI Approaches ───────────────────────────────────────────────────────
     {
         "id": "persistent-subprocess",
         "category": "CLI",
         "title": "Persistent Subprocess (Bidirectional NDJSON)",
-        "projects": ["goose"],
+        # Long-lived stream-json in and out, without one-shot print mode
+        "signature": {"all": ["flag:--input-format", "flag:--output-format", "command:stream-json"],
+                      "none": ["flag:-p", "flag:--print"]},
         "description": textwrap.dedent("""\
             Spawn Claude Code once as a long-running subprocess. Communicate via
             stdin/stdout using newline-delimited JSON (NDJSON). The process persists
@@ -70,7 +102,8 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "per-request-spawn-simple",
         "category": "CLI",
         "title": "Per-Request Spawn (Simple)",
-        "projects": ["claude-code-mcp"],
+        # One-shot print mode, plain text output
+        "signature": {"any": ["flag:-p", "flag:--print"], "none": ["flag:--output-format"]},
         "description": textwrap.dedent("""\
             Spawn a fresh Claude Code process for each request. Pass the prompt
             with `-p`, collect raw text from stdout. Simplest possible integration."""),
@@ -90,7 +123,9 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "per-request-spawn-structured",
         "category": "CLI",
         "title": "Per-Request Spawn (Structured Output)",
-        "projects": ["cline"],
+        # One-shot print mode with a structured output format
+        "signature": {"all": ["flag:--output-format"], "any": ["flag:-p", "flag:--print"],
+                      "none": ["flag:--input-format"]},
         "description": textwrap.dedent("""\
             Spawn per-request with `--output-format stream-json` for structured NDJSON
             events. Use `--max-turns 1` and `--disallowedTools` to make Claude Code act
@@ -115,7 +150,8 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "multi-instance-orchestration",
         "category": "CLI",
         "title": "Multi-Instance Orchestration",
-        "projects": ["claude-flow"],
+        # Print mode chained through stream-json input and output
+        "signature": {"all": ["flag:--input-format", "flag:--output-format"], "any": ["flag:-p", "flag:--print"]},
         "description": textwrap.dedent("""\
             Spawn multiple Claude Code instances in parallel for multi-agent workflows.
             Tasks within a phase run concurrently; phases run sequentially.
@@ -144,7 +180,7 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "commands-and-skills",
         "category": "CLI",
         "title": "Commands & Skills (Declarative)",
-        "projects": ["anthropic-cookbook", "fastmcp"],
+        "signature": {"any": ["integration:skills", "pattern:skills"]},
         "description": textwrap.dedent("""\
             No subprocess management code. Use Claude Code's built-in extensibility:
             `.claude/commands/` for slash commands with YAML frontmatter,
@@ -173,7 +209,7 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "claude-agent-sdk",
         "category": "SDK",
         "title": "Claude Agent SDK",
-        "projects": ["claude-code-action", "anthropic-cookbook"],
+        "signature": {"any": ["pattern:agent-create", "pattern:agent-run", "pattern:query-iterator"]},
         "description": textwrap.dedent("""\
             Higher-level SDK that wraps Claude Code itself. The `query()` async iterator
             yields messages in real-time. Manages sessions, tools, and permissions.
@@ -215,7 +251,9 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "direct-anthropic-sdk",
         "category": "SDK",
         "title": "Direct Anthropic SDK",
-        "projects": ["gptme", "cline", "continue", "fastmcp"],
+        "signature": {"all": ["sdk:anthropic"],
+                      "any": ["pattern:messages-create", "pattern:messages-stream",
+                              "pattern:messages-create-stream", "pattern:sse-streaming"]},
         "description": textwrap.dedent("""\
             Use the official Anthropic client library directly. Call
             `client.messages.create()` or `client.messages.stream()` for full control
@@ -263,7 +301,7 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "litellm-abstraction",
         "category": "SDK",
         "title": "LiteLLM Abstraction",
-        "projects": ["aider", "openhands", "alphacodium"],
+        "signature": {"all": ["sdk:litellm"]},
         "description": textwrap.dedent("""\
             Multi-provider abstraction via LiteLLM. Claude is one of many supported
             models. Prefix determines routing: `anthropic/claude-sonnet-4-20250514`.
@@ -293,7 +331,7 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "prompt-caching",
         "category": "Cross-Cutting",
         "title": "Prompt Caching",
-        "projects": ["gptme", "cline", "aider", "continue", "openhands"],
+        "signature": {"any": ["pattern:prompt-caching", "summary:prompt-caching"]},
         "description": textwrap.dedent("""\
             Reduce cost and latency by caching parts of the prompt across requests.
             Add `cache_control: {type: "ephemeral"}` to message content blocks.
@@ -325,7 +363,8 @@ APPROACHES: list[dict[str, Any]] = [
         "id": "extended-thinking",
         "category": "Cross-Cutting",
         "title": "Extended Thinking",
-        "projects": ["gptme", "cline", "aider", "continue", "anthropic-cookbook"],
+        "signature": {"any": ["pattern:extended-thinking", "pattern:thinking", "pattern:thinking-tokens",
+                              "summary:extended-thinking"]},
         "description": textwrap.dedent("""\
             Let Claude reason step-by-step before answering. Set a token budget for
             the thinking phase. Temperature MUST be 1 (or omitted) when thinking is enabled.
@@ -349,55 +388,91 @@ APPROACHES: list[dict[str, Any]] = [
 ]
 
 
-# ── YAML loading ─────────────────────────────────────────────────────────────
-
-def load_yaml(path: Path) -> dict[str, Any] | None:
-    try:
-        with open(path) as f:
-            return yaml.safe_load(f) or {}
-    except (yaml.YAMLError, FileNotFoundError):
-        return None
-
+# ── Approach classification ──────────────────────────────────────────────────
+
+COMMAND_TOKEN_STRIP = "[]{}()|,\"'"
+
+
+def project_features(project: Project) -> set[str]:
+    """Features approach signatures are matched against.
+
+    flag:{flag}         CLI flags used (invocations and flags_summary)
+    command:{token}     tokens of invocation command patterns
+    pattern:{pattern}   sdk_usage patterns
+    summary:{pattern}   patterns marked true in patterns_summary
+    sdk:{name}          SDKs in sdk_usage, also by family (sdk:anthropic for anthropic-python)
+    integration:{type}  metadata integration_types
+    """
+    features = set()
+    if project.metadata:
+        features.update(f"integration:{t}" for t in project.metadata.integration_types)
+    cli = project.cli
+    if cli and cli.cli_integration_detected:
+        for inv in cli.invocations:
+            features.update(f"flag:{f.flag}" for f in inv.flags_used)
+            for token in (inv.command_pattern or "").split():
+                token = token.strip(COMMAND_TOKEN_STRIP)
+                if token:
+                    features.add(f"command:{token}")
+        features.update(f"flag:{flag}" for flag, info in cli.flags_summary.items() if info.used)
+    sdk = project.sdk
+    if sdk and sdk.sdk_integration_detected:
+        for usage in sdk.sdk_usage:
+            if usage.pattern:
+                features.add(f"pattern:{usage.pattern}")
+            if usage.sdk:
+                features.add(f"sdk:{usage.sdk}")
+                features.add(f"sdk:{usage.sdk.split('-')[0]}")
+        features.update(f"summary:{name}" for name, used in sdk.patterns_summary.items() if used)
+    return features
+
+
+def update_feature_index(index: dict[str, set[str]], name: str, old: set[str], new: set[str]):
+    """Move one project's postings in a feature -> project names index from old to new features."""
+    for feature in old - new:
+        postings = index.get(feature)
+        if postings is not None:
+            postings.discard(name)
+    for feature in new - old:
+        index.setdefault(feature, set()).add(name)
+
+
+def build_feature_index(projects: list[Project]) -> dict[str, set[str]]:
+    index: dict[str, set[str]] = {}
+    for p in projects:
+        update_feature_index(index, p.name, set(), project_features(p))
+    return index
 
-def load_all_projects() -> list[dict[str, Any]]:
-    projects = []
-    for d in sorted(PROJECTS_DIR.iterdir()):
-        if not d.is_dir() or d.name == "_template":
-            continue
-        projects.append({
-            "name": d.name,
-            "metadata": load_yaml(d / "metadata.project.yaml"),
-            "cli": load_yaml(d / "cli.cli-integration.yaml"),
-            "sdk": load_yaml(d / "sdk.sdk-integration.yaml"),
-        })
-    return projects
 
+def classify_approaches(index: dict[str, set[str]]) -> dict[str, list[str]]:
+    """Approach id -> sorted member projects, by set operations on the feature index."""
+    empty: set[str] = set()
+    membership = {}
+    for a in APPROACHES:
+        signature = a["signature"]
+        sets = [index.get(f, empty) for f in signature.get("all", [])]
+        if signature.get("any"):
+            sets.append(set().union(*(index.get(f, empty) for f in signature["any"])))
+        members = set.intersection(*sorted(sets, key=len)) if sets else empty
+        for feature in signature.get("none", []):
+            members = members - index.get(feature, empty)
+        membership[a["id"]] = sorted(members)
+    return membership
 
-# ── GitHub permalink builder ─────────────────────────────────────────────────
 
-def github_permalink(ref: dict[str, Any]) -> str:
-    """Build a GitHub permalink from a reference dict."""
-    repo = ref.get("repository", "")
-    commit = ref.get("commit", "")
-    path = ref.get("path", "")
-    lines = ref.get("lines", [])
+# ── Loading ──────────────────────────────────────────────────────────────────
 
-    if not repo or not commit or not path:
-        return ""
+def load_all_projects() -> list[Project]:
+    return load_projects(PROJECTS_DIR, skip={"_template"})
 
-    url = f"{repo}/blob/{commit}/{path}"
-    if lines and len(lines) >= 2:
-        url += f"#L{lines[0]}-L{lines[1]}"
-    elif lines and len(lines) == 1:
-        url += f"#L{lines[0]}"
-    return url
 
+# ── GitHub permalink builder ─────────────────────────────────────────────────
 
-def short_path_link(ref: dict[str, Any]) -> str:
+def short_path_link(ref: Reference | CodeReference) -> str:
     """Build markdown link with short path as text."""
     url = github_permalink(ref)
-    path = ref.get("path", "")
-    lines = ref.get("lines", [])
+    path = ref.path or ""
+    lines = ref.lines
     if not url:
         return f"`{path}`"
 
@@ -413,7 +488,43 @@ def short_path_link(ref: dict[str, Any]) -> str:
 
 # ── Per-project page generation ──────────────────────────────────────────────
 
-PROJECT_TEMPLATE = """\
+REFERENCE_MACRO = """\
+{% macro reference(ref) %}
+<a id="{{ ref.anchor }}"></a>
+#### {{ ref.title }}
+
+{% if ref.claim %}**Claim:** {{ ref.claim }}
+
+{% endif %}{% if ref.description %}{{ ref.description }}
+
+{% endif %}{% if ref.permalink %}**Source:** [{{ ref.ref_label }}]({{ ref.permalink }})\
+{% if ref.function %}  \u2022 Function: `{{ ref.function }}`{% endif %}\
+{% if ref.cls %}  \u2022 Class: `{{ ref.cls }}`{% endif %}
+
+
+{% endif %}{% for h in ref.highlights %}* {{ h.lines }}: {{ h.note }}
+{% if loop.last %}
+{% endif %}{% endfor %}{% if ref.snippet and ref.fold %}<details>
+<summary>Snippet ({{ ref.snippet_lines }} lines)</summary>
+
+```{{ ref.language }}
+{{ ref.snippet }}
+```
+
+</details>
+
+{% elif ref.snippet %}```{{ ref.language }}
+{{ ref.snippet }}
+```
+
+{% endif %}{% if ref.notes %}> {{ ref.notes }}
+
+{% endif %}{% if ref.tags %}*Tags: {{ ref.tags|join(', ') }}*
+
+{% endif %}{% endmacro -%}
+"""
+
+PROJECT_TEMPLATE = REFERENCE_MACRO + """\
 # {{ display_name }}
 
 | Field | Value |
@@ -455,7 +566,9 @@ PROJECT_TEMPLATE = """\
 {% endfor %}
 {% endif %}
 
-{% if inv.snippet %}
+{% if inv.same_as %}
+{{ inv.same_as }}
+{% elif inv.snippet %}
 ```{{ inv.language }}
 {{ inv.snippet }}```
 {% endif %}
@@ -471,6 +584,8 @@ PROJECT_TEMPLATE = """\
 
 {% if inv.notes %}
 > {{ inv.notes }}
+{% endif %}{% if inv.related %}
+**Related:** {{ inv.related }}
 {% endif %}
 
 {% endfor %}
@@ -498,109 +613,301 @@ PROJECT_TEMPLATE = """\
 {% if usage.cls %}  \u2022 Class: `{{ usage.cls }}`{% endif %}
 {% endif %}
 
-{% if usage.snippet %}
+{% if usage.same_as %}
+{{ usage.same_as }}
+{% elif usage.snippet %}
 ```{{ usage.language }}
 {{ usage.snippet }}```
 {% endif %}
 
 {% if usage.notes %}
 > {{ usage.notes }}
+{% endif %}{% if usage.related %}
+**Related:** {{ usage.related }}
 {% endif %}
 
 {% endfor %}
 {% endif %}
 
+{% if references %}## Code References
+
+{% if reference_pages %}
+{{ references|length }} references, in full on pages {% for page in reference_pages %}[{{ loop.index }}]({{ page }}){{ ', ' if not loop.last }}{% endfor %}.
+
+| Reference | Topic | Source |
+|-----------|-------|--------|
+{% for ref in references %}| [{{ ref.title }}]({{ ref.page }}#{{ ref.anchor }}) | {{ ref.topic }} | {% if ref.permalink %}[{{ ref.ref_label }}]({{ ref.permalink }}){% else %}{{ ref.ref_label or '-' }}{% endif %} |
+{% endfor %}
+{% else %}
+{% for ref in references %}{% if loop.changed(ref.topic) %}
+### {{ ref.topic }}
+{% endif %}{{ reference(ref) }}{% endfor %}
+{% endif %}
+
+{% endif %}---
+*Auto-generated from YAML data by `scripts/generate_approach_pages.py`*
+"""
+
+REFERENCE_PAGE_TEMPLATE = REFERENCE_MACRO + """\
+# {{ display_name }}: code references ({{ page }}/{{ page_count }})
+
+[\u2190 {{ display_name }}]({{ project_page }}){% if page > 1 %} \u2022 [previous]({{ previous }}){% endif %}{% if page < page_count %} \u2022 [next]({{ next }}){% endif %}
+
+{% for ref in references %}{% if loop.changed(ref.topic) %}
+### {{ ref.topic }}
+{% endif %}{{ reference(ref) }}{% endfor %}
+
 ---
 *Auto-generated from YAML data by `scripts/generate_approach_pages.py`*
 """
 
 
-def render_project_page(project: dict[str, Any]) -> str:
-    meta = project["metadata"] or {}
-    cli = project["cli"] or {}
-    sdk = project["sdk"] or {}
+def reference_label(ref: Reference | CodeReference) -> str:
+    lines = ref.lines or [0, 0]
+    return f"`{ref.path}` L{lines[0]}-L{lines[-1]}" if ref.path else ""
+
+
+def reference_page_name(project: Project, page: int) -> str:
+    return f"{project.name}.refs-{page}.md"
+
+
+def code_reference_entries(project: Project) -> list[dict[str, Any]]:
+    """Template data for every code reference, with the page each one is rendered on."""
+    entries = []
+    for ref_file in project.code_references:
+        topic = ref_file.topic or "Code references"
+        for ref in ref_file.references:
+            snippet = (ref.snippet or "").rstrip()
+            snippet_lines = snippet.count("\n") + 1 if snippet else 0
+            entries.append({
+                "anchor": f"ref-{ref.id}",
+                "title": ref.title or ref.id,
+                "topic": topic,
+                "claim": (ref.claim or "").strip(),
+                "description": (ref.description or "").strip(),
+                "permalink": github_permalink(ref),
+                "ref_label": reference_label(ref),
+                "function": ref.function,
+                "cls": ref.cls,
+                "language": ref.language or "",
+                "highlights": [
+                    {"lines": "-".join(f"L{n}" for n in h.get("lines") or []) or "-", "note": h.get("note") or ""}
+                    for h in ref.highlights
+                ],
+                "snippet": snippet,
+                "snippet_lines": snippet_lines,
+                "fold": snippet_lines > SNIPPET_FOLD_LINES,
+                "notes": (ref.notes or "").strip().replace("\n", " "),
+                "tags": ref.tags,
+                "page": "",
+            })
+    if len(entries) > REFERENCES_PER_PAGE:
+        for i, entry in enumerate(entries):
+            entry["page"] = reference_page_name(project, i // REFERENCES_PER_PAGE + 1)
+    return entries
+
+
+def render_reference_pages(project: Project) -> list[tuple[str, str]]:
+    """(file name, content) of the overflow pages for projects with many code references."""
+    entries = code_reference_entries(project)
+    if len(entries) <= REFERENCES_PER_PAGE:
+        return []
+    display_name = (project.metadata.display_name if project.metadata else None) or project.name
+    page_count = (len(entries) + REFERENCES_PER_PAGE - 1) // REFERENCES_PER_PAGE
+
+    env = Environment(loader=BaseLoader(), keep_trailing_newline=True)
+    template = env.from_string(REFERENCE_PAGE_TEMPLATE)
+    pages = []
+    for page in range(1, page_count + 1):
+        pages.append((reference_page_name(project, page), template.render(
+            display_name=display_name,
+            project_page=f"{project.name}.md",
+            page=page,
+            page_count=page_count,
+            previous=reference_page_name(project, page - 1),
+            next=reference_page_name(project, page + 1),
+            references=entries[(page - 1) * REFERENCES_PER_PAGE:page * REFERENCES_PER_PAGE],
+        )))
+    return pages
+
+
+def heading_anchor(heading: str) -> str:
+    """The anchor GitHub generates for a Markdown heading."""
+    slug = "".join(c for c in heading.lower() if c.isalnum() or c in " -_")
+    return slug.replace(" ", "-")
+
+
+def snippet_link(project: Project, key: SnippetKey) -> str:
+    """Link to an invocation or SDK usage heading, on this page or another project's."""
+    name, _, snippet_id = key
+    page, label = ("", snippet_id) if name == project.name else (f"{name}.md", f"{name} \u203a {snippet_id}")
+    return f"[{label}]({page}#{heading_anchor(snippet_id)})"
+
+
+def duplicate_note(project: Project, dup: Duplicate) -> str:
+    """Link from a repeated snippet to its cluster's canonical snippet."""
+    link = snippet_link(project, dup.canonical)
+    if dup.identical:
+        return f"*Same snippet as {link}.*"
+    return f"*Near-identical snippet: see {link} (~{dup.similarity:.0%} similar).*"
+
+
+def render_project_page(project: Project, duplicates: dict[SnippetKey, Duplicate] | None = None,
+                        related: dict[SnippetKey, list[SnippetKey]] | None = None) -> str:
+    meta = project.metadata or ProjectMetadata()
+    cli = project.cli or CliIntegration()
+    sdk = project.sdk or SdkIntegration()
+
+    commit = meta.analyzed_commit or ""
+    repository = meta.repository or ""
 
-    commit = meta.get("analyzed_commit", "")
-    repository = meta.get("repository", "")
+    duplicates = duplicates or {}
+    related = related or {}
+
+    def related_links(key: SnippetKey) -> str:
+        return ", ".join(snippet_link(project, k) for k in related.get(key, []))
 
     # ── CLI invocations ──────────────────────────────────────────────────
     invocations = []
-    for inv in cli.get("invocations", []):
-        ref = inv.get("reference", {})
+    for inv in cli.invocations:
+        ref = inv.reference or Reference()
         plink = github_permalink(ref)
+        key = (project.name, "invocation", inv.id or "unknown")
+        dup = duplicates.get(key)
         invocations.append({
-            "id": inv.get("id", "unknown"),
-            "description": inv.get("description", ""),
+            "id": inv.id or "unknown",
+            "description": inv.description or "",
             "permalink": plink,
-            "ref_label": f'`{ref.get("path", "")}` L{ref.get("lines", [0, 0])[0]}-L{ref.get("lines", [0, 0])[-1]}' if ref.get("path") else "",
-            "function": ref.get("function"),
-            "cls": ref.get("class"),
-            "language": ref.get("language", ""),
-            "flags": inv.get("flags_used", []),
-            "snippet": (inv.get("snippet") or "").rstrip(),
-            "env_vars": inv.get("environment_variables", []),
-            "notes": (inv.get("notes") or "").strip().replace("\n", " "),
+            "ref_label": reference_label(ref),
+            "function": ref.function,
+            "cls": ref.cls,
+            "language": ref.language or "",
+            "flags": inv.flags_used,
+            "snippet": (inv.snippet or "").rstrip(),
+            "same_as": duplicate_note(project, dup) if dup else "",
+            "env_vars": inv.environment_variables,
+            "notes": (inv.notes or "").strip().replace("\n", " "),
+            "related": related_links(key),
         })
 
     # ── SDK usages ───────────────────────────────────────────────────────
     sdk_usages = []
-    for usage in sdk.get("sdk_usage", []):
-        ref = usage.get("reference", {})
+    for usage in sdk.sdk_usage:
+        ref = usage.reference or Reference()
         plink = github_permalink(ref)
+        key = (project.name, "sdk_usage", usage.id or "unknown")
+        dup = duplicates.get(key)
         sdk_usages.append({
-            "id": usage.get("id", "unknown"),
-            "description": usage.get("description", ""),
+            "id": usage.id or "unknown",
+            "description": usage.description or "",
             "permalink": plink,
-            "ref_label": f'`{ref.get("path", "")}` L{ref.get("lines", [0, 0])[0]}-L{ref.get("lines", [0, 0])[-1]}' if ref.get("path") else "",
-            "function": ref.get("function"),
-            "cls": ref.get("class"),
-            "language": ref.get("language", "python"),
-            "snippet": (usage.get("snippet") or "").rstrip(),
-            "notes": (usage.get("notes") or "").strip().replace("\n", " "),
+            "ref_label": reference_label(ref),
+            "function": ref.function,
+            "cls": ref.cls,
+            "language": ref.language or "python",
+            "snippet": (usage.snippet or "").rstrip(),
+            "same_as": duplicate_note(project, dup) if dup else "",
+            "notes": (usage.notes or "").strip().replace("\n", " "),
+            "related": related_links(key),
         })
 
     sdks_used = []
-    for s in sdk.get("sdks_used", []):
+    for s in sdk.sdks_used:
         sdks_used.append({
-            "package": s.get("package", ""),
-            "version": s.get("version_constraint", ""),
+            "package": s.package or "",
+            "version": s.version_constraint or "",
         })
 
+    references = code_reference_entries(project)
+
     env = Environment(loader=BaseLoader(), keep_trailing_newline=True)
     env.globals["True"] = True
     env.globals["False"] = False
     template = env.from_string(PROJECT_TEMPLATE)
 
     return template.render(
-        display_name=meta.get("display_name", project["name"]),
+        display_name=meta.display_name or project.name,
         repository=repository,
         commit=commit,
         commit_short=commit[:12] if commit else "-",
-        language=meta.get("primary_language", "-"),
-        integration_types=", ".join(meta.get("integration_types", [])),
-        status=meta.get("analysis_status", "pending"),
-        notes=(meta.get("notes") or "").strip(),
-        cli_detected=cli.get("cli_integration_detected", False),
-        cli_summary=(cli.get("summary") or "").strip(),
+        language=meta.primary_language or "-",
+        integration_types=", ".join(meta.integration_types),
+        status=meta.analysis_status or "pending",
+        notes=(meta.notes or "").strip(),
+        cli_detected=cli.cli_integration_detected,
+        cli_summary=(cli.summary or "").strip(),
         invocations=invocations,
-        sdk_detected=sdk.get("sdk_integration_detected", False),
-        sdk_summary=(sdk.get("summary") or "").strip(),
+        sdk_detected=sdk.sdk_integration_detected,
+        sdk_summary=(sdk.summary or "").strip(),
         sdks_used=sdks_used,
         sdk_usages=sdk_usages,
+        references=references,
+        reference_pages=list(dict.fromkeys(r["page"] for r in references if r["page"])),
     )
 
 
+def write_project_pages(project: Project, projects_dir: Path,
+                        duplicates: dict[SnippetKey, Duplicate] | None = None,
+                        related: dict[SnippetKey, list[SnippetKey]] | None = None) -> list[Path]:
+    """Write a project's page and its code-reference pages, dropping stale ones."""
+    pages = [(f"{project.name}.md", render_project_page(project, duplicates, related)),
+             *render_reference_pages(project)]
+    with instrumentation.stage("write"):
+        for stale in projects_dir.glob(f"{project.name}.refs-*.md"):
+            stale.unlink()
+        for name, content in pages:
+            (projects_dir / name).write_text(content)
+    return [projects_dir / name for name, _ in pages]
+
+
 # ── Approaches index page generation ─────────────────────────────────────────
 
-def render_approaches_page(projects: list[dict[str, Any]]) -> str:
+def load_latency_results(path: Path) -> dict[str, Any] | None:
+    """Measurements written by cli_latency_lab.py, or None if the lab has not been run."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def approach_anchor(approach: dict[str, Any]) -> str:
+    return approach["title"].lower().replace(" ", "-").replace("(", "").replace(")", "").replace("&", "").replace("/", "").replace(",", "")
+
+
+def render_latency_section(latency: dict[str, Any]) -> list[str]:
+    """The measured CLI approach table, with the emulator settings it was measured under."""
+    titles = {a["id"]: a for a in APPROACHES}
+    emu = latency["emulator"]
+    lines = ["## Measured Latency (CLI Approaches)\n"]
+    lines.append(
+        f"Measured by `scripts/cli_latency_lab.py` on {latency['generated_at'][:10]} against the local "
+        f"`claude` emulator ({emu['startup_ms']:.0f} ms startup, {emu['first_token_ms']:.0f} ms to first token, "
+        f"{emu['output_tokens']} tokens at {emu['tokens_per_second']:.0f} tokens/s, {emu['turns']} turn(s) "
+        f"per request), so the differences come from the integration pattern, not the model.\n")
+    lines.append("| Approach | Requests | Throughput (req/s) | p50 (ms) | p99 (ms) | RSS/process (MiB) | Processes |")
+    lines.append("|----------|----------|--------------------|----------|----------|-------------------|-----------|")
+    for r in latency["results"]:
+        a = titles.get(r["approach"])
+        label = f"[{a['title']}](#{approach_anchor(a)})" if a else r["approach"]
+        if r["concurrency"] > 1:
+            label += f" ({r['concurrency']} parallel)"
+        lines.append(f"| {label} | {r['requests']} | {r['throughput_rps']:.2f} | {r['latency_ms_p50']:.0f} | "
+                     f"{r['latency_ms_p99']:.0f} | {r['process_rss_mib']:.1f} | {r['processes']} |")
+    lines.append("")
+    return lines
+
+
+def render_approaches_page(projects: list[Project], membership: dict[str, list[str]] | None = None,
+                           latency: dict[str, Any] | None = None) -> str:
     """Generate the approaches index page with educational examples and project links."""
-    proj_map = {p["name"]: p for p in projects}
+    proj_map = {p.name: p for p in projects}
+    if membership is None:
+        membership = classify_approaches(build_feature_index(projects))
     lines: list[str] = []
 
     lines.append("# Claude Code Integration Approaches\n")
     lines.append(f"*Generated: {datetime.now().strftime('%Y-%m-%d')}*\n")
     lines.append("A practical reference to every integration approach discovered across "
-                 "12 open-source projects.\n")
+                 f"{len(projects)} open-source projects.\n")
     lines.append("Each approach includes a copy-pasteable educational example and links "
                  "to real production code in the per-project detail pages.\n")
 
@@ -615,13 +922,19 @@ def render_approaches_page(projects: list[dict[str, Any]]) -> str:
         if cat != current_cat:
             lines.append(f"| | **{cat}** | |")
             current_cat = cat
+        members = membership[a["id"]]
         proj_links = ", ".join(
-            f"[{p}](projects/{p}.md)" for p in a["projects"]
+            f"[{p}](projects/{p}.md)" for p in members[:APPROACH_LINKS_LISTED]
         )
-        anchor = a["title"].lower().replace(" ", "-").replace("(", "").replace(")", "").replace("&", "").replace("/", "").replace(",", "")
-        lines.append(f"| {i} | [{a['title']}](#{anchor}) | {proj_links} |")
+        if len(members) > APPROACH_LINKS_LISTED:
+            proj_links += f" (+{len(members) - APPROACH_LINKS_LISTED} more)"
+        lines.append(f"| {i} | [{a['title']}](#{approach_anchor(a)}) | {proj_links} |")
     lines.append("")
 
+    measured = {r["approach"]: r for r in latency["results"]} if latency else {}
+    if latency:
+        lines.extend(render_latency_section(latency))
+
     # ── Approach sections ────────────────────────────────────────────────
     for i, a in enumerate(APPROACHES, 1):
         cat = a["category"]
@@ -632,6 +945,10 @@ def render_approaches_page(projects: list[dict[str, Any]]) -> str:
         lines.append(f"### {a['title']}\n")
         lines.append(a["description"].strip())
         lines.append("")
+        if a["id"] in measured:
+            r = measured[a["id"]]
+            lines.append(f"**Measured** ([emulator](#measured-latency-cli-approaches)): p50 {r['latency_ms_p50']:.0f} ms, "
+                         f"p99 {r['latency_ms_p99']:.0f} ms, {r['throughput_rps']:.2f} requests/s.\n")
 
         # Educational example
         lines.append(f"```{a['example_lang']}")
@@ -648,19 +965,22 @@ def render_approaches_page(projects: list[dict[str, Any]]) -> str:
         lines.append("**Projects using this approach:**\n")
         lines.append("| Project | Language | Detail Page |")
         lines.append("|---------|----------|-------------|")
-        for pname in a["projects"]:
+        members = membership[a["id"]]
+        for pname in members[:APPROACH_ROWS_LISTED]:
             p = proj_map.get(pname)
-            if not p or not p["metadata"]:
+            if not p or not p.metadata:
                 lines.append(f"| {pname} | - | [view](projects/{pname}.md) |")
                 continue
-            meta = p["metadata"]
-            lang = meta.get("primary_language", "-")
-            repo = meta.get("repository", "")
-            display = meta.get("display_name", pname)
+            meta = p.metadata
+            lang = meta.primary_language or "-"
+            repo = meta.repository or ""
+            display = meta.display_name or pname
             lines.append(
                 f"| [{display}]({repo}) | {lang} | "
                 f"[code quotes & permalinks](projects/{pname}.md) |"
             )
+        if len(members) > APPROACH_ROWS_LISTED:
+            lines.append(f"| *and {len(members) - APPROACH_ROWS_LISTED} more* | | |")
         lines.append("")
 
     # ── Footer ───────────────────────────────────────────────────────────
@@ -671,6 +991,75 @@ def render_approaches_page(projects: list[dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
+# ── Watch mode ───────────────────────────────────────────────────────────────
+
+def watch_and_regenerate(projects: list[Project], output_dir: Path, dedup: bool = True,
+                         latency: dict[str, Any] | None = None):
+    """Re-render the edited project pages, and approaches.md if membership or a member changed."""
+    from report_watch import watch_projects
+
+    by_name = {p.name: p for p in projects}
+    features = {p.name: project_features(p) for p in projects}
+    index = build_feature_index(projects)
+    membership = classify_approaches(index)
+    # Unedited projects' snippets, signatures and graph nodes are reused by every rebuild
+    cluster_inputs, graph_inputs = ClusterInputs(), GraphInputs()
+    duplicates = cluster_snippets(projects, inputs=cluster_inputs) if dedup else {}
+    related = InvocationGraph(projects, graph_inputs).related()
+
+    def rebuild(names: set[str]):
+        nonlocal membership, duplicates, related
+        started = time.perf_counter()
+        names = {n for n in names if n != "_template"}
+        for name in sorted(names):
+            cluster_inputs.forget(name)
+            graph_inputs.forget(name)
+            project_dir = PROJECTS_DIR / name
+            if not project_dir.is_dir():
+                by_name.pop(name, None)
+                update_feature_index(index, name, features.pop(name, set()), set())
+                (output_dir / "projects" / f"{name}.md").unlink(missing_ok=True)
+                for stale in (output_dir / "projects").glob(f"{name}.refs-*.md"):
+                    stale.unlink()
+                continue
+            by_name[name] = load_project(project_dir)
+            new_features = project_features(by_name[name])
+            update_feature_index(index, name, features.get(name, set()), new_features)
+            features[name] = new_features
+
+        # An edit can make snippets on other projects' pages (un)linked too
+        rewrite = {n for n in names if n in by_name}
+        if dedup:
+            old = duplicates_by_project(duplicates)
+            duplicates = cluster_snippets([by_name[n] for n in sorted(by_name)], inputs=cluster_inputs)
+            new = duplicates_by_project(duplicates)
+            rewrite |= {n for n in old.keys() | new.keys() if n in by_name and old.get(n) != new.get(n)}
+        # ...and so can links that other projects' related_invocations resolve to
+        old = related_by_project(related)
+        related = InvocationGraph([by_name[n] for n in sorted(by_name)], graph_inputs).related()
+        new = related_by_project(related)
+        rewrite |= {n for n in old.keys() | new.keys() if n in by_name and old.get(n) != new.get(n)}
+        for name in sorted(rewrite):
+            for out_path in write_project_pages(by_name[name], output_dir / "projects", duplicates, related):
+                console.print(f"  [green]Generated:[/green] {out_path}")
+
+        # Membership changes, and edits to listed projects, show on approaches.md
+        old_members = {n for members in membership.values() for n in members}
+        new_membership = classify_approaches(index)
+        if new_membership != membership or names & old_members:
+            membership = new_membership
+            approaches_path = output_dir / "approaches.md"
+            approaches_path.write_text(render_approaches_page([by_name[n] for n in sorted(by_name)], membership, latency))
+            console.print(f"  [green]Generated:[/green] {approaches_path}")
+
+        if names:
+            elapsed = (time.perf_counter() - started) * 1000
+            console.print(f"[dim]{', '.join(sorted(names))} changed; rebuilt in {elapsed:.0f} ms[/dim]")
+
+    console.print(f"\n[bold]Watching {PROJECTS_DIR} for changes (Ctrl-C to stop)...[/bold]")
+    watch_projects(PROJECTS_DIR, rebuild)
+
+
 # ── Main ─────────────────────────────────────────────────────────────────────
 
 def main():
@@ -678,11 +1067,37 @@ def main():
         description="Generate approach pages and per-project detail pages")
     parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
                         help="Output directory (default: reports/generated/)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-render pages when project files change")
+    parser.add_argument("--snapshot", type=Path, metavar="PATH",
+                        help="Load the corpus from a snapshot written by snapshot_corpus.py")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Render every snippet in full instead of linking near-duplicates to one copy")
+    instrumentation.add_arguments(parser)
     args = parser.parse_args()
+    instrumentation.configure_from_args("generate_approach_pages", args)
+    instrumentation.instrument(vars(corpus_model), {"load_yaml": "parse"})
+    instrumentation.instrument(globals(), {
+        "load_all_projects": "load",
+        "render_project_page": "render",
+        "render_reference_pages": "render",
+        "render_approaches_page": "render",
+        "build_feature_index": "classify",
+        "cluster_snippets": "dedup",
+        "InvocationGraph": "graph",
+    })
+
+    if args.watch and args.snapshot:
+        parser.error("--watch reads projects/ directly and cannot be combined with --snapshot")
 
     console.print("[bold]Generating approach pages...[/bold]")
 
-    projects = load_all_projects()
+    if args.snapshot:
+        from snapshot_corpus import CorpusSnapshot
+        with CorpusSnapshot(args.snapshot) as snapshot:
+            projects = [p for p in snapshot.projects() if p.name != "_template"]
+    else:
+        projects = load_all_projects()
     if not projects:
         console.print("[yellow]No projects found.[/yellow]")
         return
@@ -693,22 +1108,33 @@ def main():
     projects_dir = output_dir / "projects"
     projects_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate per-project pages
+    # Snippets copied across projects are rendered once and linked from the others
+    duplicates = {} if args.no_dedup else cluster_snippets(projects)
+    # related_invocations resolved corpus-wide, listed on both ends of each link
+    graph = InvocationGraph(projects)
+    related = graph.related()
+    for link in graph.dangling:
+        console.print(f"  [yellow]{link.source[0]}: related link {link.target} is dangling ({link.reason})[/yellow]")
+
+    # Generate per-project pages (plus code-reference pages for large collections)
     for p in projects:
-        page = render_project_page(p)
-        out_path = projects_dir / f"{p['name']}.md"
-        out_path.write_text(page)
-        console.print(f"  [green]Generated:[/green] {out_path}")
+        for out_path in write_project_pages(p, projects_dir, duplicates, related):
+            console.print(f"  [green]Generated:[/green] {out_path}")
 
     # Generate approaches index
-    approaches_page = render_approaches_page(projects)
+    latency = load_latency_results(LATENCY_RESULTS)
+    approaches_page = render_approaches_page(projects, latency=latency)
     approaches_path = output_dir / "approaches.md"
-    approaches_path.write_text(approaches_page)
+    with instrumentation.stage("write"):
+        approaches_path.write_text(approaches_page)
     console.print(f"  [green]Generated:[/green] {approaches_path}")
 
     console.print(f"\n[bold green]Done![/bold green] {len(projects)} project pages + 1 approaches index")
     console.print(f"\nTo commit: cp -r {output_dir}/approaches.md {output_dir}/projects/ reports/committed/")
 
+    if args.watch:
+        watch_and_regenerate(projects, output_dir, dedup=not args.no_dedup, latency=latency)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Generate synthetic project corpora for benchmarking the scripts at scale.
+
+Each synthetic project starts from the documents in projects/_template and
+is filled in by sampling from the real corpus: a real project is picked as
+the archetype (integration types, number of invocations/usages), and the
+invocations, flag sets, SDK usages and snippets are drawn from the pool of
+all real entries, so flag co-occurrence and snippet sizes stay realistic.
+Enum values from specs/*.spec.yaml (analysis_status, sdk_usage.pattern,
+known CLI flags) are mixed in so the whole value space is exercised.
+
+Output is deterministic for a given --seed and size. Point any script at it
+with KB_PROJECTS_DIR:
+
+    KB_PROJECTS_DIR=tmp/synthetic/1000 ./scripts/research_status.py
+
+Usage:
+    ./scripts/generate_synthetic_corpus.py 1000                 # -> tmp/synthetic/1000/
+    ./scripts/generate_synthetic_corpus.py 100000 --jobs 16
+    ./scripts/generate_synthetic_corpus.py 50 -o /tmp/corpus --seed 7
+"""
+
+import argparse
+import copy
+import os
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+SPECS_DIR = REPO_ROOT / "specs"
+PROJECTS_DIR = REPO_ROOT / "projects"
+TEMPLATE_DIR = PROJECTS_DIR / "_template"
+DEFAULT_OUTPUT = REPO_ROOT / "tmp" / "synthetic"
+
+# Bump when the generated layout changes so cached corpora are rebuilt
+GENERATOR_VERSION = 1
+MARKER_FILE = ".synthetic"
+CHUNK_SIZE = 500
+
+# Share of spec-only values mixed into the empirical distributions
+SPEC_MIX = 0.3
+CODE_REFERENCE_RATE = 0.2
+
+TEMPLATE_FILES = {
+    "metadata": "metadata.project.yaml",
+    "cli": "cli.cli-integration.yaml",
+    "sdk": "sdk.sdk-integration.yaml",
+}
+
+WORDS = ("agent", "code", "pilot", "forge", "flow", "mate", "bench", "craft", "lab", "hub",
+         "smith", "works", "dev", "kit", "loop", "sense", "stack", "wave", "mind", "shell")
+
+
+def load_yaml(path: Path) -> dict[str, Any] | None:
+    """Load and parse a YAML file."""
+    try:
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+    except (yaml.YAMLError, FileNotFoundError):
+        return None
+
+
+def split_flag_names(entry: str) -> list[str]:
+    """'-c, --continue' -> ['-c', '--continue']"""
+    return [part.strip() for part in entry.split(",") if part.strip()]
+
+
+def build_model() -> dict[str, Any]:
+    """Collect templates, spec enums and pools of real entries to sample from."""
+    templates = {kind: load_yaml(TEMPLATE_DIR / name) or {} for kind, name in TEMPLATE_FILES.items()}
+    notes = (TEMPLATE_DIR / "notes.md").read_text() if (TEMPLATE_DIR / "notes.md").exists() else ""
+
+    project_spec = load_yaml(SPECS_DIR / "project.spec.yaml") or {}
+    cli_spec = load_yaml(SPECS_DIR / "cli-integration.spec.yaml") or {}
+    sdk_spec = load_yaml(SPECS_DIR / "sdk-integration.spec.yaml") or {}
+    fields = project_spec.get("fields", {})
+    spec_flags = sorted({name for group in (cli_spec.get("known_flags") or {}).values()
+                         for entry in group for name in split_flag_names(entry)})
+    usage_fields = sdk_spec.get("fields", {}).get("sdk_usage", {}).get("item_fields", {})
+
+    archetypes, invocations, usages, sdks, languages = [], [], [], [], []
+    for project_dir in sorted(PROJECTS_DIR.iterdir()):
+        if not project_dir.is_dir() or project_dir.name.startswith("_"):
+            continue
+        meta = load_yaml(project_dir / TEMPLATE_FILES["metadata"]) or {}
+        cli = load_yaml(project_dir / TEMPLATE_FILES["cli"]) or {}
+        sdk = load_yaml(project_dir / TEMPLATE_FILES["sdk"]) or {}
+        archetypes.append({
+            "integration_types": meta.get("integration_types") or [],
+            "analysis_status": meta.get("analysis_status", "pending"),
+            "invocations": len(cli.get("invocations") or []),
+            "sdk_usage": len(sdk.get("sdk_usage") or []),
+            "sdks_used": len(sdk.get("sdks_used") or []),
+        })
+        invocations.extend(i for i in cli.get("invocations") or [] if isinstance(i, dict))
+        usages.extend(u for u in sdk.get("sdk_usage") or [] if isinstance(u, dict))
+        sdks.extend(s for s in sdk.get("sdks_used") or [] if isinstance(s, dict))
+        languages.extend(meta.get("languages") or [])
+
+    return {
+        "templates": templates,
+        "notes": notes,
+        "statuses": fields.get("analysis_status", {}).get("enum_values", ["pending"]),
+        "integration_types": fields.get("integration_types", {}).get("enum_values", ["cli", "sdk"]),
+        "sdk_patterns": usage_fields.get("pattern", {}).get("enum_values", ["custom"]),
+        "spec_flags": spec_flags,
+        "archetypes": archetypes,
+        "invocations": invocations,
+        "usages": usages,
+        "sdks": sdks,
+        "languages": languages or ["Python", "TypeScript"],
+    }
+
+
+# ── Sampling ─────────────────────────────────────────────────────────────────
+
+def project_name(index: int) -> str:
+    return f"synth-{index:06d}"
+
+
+def sample_reference(rng: random.Random, ref: dict[str, Any] | None, repository: str, commit: str) -> dict[str, Any]:
+    ref = dict(ref or {})
+    start = rng.randint(1, 2000)
+    span = (ref.get("lines") or [0, rng.randint(0, 60)])
+    length = max(0, span[-1] - span[0]) if len(span) == 2 else 0
+    ref.update(repository=repository, commit=commit, lines=[start, start + length])
+    ref.setdefault("path", f"src/{rng.choice(WORDS)}/{rng.choice(WORDS)}.py")
+    return ref
+
+
+def sample_invocation(rng: random.Random, model: dict[str, Any], n: int,
+                      repository: str, commit: str) -> dict[str, Any]:
+    source = rng.choice(model["invocations"]) if model["invocations"] else {}
+    invocation = copy.deepcopy(source)
+    invocation["id"] = f"{source.get('id', 'invocation')}-{n}"
+    invocation.setdefault("description", "Synthetic CLI invocation")
+    invocation["reference"] = sample_reference(rng, source.get("reference"), repository, commit)
+    invocation.pop("related_invocations", None)
+    flags = invocation.setdefault("flags_used", [])
+    if model["spec_flags"] and rng.random() < SPEC_MIX:
+        flag = rng.choice(model["spec_flags"])
+        if not any(f.get("flag") == flag for f in flags if isinstance(f, dict)):
+            flags.append({"flag": flag, "value_type": "string", "purpose": "Synthetic flag from spec"})
+    invocation.setdefault("command_pattern", "claude " + " ".join(f.get("flag", "") for f in flags))
+    invocation.setdefault("snippet", "")
+    return invocation
+
+
+def sample_usage(rng: random.Random, model: dict[str, Any], n: int, repository: str, commit: str) -> dict[str, Any]:
+    source = rng.choice(model["usages"]) if model["usages"] else {}
+    usage = copy.deepcopy(source)
+    usage["id"] = f"{source.get('id', 'usage')}-{n}"
+    usage.setdefault("sdk", "anthropic-python")
+    usage.setdefault("description", "Synthetic SDK usage")
+    if rng.random() < SPEC_MIX or "pattern" not in usage:
+        usage["pattern"] = rng.choice(model["sdk_patterns"])
+    usage["reference"] = sample_reference(rng, source.get("reference"), repository, commit)
+    usage.setdefault("snippet", "")
+    return usage
+
+
+def sample_count(rng: random.Random, observed: int) -> int:
+    """Vary an archetype's count by roughly ±50% (never negative)."""
+    if observed == 0:
+        return 1 if rng.random() < 0.1 else 0
+    return max(1, round(observed * rng.uniform(0.5, 1.5)))
+
+
+def generate_project(rng: random.Random, model: dict[str, Any], index: int) -> dict[str, Any]:
+    """Return {filename: content} for one synthetic project."""
+    name = project_name(index)
+    archetype = rng.choice(model["archetypes"]) if model["archetypes"] else {
+        "integration_types": [], "analysis_status": "pending", "invocations": 0, "sdk_usage": 0, "sdks_used": 0}
+    repository = f"https://github.com/synthetic/{name}"
+    commit = "%040x" % rng.getrandbits(160)
+
+    types = list(archetype["integration_types"])
+    if rng.random() < SPEC_MIX:
+        extra = rng.choice(model["integration_types"])
+        if extra not in types:
+            types.append(extra)
+    status = archetype["analysis_status"] if rng.random() >= SPEC_MIX else rng.choice(model["statuses"])
+    languages = sorted(set(rng.sample(model["languages"], k=min(len(model["languages"]), rng.randint(1, 3)))))
+
+    metadata = copy.deepcopy(model["templates"]["metadata"])
+    metadata.update(
+        name=name,
+        display_name=" ".join(w.capitalize() for w in rng.sample(WORDS, 2)),
+        repository=repository,
+        description=f"Synthetic project {index} generated for benchmarks",
+        analyzed_commit=commit,
+        analyzed_at=f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        primary_language=languages[0],
+        languages=languages,
+        tags=rng.sample(WORDS, 2),
+        integration_types=types,
+        analysis_status=status,
+    )
+    files = {TEMPLATE_FILES["metadata"]: metadata}
+
+    invocations = [sample_invocation(rng, model, n, repository, commit)
+                   for n in range(sample_count(rng, archetype["invocations"]))] if "cli" in types else []
+    cli = copy.deepcopy(model["templates"]["cli"])
+    cli.update(project=name, cli_integration_detected=bool(invocations),
+               summary="Synthetic CLI integration" if invocations else "", invocations=invocations)
+    files[TEMPLATE_FILES["cli"]] = cli
+
+    usages = [sample_usage(rng, model, n, repository, commit)
+              for n in range(sample_count(rng, archetype["sdk_usage"]))] if "sdk" in types else []
+    sdk = copy.deepcopy(model["templates"]["sdk"])
+    sdks_used = []
+    if usages and model["sdks"]:
+        sdks_used = copy.deepcopy(rng.sample(model["sdks"], k=min(len(model["sdks"]), max(1, archetype["sdks_used"]))))
+    sdk.update(project=name, sdk_integration_detected=bool(usages),
+               summary="Synthetic SDK integration" if usages else "", sdks_used=sdks_used, sdk_usage=usages)
+    files[TEMPLATE_FILES["sdk"]] = sdk
+
+    if invocations and rng.random() < CODE_REFERENCE_RATE:
+        references = []
+        for invocation in invocations:
+            ref = invocation["reference"]
+            references.append({
+                "id": invocation["id"],
+                "title": invocation.get("description", "")[:60] or invocation["id"],
+                **{k: ref[k] for k in ("repository", "commit", "path", "lines") if k in ref},
+                "snippet": invocation.get("snippet") or "",
+            })
+        files["invocations.code-reference.yaml"] = {
+            "project": name,
+            "topic": "CLI invocations",
+            "description": "Synthetic code references",
+            "references": references,
+        }
+
+    files["notes.md"] = model["notes"].replace("{Project Name}", metadata["display_name"])
+    return files
+
+
+def write_chunk(job: tuple[Path, int, int, int, dict[str, Any]]) -> int:
+    """Generate and write projects [start, stop) with per-project seeded RNGs."""
+    output, start, stop, seed, model = job
+    for index in range(start, stop):
+        rng = random.Random(seed * 1_000_003 + index)
+        project_dir = output / project_name(index)
+        project_dir.mkdir(parents=True, exist_ok=True)
+        for filename, content in generate_project(rng, model, index).items():
+            with open(project_dir / filename, "w") as f:
+                if isinstance(content, str):
+                    f.write(content)
+                else:
+                    yaml.safe_dump(content, f, sort_keys=False, allow_unicode=True, width=120)
+    return stop - start
+
+
+def corpus_marker(size: int, seed: int) -> str:
+    return f"version={GENERATOR_VERSION} size={size} seed={seed}\n"
+
+
+def generate_corpus(size: int, output: Path, seed: int = 0, jobs: int | None = None, force: bool = False) -> bool:
+    """Write a synthetic corpus of `size` projects; returns False if an identical one already exists."""
+    marker = output / MARKER_FILE
+    if not force and marker.exists() and marker.read_text() == corpus_marker(size, seed):
+        return False
+    if output.exists():
+        if not (output / MARKER_FILE).exists() and any(output.iterdir()):
+            raise ValueError(f"{output} exists and is not a synthetic corpus; refusing to overwrite")
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+    model = build_model()
+    chunks = [(output, start, min(start + CHUNK_SIZE, size), seed, model) for start in range(0, size, CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 4) as pool:
+        for _ in pool.map(write_chunk, chunks):
+            pass
+    marker.write_text(corpus_marker(size, seed))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic project corpus")
+    parser.add_argument("size", type=int, help="Number of projects")
+    parser.add_argument("--output", "-o", type=Path, help="Output directory (default: tmp/synthetic/{size}/)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Worker processes")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if an identical corpus exists")
+    args = parser.parse_args()
+
+    output = args.output or DEFAULT_OUTPUT / str(args.size)
+    started = time.perf_counter()
+    try:
+        written = generate_corpus(args.size, output, args.seed, args.jobs, args.force)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    if written:
+        console.print(f"[green]Generated {args.size} projects in {output}[/green] "
+                      f"({time.perf_counter() - started:.1f}s)")
+    else:
+        console.print(f"{output} is already up to date (use --force to regenerate)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Optional profiling and per-stage timings shared by the scripts.
+
+    --timings              per-stage wall/CPU/peak-RSS table on exit
+    --profile              cProfile the run, dump it to tmp/profile/ and print the top N
+    --profile-top N        how many functions the --profile summary lists (default 25)
+    KB_TIMINGS_JSON=PATH   also append the stage data to PATH as one JSON line ("-" for stderr)
+
+Nothing is wrapped until configure() turns instrumentation on: instrument()
+is a no-op and stage() returns a shared do-nothing context manager, so a
+normal run pays no per-call cost in the hot loops.
+
+Stages are named, and several functions (or blocks) may share a stage.
+Re-entering a stage that is already running (recursion) is not double
+counted. Nested stages are included in their parents' times.
+"""
+
+import atexit
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+REPO_ROOT = Path(__file__).parent.parent
+PROFILE_DIR = REPO_ROOT / "tmp" / "profile"
+JSON_ENV_VAR = "KB_TIMINGS_JSON"
+DEFAULT_TOP = 25
+
+# Reports go to stderr so they never mix with machine-readable stdout (--format json)
+console = Console(stderr=True)
+
+ENABLED = False
+_stages: dict[str, "StageStats"] = {}
+_settings: dict[str, Any] = {}
+
+
+class StageStats:
+    __slots__ = ("calls", "wall", "cpu", "peak_rss", "depth", "wall_start", "cpu_start")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_rss = 0
+        self.depth = 0
+        self.wall_start = 0.0
+        self.cpu_start = 0.0
+
+
+class _Stage:
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: StageStats):
+        self.stats = stats
+
+    def __enter__(self):
+        stats = self.stats
+        if stats.depth == 0:
+            stats.calls += 1
+            stats.wall_start = time.perf_counter()
+            stats.cpu_start = time.process_time()
+        stats.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        stats = self.stats
+        stats.depth -= 1
+        if stats.depth == 0:
+            stats.wall += time.perf_counter() - stats.wall_start
+            stats.cpu += time.process_time() - stats.cpu_start
+            stats.peak_rss = max(stats.peak_rss, peak_rss_bytes())
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def peak_rss_bytes() -> int:
+    """Process high-water RSS so far (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def stats_for(name: str) -> StageStats:
+    stats = _stages.get(name)
+    if stats is None:
+        stats = _stages[name] = StageStats()
+    return stats
+
+
+def stage(name: str) -> _Stage | _NullStage:
+    """Context manager timing a block as part of stage `name`."""
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(stats_for(name))
+
+
+def timed(func: Callable, name: str) -> Callable:
+    stats = stats_for(name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _Stage(stats):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument(namespace: dict[str, Any], stages: dict[str, str]):
+    """Rebind functions in a module namespace (globals()) to timed wrappers.
+
+    stages maps function name -> stage name. Does nothing unless enabled, so
+    the module keeps calling the original functions directly.
+    """
+    if not ENABLED:
+        return
+    for func_name, stage_name in stages.items():
+        namespace[func_name] = timed(namespace[func_name], stage_name)
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--timings", action="store_true", help="Print per-stage wall/CPU/peak-RSS timings")
+    group.add_argument("--profile", action="store_true", help="Profile with cProfile (dump in tmp/profile/)")
+    group.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N",
+                       help=f"Functions listed by --profile (default: {DEFAULT_TOP})")
+
+
+def configure(script: str, timings: bool = False, profile: bool = False, top: int = DEFAULT_TOP):
+    """Enable instrumentation if any of --timings, --profile or KB_TIMINGS_JSON asks for it."""
+    global ENABLED
+    json_target = os.environ.get(JSON_ENV_VAR)
+    if not (timings or profile or json_target):
+        return
+    ENABLED = True
+    _settings.update(script=script, timings=timings, top=top, json=json_target,
+                     wall_start=time.perf_counter(), cpu_start=time.process_time())
+    if profile:
+        profiler = cProfile.Profile()
+        _settings["profiler"] = profiler
+        profiler.enable()
+    atexit.register(report)
+
+
+def configure_from_args(script: str, args):
+    configure(script, timings=args.timings, profile=args.profile, top=args.profile_top)
+
+
+def stage_records() -> list[dict[str, Any]]:
+    records = [{
+        "stage": "total",
+        "calls": 1,
+        "wall_s": round(time.perf_counter() - _settings["wall_start"], 6),
+        "cpu_s": round(time.process_time() - _settings["cpu_start"], 6),
+        "peak_rss_bytes": peak_rss_bytes(),
+    }]
+    for name, stats in _stages.items():
+        if stats.calls:
+            records.append({
+                "stage": name,
+                "calls": stats.calls,
+                "wall_s": round(stats.wall, 6),
+                "cpu_s": round(stats.cpu, 6),
+                "peak_rss_bytes": stats.peak_rss,
+            })
+    return records
+
+
+def report():
+    """atexit hook: stop the profiler and emit whatever was requested."""
+    profiler = _settings.get("profiler")
+    if profiler is not None:
+        profiler.disable()
+    records = stage_records()
+
+    if profiler is not None:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        dump = PROFILE_DIR / f"{_settings['script']}-{datetime.now():%Y%m%d-%H%M%S}.prof"
+        profiler.dump_stats(dump)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(_settings["top"])
+        sys.stderr.write(out.getvalue().strip() + "\n")
+        console.print(f"Profile written to {dump} (open with: python -m pstats {dump})", soft_wrap=True)
+
+    if _settings.get("timings"):
+        table = Table(title=f"Timings: {_settings['script']}")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Wall (s)", justify="right")
+        table.add_column("CPU (s)", justify="right")
+        table.add_column("Peak RSS (MiB)", justify="right")
+        for r in records[1:] + records[:1]:
+            table.add_row(r["stage"], str(r["calls"]), f"{r['wall_s']:.3f}", f"{r['cpu_s']:.3f}",
+                          f"{r['peak_rss_bytes'] / 2**20:.1f}", end_section=r is records[-1])
+        console.print(table)
+
+    target = _settings.get("json")
+    if target:
+        payload = json.dumps({
+            "script": _settings["script"],
+            "argv": sys.argv[1:],
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "stages": records,
+        })
+        if target == "-":
+            print(payload, file=sys.stderr)
+        else:
+            with open(target, "a") as f:
+                f.write(payload + "\n")
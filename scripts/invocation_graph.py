@@ -0,0 +1,281 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Resolve `related_invocations` into a corpus-wide graph of related patterns.
+
+Every CLI invocation and SDK usage in the corpus is a node; each entry of an
+invocation's `related_invocations` is an edge to the node it names. Entries
+may take any of these forms:
+
+    projects/other-project/cli.cli-integration.yaml#similar-invocation
+    projects/other-project/sdk.sdk-integration.yaml#some-usage
+    other-project#similar-invocation
+    similar-invocation          # this project first, else the one project that has it
+
+Entries that name no node (or a bare ID several projects share) are reported
+as dangling. Relations are treated as symmetric: the project pages list a
+node's related nodes whichever side declared the link.
+
+    ./scripts/invocation_graph.py                         # node/edge counts and dangling IDs
+    ./scripts/invocation_graph.py --components 20         # also list the largest related groups
+    ./scripts/invocation_graph.py --json tmp/invocation-graph.json
+
+How it scales: nodes are numbered once and looked up through dicts keyed by
+(project, kind, id), (project, id) and bare id, so resolving an entry is
+O(1). Edges are then laid out as adjacency arrays (CSR: an offsets array
+indexed by node and one flat targets array), built with a counting pass over
+the edge list, so building is linear in nodes plus edges and components are
+a single BFS over the arrays. Watch mode passes a GraphInputs so that the
+nodes and related_invocations entries of unedited projects are not walked
+again on every rebuild.
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from corpus_model import Project, load_projects
+from snippet_clusters import SnippetKey
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+
+# Which node kind a file named in a related_invocations path holds
+FILE_KINDS = {
+    "cli.cli-integration.yaml": "invocation",
+    "sdk.sdk-integration.yaml": "sdk_usage",
+}
+# Marks a bare ID that more than one project defines
+AMBIGUOUS = -1
+
+
+@dataclass(slots=True, frozen=True)
+class DanglingLink:
+    """A related_invocations entry that names no node."""
+    source: SnippetKey
+    target: str
+    reason: str
+
+
+def project_nodes(project: Project) -> list[tuple[SnippetKey, list[str]]]:
+    """(node, its related_invocations entries) for the project's invocations and SDK usages."""
+    nodes = []
+    if project.cli:
+        nodes += (((project.name, "invocation", inv.id or "unknown"), inv.related_invocations)
+                  for inv in project.cli.invocations)
+    if project.sdk:
+        nodes += (((project.name, "sdk_usage", usage.id or "unknown"), []) for usage in project.sdk.sdk_usage)
+    return nodes
+
+
+class GraphInputs:
+    """Per-project nodes and links, reused across InvocationGraph builds."""
+
+    __slots__ = ("nodes",)
+
+    def __init__(self):
+        self.nodes: dict[str, list[tuple[SnippetKey, list[str]]]] = {}
+
+    def project_nodes(self, project: Project) -> list[tuple[SnippetKey, list[str]]]:
+        nodes = self.nodes.get(project.name)
+        if nodes is None:
+            nodes = self.nodes[project.name] = project_nodes(project)
+        return nodes
+
+    def forget(self, name: str):
+        """Drop a project's nodes after it was edited or removed."""
+        self.nodes.pop(name, None)
+
+
+class InvocationGraph:
+    """Invocations and SDK usages as nodes, related_invocations as undirected edges."""
+
+    __slots__ = ("nodes", "index", "by_project_id", "by_id", "offsets", "targets", "edge_count", "dangling")
+
+    def __init__(self, projects: list[Project], inputs: GraphInputs | None = None):
+        self.nodes: list[SnippetKey] = []
+        self.index: dict[SnippetKey, int] = {}
+        self.by_project_id: dict[tuple[str, str], int] = {}
+        self.by_id: dict[str, int] = {}
+        self.dangling: list[DanglingLink] = []
+
+        links: list[tuple[int, str]] = []
+        for project in projects:
+            for key, related in inputs.project_nodes(project) if inputs else project_nodes(project):
+                node = self._add(key)
+                links += ((node, target) for target in related)
+
+        edges: set[tuple[int, int]] = set()
+        for source, target in links:
+            resolved = self.resolve(target, self.nodes[source][0])
+            if resolved < 0:
+                reason = "ambiguous ID" if resolved == AMBIGUOUS else "no such ID"
+                self.dangling.append(DanglingLink(self.nodes[source], target, reason))
+            elif resolved != source:
+                edges.add((min(source, resolved), max(source, resolved)))
+        self.edge_count = len(edges)
+        self.offsets, self.targets = self._adjacency(edges)
+
+    def _add(self, key: SnippetKey) -> int:
+        node = self.index.get(key)
+        if node is not None:
+            return node
+        node = self.index[key] = len(self.nodes)
+        self.nodes.append(key)
+        name, _, item_id = key
+        self.by_project_id.setdefault((name, item_id), node)
+        known = self.by_id.get(item_id)
+        if known is None:
+            self.by_id[item_id] = node
+        elif known != AMBIGUOUS and self.nodes[known][0] != name:
+            self.by_id[item_id] = AMBIGUOUS
+        return node
+
+    def _adjacency(self, edges: set[tuple[int, int]]) -> tuple[array, array]:
+        """CSR arrays: the neighbours of node n are targets[offsets[n]:offsets[n + 1]]."""
+        offsets = array("i", bytes(4 * (len(self.nodes) + 1)))
+        for a, b in edges:
+            offsets[a + 1] += 1
+            offsets[b + 1] += 1
+        for n in range(len(self.nodes)):
+            offsets[n + 1] += offsets[n]
+        targets = array("i", bytes(4 * offsets[-1]))
+        fill = offsets[:-1]
+        for a, b in sorted(edges):
+            targets[fill[a]] = b
+            fill[a] += 1
+            targets[fill[b]] = a
+            fill[b] += 1
+        return offsets, targets
+
+    def resolve(self, target: str, project: str) -> int:
+        """The node a related_invocations entry of `project` names, or a negative number."""
+        location, sep, item_id = target.strip().rpartition("#")
+        if not sep:
+            # A bare ID: the linking project's own node wins over the corpus-wide lookup
+            node = self.by_project_id.get((project, item_id))
+            return node if node is not None else self.by_id.get(item_id, -2)
+        parts = location.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "projects" and parts[2] in FILE_KINDS:
+            return self.index.get((parts[1], FILE_KINDS[parts[2]], item_id), -2)
+        if len(parts) == 1 and parts[0]:
+            return self.by_project_id.get((parts[0], item_id), -2)
+        return -2
+
+    def neighbours(self, key: SnippetKey) -> list[SnippetKey]:
+        node = self.index.get(key)
+        if node is None:
+            return []
+        return [self.nodes[n] for n in self.targets[self.offsets[node]:self.offsets[node + 1]]]
+
+    def components(self) -> list[list[SnippetKey]]:
+        """Groups of two or more related nodes, largest first."""
+        seen = bytearray(len(self.nodes))
+        groups: list[list[SnippetKey]] = []
+        for start in range(len(self.nodes)):
+            if seen[start] or self.offsets[start] == self.offsets[start + 1]:
+                continue
+            seen[start] = 1
+            queue = [start]
+            for node in queue:
+                for n in self.targets[self.offsets[node]:self.offsets[node + 1]]:
+                    if not seen[n]:
+                        seen[n] = 1
+                        queue.append(n)
+            groups.append(sorted(self.nodes[n] for n in queue))
+        groups.sort(key=lambda g: (-len(g), g[0]))
+        return groups
+
+    def related(self) -> dict[SnippetKey, list[SnippetKey]]:
+        """Every linked node mapped to its related nodes, for the project pages."""
+        return {key: sorted(self.neighbours(key)) for n, key in enumerate(self.nodes)
+                if self.offsets[n] != self.offsets[n + 1]}
+
+
+def related_by_project(related: dict[SnippetKey, list[SnippetKey]]) -> dict[str, dict[SnippetKey, list[SnippetKey]]]:
+    grouped: dict[str, dict[SnippetKey, list[SnippetKey]]] = {}
+    for key, keys in related.items():
+        grouped.setdefault(key[0], {})[key] = keys
+    return grouped
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def label(key: SnippetKey) -> str:
+    return " › ".join((key[0], key[2]))
+
+
+def print_summary(graph: InvocationGraph, top: int):
+    components = graph.components()
+    table = Table(title="Invocation graph")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Nodes (invocations + SDK usages)", str(len(graph.nodes)))
+    table.add_row("Edges", str(graph.edge_count))
+    table.add_row("Linked nodes", str(sum(len(c) for c in components)))
+    table.add_row("Components", str(len(components)))
+    table.add_row("Dangling links", str(len(graph.dangling)))
+    console.print(table)
+
+    if top and components:
+        table = Table(title=f"Largest {min(top, len(components))} components")
+        table.add_column("Nodes", justify="right")
+        table.add_column("Projects", justify="right")
+        table.add_column("Members")
+        for group in components[:top]:
+            members = ", ".join(label(k) for k in group[:5]) + (", ..." if len(group) > 5 else "")
+            table.add_row(str(len(group)), str(len({k[0] for k in group})), members)
+        console.print(table)
+
+    for link in graph.dangling:
+        console.print(f"  [yellow]{label(link.source)}: {link.target} ({link.reason})[/yellow]")
+
+
+def write_graph_json(graph: InvocationGraph, path: Path):
+    def node(key: SnippetKey) -> dict:
+        return {"project": key[0], "kind": key[1], "id": key[2]}
+
+    data = {
+        "nodes": len(graph.nodes),
+        "edges": graph.edge_count,
+        "components": [[node(k) for k in group] for group in graph.components()],
+        "dangling": [{"source": node(d.source), "target": d.target, "reason": d.reason} for d in graph.dangling],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    console.print(f"[green]Wrote:[/green] {path} ({len(data['components'])} components)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve related_invocations into a graph of related patterns")
+    parser.add_argument("--components", type=int, default=0, metavar="N", help="List the N largest components")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write components and dangling links as JSON")
+    parser.add_argument("--strict", action="store_true", help="Exit with status 1 if any link is dangling")
+    args = parser.parse_args()
+
+    graph = InvocationGraph(load_projects(PROJECTS_DIR, skip={"_template"}))
+    print_summary(graph, args.components)
+    if args.json:
+        write_graph_json(graph, args.json)
+    if args.strict and graph.dangling:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
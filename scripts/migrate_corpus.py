@@ -0,0 +1,440 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+#     "ruamel.yaml>=0.18",
+# ]
+# ///
+"""
+Migrate the corpus to the current spec versions.
+
+A schema change is made by bumping spec_version in specs/{type}.spec.yaml
+and adding a declarative migration to specs/migrations/{type}/ (format in
+specs/migrations/README.md). This script then brings every
+projects/*/*.{type}.yaml (including _template) up to date:
+
+* a data file's version is its top-level spec_version, or "1.0" when it
+  has none; files at the spec's version are skipped without being parsed;
+* the chain of migrations from the file's version to the spec's is applied
+  to a round-trip (ruamel.yaml) load, so comments, blank lines, quoting,
+  flow lists and key order are kept, and spec_version is stamped. A file
+  the round trip alone would change is reported as an error, not rewritten;
+* files are migrated in a process pool; --dry-run prints a unified diff
+  instead of writing.
+
+    ./scripts/migrate_corpus.py --dry-run                  # what would change
+    ./scripts/migrate_corpus.py                            # migrate every file
+    ./scripts/migrate_corpus.py --spec code-reference --jobs 8
+"""
+
+import argparse
+import difflib
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+from ruamel.yaml import YAML
+from ruamel.yaml.comments import CommentedMap, CommentedSeq
+from ruamel.yaml.scalarstring import DoubleQuotedScalarString
+from ruamel.yaml.tokens import CommentToken
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+SPECS_DIR = REPO_ROOT / "specs"
+MIGRATIONS_DIR = SPECS_DIR / "migrations"
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+
+# Data files written before versioning follow the first spec version
+INITIAL_VERSION = "1.0"
+OPERATIONS = {"rename", "split", "move", "default"}
+VERSION_LINE = re.compile(r"""^spec_version:\s*["']?([^"'\s#]+)""", re.MULTILINE)
+NESTED_KEY = re.compile(r"""^[^\s#'"-][^#]*:\s*(#.*)?$""")
+
+
+class MigrationError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class Migration:
+    spec_type: str
+    from_version: str
+    to_version: str
+    description: str = ""
+    operations: list[dict[str, Any]] = field(default_factory=list)
+    source: str = ""
+
+
+@dataclass(slots=True)
+class FileResult:
+    path: str
+    spec_type: str
+    # "current", "migrated" or "error"
+    status: str
+    from_version: str = ""
+    diff: str = ""
+    error: str = ""
+
+
+def version_key(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split("."))
+
+
+# ── Loading migrations ───────────────────────────────────────────────────────
+
+def spec_versions() -> dict[str, str]:
+    versions = {}
+    for spec_file in sorted(SPECS_DIR.glob("*.spec.yaml")):
+        with open(spec_file) as f:
+            spec = yaml.safe_load(f) or {}
+        if spec.get("spec_type") and spec.get("spec_version"):
+            versions[spec["spec_type"]] = str(spec["spec_version"])
+    return versions
+
+
+def check_operation(op: dict[str, Any], source: str):
+    name = op.get("op")
+    if name not in OPERATIONS:
+        raise MigrationError(f"{source}: unknown op {name!r} (expected one of {sorted(OPERATIONS)})")
+    required = {"rename": ["path", "to"], "split": ["path", "into"], "move": ["path", "fields", "under"],
+                "default": ["path", "value"]}[name]
+    missing = [key for key in required if key not in op]
+    if missing:
+        raise MigrationError(f"{source}: {name} needs {', '.join(missing)}")
+
+
+def load_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> dict[str, list[Migration]]:
+    """spec type -> its migrations, oldest first; the chain must be contiguous."""
+    by_type: dict[str, list[Migration]] = {}
+    for path in sorted(migrations_dir.glob("*/*.yaml")):
+        with open(path) as f:
+            doc = yaml.safe_load(f) or {}
+        source = str(path.relative_to(REPO_ROOT) if path.is_relative_to(REPO_ROOT) else path)
+        try:
+            migration = Migration(spec_type=path.parent.name, from_version=str(doc["from_version"]),
+                                  to_version=str(doc["to_version"]), description=doc.get("description", ""),
+                                  operations=list(doc.get("operations") or []), source=source)
+        except KeyError as e:
+            raise MigrationError(f"{source}: missing {e.args[0]}") from None
+        for op in migration.operations:
+            check_operation(op, source)
+        by_type.setdefault(migration.spec_type, []).append(migration)
+
+    for spec_type, migrations in by_type.items():
+        migrations.sort(key=lambda m: version_key(m.from_version))
+        for previous, migration in zip(migrations, migrations[1:]):
+            if previous.to_version != migration.from_version:
+                raise MigrationError(f"{spec_type}: no migration from {previous.to_version} "
+                                     f"(next one, {migration.source}, starts at {migration.from_version})")
+    return by_type
+
+
+def migration_chain(migrations: list[Migration], from_version: str, to_version: str) -> list[Migration]:
+    by_from = {m.from_version: m for m in migrations}
+    chain = []
+    version = from_version
+    while version != to_version:
+        migration = by_from.get(version)
+        if not migration or version_key(migration.to_version) > version_key(to_version):
+            raise MigrationError(f"no migration path from {from_version} to {to_version}")
+        chain.append(migration)
+        version = migration.to_version
+    return chain
+
+
+# ── Operations (on ruamel round-trip data) ───────────────────────────────────
+
+def parents(data: Any, path: list[str]) -> list[Any]:
+    """The mappings a dotted path ("references[].lines" minus its last key) points into."""
+    nodes = [data]
+    for key in path:
+        is_list = key.endswith("[]")
+        key = key.removesuffix("[]")
+        found = []
+        for node in nodes:
+            value = node.get(key) if hasattr(node, "get") else None
+            if is_list and isinstance(value, list):
+                found.extend(value)
+            elif value is not None and not is_list:
+                found.append(value)
+        nodes = found
+    return [node for node in nodes if hasattr(node, "insert")]
+
+
+def split_path(path: str) -> tuple[list[str], str]:
+    parts = path.split(".")
+    return parts[:-1], parts[-1]
+
+
+def replace_key(mapping: Any, old: str, new_items: list[tuple[str, Any]]):
+    """Put new_items where old was, keeping the comment that followed old's value."""
+    position = list(mapping.keys()).index(old)
+    comment = mapping.ca.items.pop(old, None)
+    del mapping[old]
+    for offset, (key, value) in enumerate(new_items):
+        mapping.insert(position + offset, key, value)
+    if comment and new_items:
+        mapping.ca.items[new_items[-1][0]] = comment
+
+
+def trailing_comment(node: Any) -> tuple[Any, Any, int] | None:
+    """(container, key, slot) of the comment token after the last value inside node, if any.
+
+    ruamel keeps the blank lines and comments that follow a block on its
+    deepest last value, so that is where they are looked up.
+    """
+    found = None
+    while isinstance(node, (CommentedMap, CommentedSeq)) and node:
+        key, slot = (next(reversed(node)), 2) if isinstance(node, CommentedMap) else (len(node) - 1, 0)
+        entry = node.ca.items.get(key)
+        if entry and entry[slot] is not None:
+            found = (node, key, slot)
+        node = node[key]
+    return found
+
+
+def append_key(mapping: Any, key: str, value: Any):
+    """Add key at the end of mapping, ahead of the blank lines and comments that close it."""
+    holder = trailing_comment(mapping)
+    mapping[key] = value
+    if holder is None:
+        return
+    container, last, slot = holder
+    token = container.ca.items[last][slot]
+    # The token runs from the end of the last value's line: keep its end-of-line comment there
+    eol, newline, rest = token.value.partition("\n")
+    if not rest:
+        return
+    token.value = eol + newline
+    mapping.ca.items[key] = [None, None, CommentToken("\n" + rest, token.start_mark, None), None]
+
+
+def apply_operation(data: Any, op: dict[str, Any]) -> int:
+    """Apply one operation wherever its path matches; returns how many mappings changed."""
+    if op["op"] == "move":
+        # path names the mapping that holds the fields ("" = top level); under is created inside it
+        key = None
+        mappings = parents(data, op["path"].split(".") if op["path"] else [])
+    else:
+        parent_path, key = split_path(op["path"])
+        mappings = parents(data, parent_path)
+    changed = 0
+    for mapping in mappings:
+        if op["op"] == "rename":
+            if key not in mapping:
+                continue
+            if op["to"] in mapping:
+                raise MigrationError(f"rename {op['path']}: {op['to']} already exists")
+            replace_key(mapping, key, [(op["to"], mapping[key])])
+        elif op["op"] == "split":
+            if key not in mapping:
+                continue
+            value = mapping[key]
+            parts = value.split(op.get("separator", ",")) if isinstance(value, str) else list(value or [])
+            into = op["into"]
+            if len(parts) > len(into):
+                raise MigrationError(f"split {op['path']}: {len(parts)} parts for {len(into)} fields")
+            replace_key(mapping, key, [(name, part.strip() if isinstance(part, str) else part)
+                                       for name, part in zip(into, parts)])
+        elif op["op"] == "move":
+            present = [name for name in op["fields"] if name in mapping]
+            if not present:
+                continue
+            target = mapping.get(op["under"])
+            if target is None:
+                target = CommentedMap()
+                mapping.insert(list(mapping.keys()).index(present[0]), op["under"], target)
+            for name in present:
+                target[name] = mapping.pop(name)
+                if name in mapping.ca.items:
+                    target.ca.items[name] = mapping.ca.items.pop(name)
+        elif op["op"] == "default":
+            if key in mapping:
+                continue
+            append_key(mapping, key, op["value"])
+        changed += 1
+    return changed
+
+
+# ── Files ────────────────────────────────────────────────────────────────────
+
+def file_version(text: str) -> str:
+    match = VERSION_LINE.search(text)
+    return match.group(1) if match else INITIAL_VERSION
+
+
+def guess_indent(text: str) -> tuple[int, int, int]:
+    """(mapping, sequence, offset) as ruamel's indent() takes them, from the first nested block of each kind.
+
+    ruamel's own guess assumes mappings are indented like sequence items,
+    which the corpus files are not ("  - id:" items, two-space mappings).
+    Files without a nested block get the corpus layout.
+    """
+    mapping = sequence = offset = None
+    parent = None
+    for line in text.splitlines():
+        stripped = line.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        column = len(line) - len(stripped)
+        is_item = stripped.startswith("- ")
+        if parent is not None:
+            if is_item and offset is None and column >= parent:
+                offset = column - parent
+                sequence = len(line) - len(stripped[1:].lstrip(" ")) - parent
+            elif not is_item and mapping is None and column > parent:
+                mapping = column - parent
+        if mapping is not None and offset is not None:
+            break
+        # A key opening a nested block: "key:" with nothing (or only a comment) after it
+        key = stripped[2:].lstrip(" ") if is_item else stripped
+        key_column = len(line) - len(key)
+        parent = key_column if NESTED_KEY.match(key) else None
+    return mapping or 2, sequence or 4, offset if offset is not None else 2
+
+
+def round_trip_yaml(text: str) -> tuple[YAML, Any]:
+    """A ruamel loader/dumper using the file's own indentation, and the loaded data."""
+    mapping, sequence, offset = guess_indent(text)
+    rt = YAML()
+    rt.preserve_quotes = True
+    rt.width = 4096
+    rt.indent(mapping=mapping, sequence=sequence, offset=offset)
+    return rt, rt.load(text)
+
+
+def check_round_trip(rt: YAML, data: Any, text: str):
+    """Fail unless dumping the unmodified data gives back text, so the lines a migration leaves alone stay byte-identical."""
+    out = io.StringIO()
+    rt.dump(data, out)
+    if out.getvalue() == text:
+        return
+    old, new = text.splitlines(), out.getvalue().splitlines()
+    line = next((i for i, (a, b) in enumerate(zip(old, new)) if a != b), min(len(old), len(new))) + 1
+    raise MigrationError(f"the round-trip load would reformat untouched lines (first at line {line})")
+
+
+def stamp_version(data: Any, version: str):
+    if "spec_version" in data:
+        data["spec_version"] = DoubleQuotedScalarString(version)
+    else:
+        data.insert(0, "spec_version", DoubleQuotedScalarString(version))
+
+
+def migrate_file(path: str, spec_type: str, target: str, migrations: list[Migration], dry_run: bool) -> FileResult:
+    """Worker: migrate one file to target (runs in a pool process)."""
+    text = Path(path).read_text()
+    version = file_version(text)
+    result = FileResult(path, spec_type, "current", from_version=version)
+    if version == target:
+        return result
+    try:
+        rt, data = round_trip_yaml(text)
+        if not hasattr(data, "insert"):
+            raise MigrationError("top level is not a mapping")
+        check_round_trip(rt, data, text)
+        for migration in migration_chain(migrations, version, target):
+            for op in migration.operations:
+                apply_operation(data, op)
+        stamp_version(data, target)
+        out = io.StringIO()
+        rt.dump(data, out)
+        new_text = out.getvalue()
+    except Exception as e:  # ruamel raises many unrelated types; report, don't abort the pool
+        result.status, result.error = "error", f"{type(e).__name__}: {e}"
+        return result
+
+    result.status = "migrated"
+    if dry_run:
+        shown = Path(path).relative_to(REPO_ROOT) if Path(path).is_relative_to(REPO_ROOT) else path
+        result.diff = "".join(difflib.unified_diff(text.splitlines(True), new_text.splitlines(True),
+                                                   fromfile=f"a/{shown}", tofile=f"b/{shown}"))
+    else:
+        tmp = Path(f"{path}.migrating")
+        tmp.write_text(new_text)
+        os.replace(tmp, path)
+    return result
+
+
+def data_files(projects_dir: Path, spec_types: set[str]) -> list[tuple[Path, str]]:
+    files = []
+    for path in sorted(projects_dir.glob("*/*.yaml")):
+        parts = path.name.rsplit(".", 2)
+        if len(parts) == 3 and parts[1] in spec_types:
+            files.append((path, parts[1]))
+    return files
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def print_summary(results: list[FileResult], targets: dict[str, str], elapsed: float, dry_run: bool):
+    table = Table(title="Corpus migration" + (" (dry run)" if dry_run else ""))
+    table.add_column("Spec", style="cyan")
+    table.add_column("Version", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Would migrate" if dry_run else "Migrated", justify="right")
+    table.add_column("Up to date", justify="right")
+    table.add_column("Errors", justify="right")
+    for spec_type in sorted({r.spec_type for r in results}):
+        rows = [r for r in results if r.spec_type == spec_type]
+        errors = sum(r.status == "error" for r in rows)
+        table.add_row(spec_type, targets[spec_type], str(len(rows)), str(sum(r.status == "migrated" for r in rows)),
+                      str(sum(r.status == "current" for r in rows)), f"[red]{errors}[/red]" if errors else "0")
+    console.print(table)
+    for r in results:
+        if r.error:
+            console.print(f"  [red]{r.path}[/red] ({r.from_version}): {r.error}")
+    console.print(f"[dim]{len(results)} file(s) in {elapsed:.1f} s[/dim]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate project YAML files to the current spec versions")
+    parser.add_argument("--spec", action="append", metavar="TYPE", help="Only these spec types (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Print a unified diff instead of writing")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    try:
+        migrations = load_migrations()
+    except MigrationError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    targets = spec_versions()
+    spec_types = set(args.spec or targets)
+    unknown = spec_types - targets.keys()
+    if unknown:
+        parser.error(f"unknown spec type(s): {', '.join(sorted(unknown))}")
+
+    files = data_files(PROJECTS_DIR, spec_types)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(migrate_file, [str(path) for path, _ in files], [t for _, t in files],
+                                [targets[t] for _, t in files], [migrations.get(t, []) for _, t in files],
+                                [args.dry_run] * len(files), chunksize=32))
+
+    if args.dry_run:
+        for r in results:
+            if r.diff:
+                sys.stdout.write(r.diff)
+    print_summary(results, targets, time.perf_counter() - started, args.dry_run)
+    if any(r.status == "error" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the Anthropic Messages API, for benchmarking SDK patterns offline.
+
+Serves `POST /v1/messages` over plain HTTP with the request and response
+shapes of the real endpoint, but answers with canned text and simulated
+timing, so that client-side patterns (prompt caching, streaming, retries
+on rate limits) can be compared without a network or an API key:
+
+    ./scripts/mock_messages_api.py --port 8765 --rpm 50
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 python my_client.py
+
+What is simulated:
+
+* prompt caching: the request is split into blocks in cache order (tools,
+  system, messages). A cache_control breakpoint reads the longest prefix
+  cached within the TTL, looking back up to CACHE_LOOKBACK_BLOCKS block
+  boundaries like the real cache. It then writes its own prefix, and a
+  read refreshes the TTL of the prefix it hit. Usage
+  reports cache_read_input_tokens / cache_creation_input_tokens, and cached
+  tokens prefill much faster than uncached ones;
+* latency: base latency plus prefill, then output (and thinking) tokens at
+  a fixed rate;
+* streaming: SSE events (message_start ... message_stop) with the text
+  delivered in chunks as it is "generated";
+* rate limits: request-per-minute and input-token-per-minute buckets
+  (cache reads do not count), answered with 429, a rate_limit_error body
+  and a retry-after header.
+
+Token counts are estimated as characters / 4. Only the standard library is
+used; MockMessagesAPI can also be started inside another event loop
+(see sdk_replay_lab.py).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+CACHE_LOOKBACK_BLOCKS = 20
+CHARS_PER_TOKEN = 4
+WORDS = ("the", "cached", "prefix", "keeps", "each", "turn", "cheap", "while", "the", "new",
+         "message", "is", "read", "from", "scratch", "and", "streamed", "back")
+
+
+@dataclass(slots=True)
+class MockConfig:
+    base_latency_ms: float = 150
+    prefill_tokens_per_second: float = 20_000
+    cached_prefill_tokens_per_second: float = 400_000
+    output_tokens_per_second: float = 80
+    # Replies are this long unless max_tokens is smaller
+    output_tokens: int = 120
+    # Share of thinking.budget_tokens a reply spends thinking
+    thinking_share: float = 0.5
+    sse_chunk_tokens: int = 8
+    cache_ttl_seconds: float = 300
+    min_cacheable_tokens: int = 1024
+    requests_per_minute: int = 0          # 0: unlimited
+    input_tokens_per_minute: int = 0      # 0: unlimited
+
+
+def estimate_tokens(value: Any) -> int:
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def cache_blocks(body: dict[str, Any]) -> list[tuple[Any, bool]]:
+    """(block, has cache_control) in the order the prompt cache sees them: tools, system, messages."""
+    blocks: list[tuple[Any, bool]] = []
+    for tool in body.get("tools") or []:
+        blocks.append((tool, "cache_control" in tool))
+    system = body.get("system")
+    if isinstance(system, str):
+        blocks.append((system, False))
+    elif isinstance(system, list):
+        for block in system:
+            blocks.append((block, "cache_control" in block))
+    for message in body.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            blocks.append(({"role": message.get("role"), "text": content}, False))
+            continue
+        for block in content or []:
+            blocks.append(({"role": message.get("role"), **block}, "cache_control" in block))
+    return blocks
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, up to `per_minute`."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def take(self, amount: int) -> float:
+        """Take `amount` units, or return the seconds until they would be available."""
+        if not self.capacity:
+            return 0.0
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            self.level -= amount
+            return 0.0
+        return (amount - self.level) * 60 / self.capacity
+
+
+class MockMessagesAPI:
+    def __init__(self, config: MockConfig | None = None):
+        self.config = config or MockConfig()
+        # prefix hash -> expiry (monotonic seconds)
+        self.cache: dict[str, float] = {}
+        self.requests = TokenBucket(self.config.requests_per_minute)
+        self.input_tokens = TokenBucket(self.config.input_tokens_per_minute)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        return await asyncio.start_server(self.handle, host, port)
+
+    # ── Prompt cache ─────────────────────────────────────────────────────
+
+    def prompt_usage(self, body: dict[str, Any]) -> tuple[dict[str, int], list[str]]:
+        """Split the prompt into uncached, cache-read and cache-written tokens.
+
+        Also returns the prefix hashes the request writes or reads (a read
+        refreshes the TTL); they are only cached (remember()) once the
+        request is accepted.
+        """
+        now = time.monotonic()
+        blocks = cache_blocks(body)
+        digest = hashlib.sha256()
+        hashes, totals = [], []
+        total = 0
+        for block, _ in blocks:
+            digest.update(json.dumps(block, sort_keys=True).encode())
+            hashes.append(digest.copy().hexdigest())
+            total += estimate_tokens(block)
+            totals.append(total)
+
+        breakpoints = [i for i, (_, marked) in enumerate(blocks) if marked
+                       and totals[i] >= self.config.min_cacheable_tokens]
+        read, read_hash = 0, None
+        for bp in breakpoints:
+            for i in range(bp, max(bp - CACHE_LOOKBACK_BLOCKS, -1), -1):
+                if self.cache.get(hashes[i], 0) > now:
+                    if totals[i] > read:
+                        read, read_hash = totals[i], hashes[i]
+                    break
+        # The last breakpoint covers the longest prefix, so this is never negative
+        written = max((totals[bp] - read for bp in breakpoints), default=0)
+        usage = {
+            "input_tokens": total - read - written,
+            "cache_creation_input_tokens": written,
+            "cache_read_input_tokens": read,
+        }
+        return usage, [hashes[bp] for bp in breakpoints] + ([read_hash] if read_hash else [])
+
+    def remember(self, prefixes: list[str]):
+        expires = time.monotonic() + self.config.cache_ttl_seconds
+        for prefix in prefixes:
+            self.cache[prefix] = expires
+
+    # ── Timing ───────────────────────────────────────────────────────────
+
+    def prefill_seconds(self, usage: dict[str, int]) -> float:
+        c = self.config
+        uncached = usage["input_tokens"] + usage["cache_creation_input_tokens"]
+        return (c.base_latency_ms / 1000 + uncached / c.prefill_tokens_per_second
+                + usage["cache_read_input_tokens"] / c.cached_prefill_tokens_per_second)
+
+    def reply_plan(self, body: dict[str, Any]) -> tuple[int, int]:
+        """(thinking tokens, text tokens) for a request."""
+        max_tokens = int(body.get("max_tokens") or self.config.output_tokens)
+        thinking = body.get("thinking") or {}
+        thinking_tokens = 0
+        if thinking.get("type") == "enabled":
+            thinking_tokens = int(int(thinking.get("budget_tokens") or 0) * self.config.thinking_share)
+        return thinking_tokens, max(1, min(self.config.output_tokens, max_tokens - thinking_tokens))
+
+    # ── HTTP ─────────────────────────────────────────────────────────────
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length") or 0))
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            if method != "POST" or path.split("?")[0] != "/v1/messages":
+                await self.send_json(writer, 404, error("not_found_error", f"{method} {path} not found"))
+                return
+            try:
+                request = json.loads(body)
+            except ValueError:
+                await self.send_json(writer, 400, error("invalid_request_error", "body is not JSON"))
+                return
+            await self.messages(writer, request)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def messages(self, writer: asyncio.StreamWriter, body: dict[str, Any]):
+        if not body.get("messages") or not body.get("max_tokens"):
+            await self.send_json(writer, 400, error("invalid_request_error", "messages and max_tokens are required"))
+            return
+        usage, prefixes = self.prompt_usage(body)
+        wait = self.requests.take(1)
+        if not wait:
+            # Cache reads do not count towards the input token limit
+            wait = self.input_tokens.take(usage["input_tokens"] + usage["cache_creation_input_tokens"])
+        if wait:
+            await self.send_json(writer, 429, error("rate_limit_error", "This request would exceed your rate limit"),
+                                 {"retry-after": str(max(1, round(wait)))})
+            return
+        self.remember(prefixes)
+
+        thinking_tokens, text_tokens = self.reply_plan(body)
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        model = body.get("model") or "claude-mock"
+        await asyncio.sleep(self.prefill_seconds(usage))
+
+        if not body.get("stream"):
+            await asyncio.sleep((thinking_tokens + text_tokens) / self.config.output_tokens_per_second)
+            content = []
+            if thinking_tokens:
+                content.append({"type": "thinking", "thinking": words(thinking_tokens), "signature": "mock"})
+            content.append({"type": "text", "text": words(text_tokens)})
+            await self.send_json(writer, 200, {
+                "id": message_id, "type": "message", "role": "assistant", "model": model,
+                "content": content, "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {**usage, "output_tokens": thinking_tokens + text_tokens},
+            })
+            return
+
+        writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ncache-control: no-cache\r\n"
+                     b"connection: close\r\n\r\n")
+        await self.sse(writer, "message_start", {"type": "message_start", "message": {
+            "id": message_id, "type": "message", "role": "assistant", "model": model, "content": [],
+            "stop_reason": None, "stop_sequence": None, "usage": {**usage, "output_tokens": 1}}})
+        index = 0
+        for kind, tokens in (("thinking", thinking_tokens), ("text", text_tokens)):
+            if not tokens:
+                continue
+            await self.sse(writer, "content_block_start", {"type": "content_block_start", "index": index,
+                                                           "content_block": {"type": kind, kind: ""}})
+            for start in range(0, tokens, self.config.sse_chunk_tokens):
+                chunk = min(self.config.sse_chunk_tokens, tokens - start)
+                await asyncio.sleep(chunk / self.config.output_tokens_per_second)
+                delta_type = "thinking_delta" if kind == "thinking" else "text_delta"
+                await self.sse(writer, "content_block_delta", {"type": "content_block_delta", "index": index,
+                                                               "delta": {"type": delta_type, kind: words(chunk) + " "}})
+            await self.sse(writer, "content_block_stop", {"type": "content_block_stop", "index": index})
+            index += 1
+        await self.sse(writer, "message_delta", {"type": "message_delta",
+                                                 "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                                 "usage": {"output_tokens": thinking_tokens + text_tokens}})
+        await self.sse(writer, "message_stop", {"type": "message_stop"})
+
+    async def sse(self, writer: asyncio.StreamWriter, event: str, data: dict[str, Any]):
+        writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+        await writer.drain()
+
+    async def send_json(self, writer: asyncio.StreamWriter, status: int, data: dict[str, Any],
+                        headers: dict[str, str] | None = None):
+        payload = json.dumps(data).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests"}[status]
+        head = f"HTTP/1.1 {status} {reason}\r\ncontent-type: application/json\r\ncontent-length: {len(payload)}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in (headers or {}).items())
+        writer.write(head.encode() + b"connection: close\r\n\r\n" + payload)
+        await writer.drain()
+
+
+def error(kind: str, message: str) -> dict[str, Any]:
+    return {"type": "error", "error": {"type": kind, "message": message}}
+
+
+def words(tokens: int) -> str:
+    return " ".join(WORDS[i % len(WORDS)] for i in range(tokens))
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """--latency-ms, --rpm, ... for every MockConfig field."""
+    defaults = MockConfig()
+    for name, flag, help_text in [
+        ("base_latency_ms", "--latency-ms", "Fixed per-request latency"),
+        ("prefill_tokens_per_second", "--prefill-tps", "Prefill rate for uncached input tokens"),
+        ("cached_prefill_tokens_per_second", "--cached-prefill-tps", "Prefill rate for cache reads"),
+        ("output_tokens_per_second", "--output-tps", "Output token rate"),
+        ("output_tokens", "--output-tokens", "Reply length unless max_tokens is smaller"),
+        ("cache_ttl_seconds", "--cache-ttl", "Prompt cache TTL in seconds"),
+        ("requests_per_minute", "--rpm", "Requests per minute before 429s (0: unlimited)"),
+        ("input_tokens_per_minute", "--itpm", "Uncached input tokens per minute before 429s (0: unlimited)"),
+    ]:
+        default = getattr(defaults, name)
+        parser.add_argument(flag, dest=name, type=type(default), default=default, help=f"{help_text} (default: {default})")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    defaults = MockConfig()
+    return MockConfig(**{name: getattr(args, name, getattr(defaults, name)) for name in MockConfig.__slots__})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock Anthropic Messages API on localhost")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    async def serve():
+        server = await MockMessagesAPI(config_from_args(args)).start(args.host, args.port)
+        print(f"Mock Messages API on http://{args.host}:{args.port}/v1/messages (Ctrl-C to stop)", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Onboard discovered projects in bulk: scaffold, pin and register them.
+
+Candidates come from DISCOVERED_PROJECTS.md (every table row with a
+repository URL), or from CSV / JSONL files with name, repository and
+optionally display_name, description, language columns. For each candidate
+that has no projects/{name}/ yet:
+
+* projects/_template is copied with name, display_name, repository,
+  description and languages filled in (the template's comments are kept
+  for the fields an analyst still has to fill);
+* analyzed_commit is resolved from a local mirror ({name}.git, {name}, or
+  the repository's own name under --mirrors), all mirrors in parallel;
+* the submodule is registered without cloning: a gitlink at analyzed_commit
+  written to the index with one `git update-index --index-info`, and a
+  .gitmodules entry for each path that has a gitlink (a project without a
+  resolved commit gets neither).
+
+Every step skips what already exists, so re-running after adding rows, or
+after mirrors appear, only does the missing work.
+
+    ./scripts/onboard_projects.py --dry-run                           # candidates in DISCOVERED_PROJECTS.md
+    ./scripts/onboard_projects.py --mirrors /srv/mirrors --jobs 16
+    ./scripts/onboard_projects.py candidates.csv more.jsonl --no-submodules
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from scan_submodules import read_gitmodules
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+TEMPLATE_DIR = PROJECTS_DIR / "_template"
+DISCOVERED = REPO_ROOT / "DISCOVERED_PROJECTS.md"
+GITMODULES = REPO_ROOT / ".gitmodules"
+
+URL_RE = re.compile(r"https?://[^\s|)>\]]+")
+LANGUAGE_SEP_RE = re.compile(r"[/,]|\s+\+\s+|(?<=[\w#])\+(?=\w)")
+NULL_COMMIT = "0" * 40
+
+
+@dataclass(slots=True)
+class Candidate:
+    name: str
+    repository: str
+    display_name: str = ""
+    description: str = ""
+    languages: list[str] = field(default_factory=list)
+    source: str = ""
+
+
+@dataclass(slots=True)
+class Outcome:
+    name: str
+    scaffolded: bool = False
+    commit: str = ""
+    gitmodules: bool = False
+    gitlink: bool = False
+    notes: list[str] = field(default_factory=list)
+
+
+# ── Candidates ───────────────────────────────────────────────────────────────
+
+def project_name(name: str, repository: str) -> str:
+    """A directory name: the given name (or the repository's), lowercased, other characters as '-'."""
+    raw = name or repository.rstrip("/").removesuffix(".git").rsplit("/", 1)[-1]
+    return re.sub(r"[^a-z0-9._-]+", "-", raw.strip().lower()).strip("-.")
+
+
+def display_name(name: str) -> str:
+    return " ".join(word.capitalize() for word in re.split(r"[-_]+", name) if word)
+
+
+def split_languages(value: str) -> list[str]:
+    # "+" separates languages only between names ("Python+Go"), never inside one ("C++")
+    return [part.strip() for part in LANGUAGE_SEP_RE.split(value or "") if part.strip()]
+
+
+def candidate(name: str, repository: str, source: str, display: str = "", description: str = "",
+              language: str | list[str] = "") -> Candidate | None:
+    repository = repository.strip().removesuffix(".git").rstrip("/")
+    if not repository.startswith(("https://", "http://")):
+        return None
+    slug = project_name(name, repository)
+    languages = language if isinstance(language, list) else split_languages(language)
+    return Candidate(slug, repository, display or display_name(slug), description.strip(), languages, source)
+
+
+def parse_markdown(path: Path) -> list[Candidate]:
+    """Rows of every Markdown table with a repository URL; Language and Notes/Type columns if present."""
+    found = []
+    header: list[str] = []
+    for line in path.read_text().splitlines():
+        if not line.startswith("|"):
+            header = []
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if not header:
+            header = [c.lower() for c in cells]
+            continue
+        if set("".join(cells)) <= set("-: "):
+            continue
+        row = dict(zip(header, cells))
+        url = next((m.group(0) for c in cells if (m := URL_RE.search(c))), None)
+        if not url:
+            continue
+        name = re.sub(r"[*`]", "", cells[0])
+        described = row.get("notes") or row.get("type") or row.get("integration type") or ""
+        c = candidate(name.rsplit("/", 1)[-1] if "/" in name else name, url, f"{path.name}",
+                      description=described, language=row.get("language", ""))
+        if c:
+            found.append(c)
+    return found
+
+
+def parse_rows(rows: list[dict[str, str]], source: str) -> list[Candidate]:
+    found = []
+    for row in rows:
+        c = candidate(row.get("name") or "", row.get("repository") or row.get("url") or "", source,
+                      display=row.get("display_name") or "", description=row.get("description") or "",
+                      language=row.get("languages") or row.get("language") or "")
+        if c:
+            found.append(c)
+    return found
+
+
+def load_candidates(paths: list[Path]) -> list[Candidate]:
+    """Candidates from every input, first occurrence of a name wins."""
+    by_name: dict[str, Candidate] = {}
+    for path in paths:
+        if path.suffix == ".md":
+            found = parse_markdown(path)
+        elif path.suffix == ".csv":
+            with open(path, newline="") as f:
+                found = parse_rows(list(csv.DictReader(f)), path.name)
+        elif path.suffix in (".jsonl", ".ndjson"):
+            with open(path) as f:
+                found = parse_rows([json.loads(line) for line in f if line.strip()], path.name)
+        else:
+            raise ValueError(f"{path}: expected .md, .csv or .jsonl")
+        for c in found:
+            by_name.setdefault(c.name, c)
+    return list(by_name.values())
+
+
+# ── Scaffolding ──────────────────────────────────────────────────────────────
+
+def yaml_value(value: str | list[str]) -> str:
+    if isinstance(value, list):
+        return "[" + ", ".join(value) + "]"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def set_field(text: str, key: str, value: str | list[str], keep_comment: bool = False) -> str:
+    """Replace a top-level `key: value  # comment` line, keeping the layout of the template."""
+    def replace(match: re.Match) -> str:
+        comment = match.group(1) if keep_comment and match.group(1) else ""
+        return f"{key}: {yaml_value(value)}{comment}"
+    return re.sub(rf'^{re.escape(key)}:.*?(\s+#[^"\n]*)?$', replace, text, count=1, flags=re.MULTILINE)
+
+
+def render_metadata(template: str, c: Candidate, commit: str) -> str:
+    # The template's how-to header becomes the usual per-project header
+    body = template[template.index("\nname:") + 1:]
+    text = f"# Project Metadata: {c.name}\n# Spec: specs/project.spec.yaml\n\n" + body
+    text = set_field(text, "name", c.name)
+    text = set_field(text, "display_name", c.display_name)
+    text = set_field(text, "repository", c.repository)
+    if c.description:
+        text = set_field(text, "description", c.description)
+    if commit:
+        text = set_field(text, "analyzed_commit", commit)
+    if c.languages:
+        text = set_field(text, "primary_language", c.languages[0])
+        text = set_field(text, "languages", c.languages)
+    return text
+
+
+def scaffold(c: Candidate, commit: str) -> bool:
+    """Create projects/{name}/ from the template; False if it already exists."""
+    project_dir = PROJECTS_DIR / c.name
+    try:
+        project_dir.mkdir()
+    except FileExistsError:
+        return False
+    for template_file in sorted(TEMPLATE_DIR.iterdir()):
+        if not template_file.is_file():
+            continue
+        text = template_file.read_text()
+        if template_file.name == "metadata.project.yaml":
+            text = render_metadata(text, c, commit)
+        elif template_file.suffix == ".yaml":
+            text = set_field(text, "project", c.name)
+        elif template_file.name == "notes.md":
+            text = text.replace("{Project Name}", c.display_name).replace("* Repository: TODO",
+                                                                          f"* Repository: {c.repository}")
+        (project_dir / template_file.name).write_text(text)
+    return True
+
+
+# ── Mirrors and submodules ───────────────────────────────────────────────────
+
+def mirror_head(mirrors: Path, c: Candidate, notes: list[str]) -> str:
+    """HEAD of the candidate's mirror; a mirror git cannot read is noted, and the next one tried."""
+    repo_name = c.repository.rsplit("/", 1)[-1]
+    for candidate_dir in (mirrors / f"{c.name}.git", mirrors / c.name, mirrors / f"{repo_name}.git", mirrors / repo_name):
+        if candidate_dir.is_dir():
+            result = subprocess.run(["git", "-C", str(candidate_dir), "rev-parse", "--verify", "--quiet", "HEAD^{commit}"],
+                                    capture_output=True, text=True, check=False)
+            if result.returncode == 0:
+                return result.stdout.strip()
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "HEAD is not a commit"
+            notes.append(f"mirror {candidate_dir.name}: {error}")
+    return ""
+
+
+def recorded_commit(c: Candidate) -> str:
+    """analyzed_commit of an existing project, unless it is the template placeholder."""
+    meta = PROJECTS_DIR / c.name / "metadata.project.yaml"
+    if not meta.exists():
+        return ""
+    match = re.search(r'^analyzed_commit:\s*"?([0-9a-f]{40})', meta.read_text(), re.MULTILINE)
+    return match.group(1) if match and match.group(1) != NULL_COMMIT else ""
+
+
+def gitlinks() -> dict[str, str]:
+    """path -> commit of the submodule gitlinks in the index."""
+    out = subprocess.run(["git", "-C", str(REPO_ROOT), "ls-files", "-s", "-z", "--", "submodules/"],
+                         capture_output=True, text=True, check=True).stdout
+    links = {}
+    for entry in filter(None, out.split("\0")):
+        meta, path = entry.split("\t", 1)
+        mode, sha, _ = meta.split()
+        if mode == "160000":
+            links[path] = sha
+    return links
+
+
+def register_submodules(outcomes: list[Outcome], candidates: dict[str, Candidate]):
+    """Add the missing gitlinks, then the .gitmodules entries of the linked paths, each in one write."""
+    links = gitlinks()
+    index_info = []
+    for o in outcomes:
+        path = f"submodules/{o.name}"
+        if path in links:
+            if o.commit and links[path] != o.commit:
+                o.notes.append(f"gitlink at {links[path][:12]}, analyzed_commit {o.commit[:12]}")
+        elif o.commit:
+            index_info.append(f"160000 {o.commit}\t{path}\n")
+            # An uninitialized submodule is an empty directory, as after `git submodule add`
+            (REPO_ROOT / path).mkdir(parents=True, exist_ok=True)
+            o.gitlink = True
+        else:
+            o.notes.append("no commit: gitlink and .gitmodules entry not added")
+    if index_info:
+        subprocess.run(["git", "-C", str(REPO_ROOT), "update-index", "--add", "--index-info"],
+                       input="".join(index_info), text=True, check=True)
+
+    # A .gitmodules entry without a gitlink is a submodule `git submodule update` cannot check out
+    registered = {m["path"] for m in read_gitmodules()}
+    sections = []
+    for o in outcomes:
+        path = f"submodules/{o.name}"
+        if path not in registered and (o.gitlink or path in links):
+            sections.append(f'[submodule "{path}"]\n\tpath = {path}\n\turl = {candidates[o.name].repository}.git\n')
+            o.gitmodules = True
+    if sections:
+        existing = GITMODULES.read_text() if GITMODULES.exists() else ""
+        GITMODULES.write_text(existing + ("" if not existing or existing.endswith("\n") else "\n") + "".join(sections))
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def print_outcomes(outcomes: list[Outcome], dry_run: bool):
+    table = Table(title="Onboarding" + (" (dry run)" if dry_run else ""))
+    table.add_column("Project", style="cyan")
+    table.add_column("Scaffolded")
+    table.add_column("Commit")
+    table.add_column("Submodule")
+    table.add_column("Notes", style="yellow")
+    for o in outcomes:
+        submodule = ", ".join(part for part, done in ((".gitmodules", o.gitmodules), ("gitlink", o.gitlink)) if done)
+        table.add_row(o.name, "new" if o.scaffolded else "exists", o.commit[:12] or "-", submodule or "-",
+                      "; ".join(o.notes))
+    console.print(table)
+    console.print(f"[dim]{sum(o.scaffolded for o in outcomes)} new project(s), "
+                  f"{sum(o.gitlink for o in outcomes)} gitlink(s) added[/dim]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaffold, pin and register discovered projects in bulk")
+    parser.add_argument("inputs", nargs="*", type=Path, help="Candidate lists (.md, .csv, .jsonl; "
+                        "default: DISCOVERED_PROJECTS.md)")
+    parser.add_argument("--mirrors", type=Path, metavar="DIR", help="Local mirrors to resolve analyzed_commit from")
+    parser.add_argument("--jobs", "-j", type=int, default=8, help="Projects processed in parallel")
+    parser.add_argument("--no-submodules", action="store_true", help="Only scaffold projects/ directories")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be done")
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    try:
+        candidates = load_candidates(args.inputs or [DISCOVERED])
+    except (OSError, ValueError) as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    if not candidates:
+        console.print("[yellow]No candidates with a repository URL found.[/yellow]")
+        return
+
+    def onboard(c: Candidate) -> Outcome:
+        outcome = Outcome(c.name, commit=recorded_commit(c))
+        if not outcome.commit and args.mirrors:
+            outcome.commit = mirror_head(args.mirrors, c, outcome.notes)
+        if args.dry_run:
+            outcome.scaffolded = not (PROJECTS_DIR / c.name).exists()
+        else:
+            outcome.scaffolded = scaffold(c, outcome.commit)
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        outcomes = list(pool.map(onboard, candidates))
+
+    if not args.no_submodules and not args.dry_run:
+        register_submodules(outcomes, {c.name: c for c in candidates})
+    print_outcomes(outcomes, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
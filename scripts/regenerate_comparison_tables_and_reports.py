@@ -15,139 +15,105 @@ Usage:
     ./scripts/regenerate_comparison_tables_and_reports.py --format md    # Markdown only
     ./scripts/regenerate_comparison_tables_and_reports.py --format html  # HTML only
     ./scripts/regenerate_comparison_tables_and_reports.py --output reports/generated/
+    ./scripts/regenerate_comparison_tables_and_reports.py --from-db reports/generated/corpus.sqlite
+    ./scripts/regenerate_comparison_tables_and_reports.py --snapshot tmp/corpus.snapshot
+    ./scripts/regenerate_comparison_tables_and_reports.py --format json --compact --compress gzip
+    ./scripts/regenerate_comparison_tables_and_reports.py --watch  # Rebuild on project edits
+    ./scripts/regenerate_comparison_tables_and_reports.py --history  # + trends from git history
 """
 
 import argparse
+import base64
+import gzip
+import io
+import json
+import os
+import re
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import yaml
 from rich.console import Console
 from jinja2 import Environment, BaseLoader
 
+import corpus_model
+import instrumentation
+from corpus_model import (
+    CliIntegration, CodeReference, Project, ProjectMetadata, Reference, SdkIntegration,
+    github_permalink, load_project, load_projects,
+)
+
 console = Console()
 
 REPO_ROOT = Path(__file__).parent.parent
-PROJECTS_DIR = REPO_ROOT / "projects"
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
 REPORTS_DIR = REPO_ROOT / "reports"
 GENERATED_DIR = REPORTS_DIR / "generated"
 
 
-def load_yaml(path: Path) -> dict[str, Any] | None:
-    """Load and parse a YAML file."""
-    try:
-        with open(path) as f:
-            return yaml.safe_load(f) or {}
-    except (yaml.YAMLError, FileNotFoundError):
-        return None
-
-
-def get_all_project_data() -> list[dict[str, Any]]:
+def get_all_project_data() -> list[Project]:
     """Load data for all projects."""
-    projects = []
+    return load_projects(PROJECTS_DIR)
 
-    if not PROJECTS_DIR.exists():
-        return projects
 
-    for project_dir in sorted(PROJECTS_DIR.iterdir()):
-        if not project_dir.is_dir():
-            continue
+KNOWN_FLAGS = [
+    "--session", "--resume", "-c", "-p",
+    "--output-format", "--dangerously-skip-permissions",
+    "--model", "--max-turns", "--system-prompt",
+    "--mcp-config", "--allowedTools", "--verbose"
+]
 
-        project_data = {
-            "name": project_dir.name,
-            "metadata": None,
-            "cli": None,
-            "sdk": None,
-            "code_references": [],
-        }
+KNOWN_PATTERNS = [
+    "messages-create", "messages-stream", "tool-use",
+    "vision", "agent-create", "agent-run",
+    "conversation-management", "error-handling"
+]
 
-        # Load metadata
-        metadata_path = project_dir / "metadata.project.yaml"
-        if metadata_path.exists():
-            project_data["metadata"] = load_yaml(metadata_path)
 
-        # Load CLI integration
-        cli_path = project_dir / "cli.cli-integration.yaml"
-        if cli_path.exists():
-            project_data["cli"] = load_yaml(cli_path)
+def project_cli_flags(project: Project) -> set[str]:
+    """Return the CLI flags a project uses (from invocations and flags_summary)."""
+    flags = set()
+    cli_data = project.cli
 
-        # Load SDK integration
-        sdk_path = project_dir / "sdk.sdk-integration.yaml"
-        if sdk_path.exists():
-            project_data["sdk"] = load_yaml(sdk_path)
+    if cli_data and cli_data.cli_integration_detected:
+        # Check invocations for flags
+        for invocation in cli_data.invocations:
+            for flag_info in invocation.flags_used:
+                flags.add(flag_info.flag)
 
-        # Load code references
-        for ref_file in project_dir.glob("*.code-reference.yaml"):
-            ref_data = load_yaml(ref_file)
-            if ref_data:
-                project_data["code_references"].append(ref_data)
+        # Check flags_summary if available
+        for flag, info in cli_data.flags_summary.items():
+            if info.used:
+                flags.add(flag)
 
-        projects.append(project_data)
+    return flags
 
-    return projects
 
+def project_sdk_patterns(project: Project) -> set[str]:
+    """Return the SDK usage patterns a project uses."""
+    patterns = set()
+    sdk_data = project.sdk
 
-def extract_cli_flags(projects: list[dict[str, Any]]) -> dict[str, dict[str, bool]]:
-    """Extract CLI flag usage across projects."""
-    # Known flags to track
-    known_flags = [
-        "--session", "--resume", "-c", "-p",
-        "--output-format", "--dangerously-skip-permissions",
-        "--model", "--max-turns", "--system-prompt",
-        "--mcp-config", "--allowedTools", "--verbose"
-    ]
-
-    flags_matrix = {flag: {} for flag in known_flags}
+    if sdk_data and sdk_data.sdk_integration_detected:
+        for usage in sdk_data.sdk_usage:
+            patterns.add(usage.pattern or "")
 
-    for project in projects:
-        name = project["name"]
-        cli_data = project.get("cli")
+    return patterns
 
-        for flag in known_flags:
-            flags_matrix[flag][name] = False
 
-        if cli_data and cli_data.get("cli_integration_detected"):
-            # Check invocations for flags
-            for invocation in cli_data.get("invocations", []):
-                for flag_info in invocation.get("flags_used", []):
-                    flag = flag_info.get("flag", "")
-                    if flag in flags_matrix:
-                        flags_matrix[flag][name] = True
-
-            # Check flags_summary if available
-            for flag, info in cli_data.get("flags_summary", {}).items():
-                if flag in flags_matrix and info.get("used"):
-                    flags_matrix[flag][name] = True
-
-    return flags_matrix
+def extract_cli_flags(projects: list[Project]) -> dict[str, dict[str, bool]]:
+    """Extract CLI flag usage across projects."""
+    used = {p.name: project_cli_flags(p) for p in projects}
+    return {flag: {name: flag in flags for name, flags in used.items()} for flag in KNOWN_FLAGS}
 
 
-def extract_sdk_patterns(projects: list[dict[str, Any]]) -> dict[str, dict[str, bool]]:
+def extract_sdk_patterns(projects: list[Project]) -> dict[str, dict[str, bool]]:
     """Extract SDK pattern usage across projects."""
-    known_patterns = [
-        "messages-create", "messages-stream", "tool-use",
-        "vision", "agent-create", "agent-run",
-        "conversation-management", "error-handling"
-    ]
-
-    patterns_matrix = {pattern: {} for pattern in known_patterns}
-
-    for project in projects:
-        name = project["name"]
-        sdk_data = project.get("sdk")
-
-        for pattern in known_patterns:
-            patterns_matrix[pattern][name] = False
-
-        if sdk_data and sdk_data.get("sdk_integration_detected"):
-            for usage in sdk_data.get("sdk_usage", []):
-                pattern = usage.get("pattern", "")
-                if pattern in patterns_matrix:
-                    patterns_matrix[pattern][name] = True
-
-    return patterns_matrix
+    used = {p.name: project_sdk_patterns(p) for p in projects}
+    return {pattern: {name: pattern in patterns for name, patterns in used.items()} for pattern in KNOWN_PATTERNS}
 
 
 MARKDOWN_TEMPLATE = """# Claude Code Integrations Comparison
@@ -174,7 +140,9 @@ Generated: {{ generated_at }}
 |---------|{% for p in projects %}:---:| {% endfor %}
 {% for pattern, usage in sdk_patterns.items() %}| {{ pattern }} | {% for p in projects %}{{ '✓' if usage.get(p.name) else '-' }} | {% endfor %}
 {% endfor %}
-
+{% if trends %}
+{{ trends }}
+{% endif %}
 ## Integration Details
 
 {% for p in projects %}
@@ -209,8 +177,8 @@ Generated: {{ generated_at }}
 """
 
 
-def generate_markdown_report(projects: list[dict[str, Any]], output_path: Path):
-    """Generate markdown comparison report."""
+def generate_markdown_report(projects: list[Project], output_path: Path, trends: str = ""):
+    """Generate markdown comparison report (trends: a corpus_history.py trend section)."""
     env = Environment(loader=BaseLoader())
     template = env.from_string(MARKDOWN_TEMPLATE)
 
@@ -222,6 +190,7 @@ def generate_markdown_report(projects: list[dict[str, Any]], output_path: Path):
         projects=projects,
         cli_flags=cli_flags,
         sdk_patterns=sdk_patterns,
+        trends=trends,
     )
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -229,46 +198,601 @@ def generate_markdown_report(projects: list[dict[str, Any]], output_path: Path):
     console.print(f"[green]Generated:[/green] {output_path}")
 
 
-def generate_summary_json(projects: list[dict[str, Any]], output_path: Path):
-    """Generate JSON summary for programmatic use."""
-    import json
-
-    summary = {
-        "generated_at": datetime.now().isoformat(),
-        "project_count": len(projects),
-        "projects": [],
-        "cli_flags_matrix": extract_cli_flags(projects),
-        "sdk_patterns_matrix": extract_sdk_patterns(projects),
+# ── summary.json (streamed, schema in specs/summary-json.spec.yaml) ──────────
+
+SUMMARY_SCHEMA_VERSION = 1
+SUMMARY_SECTIONS = ["schema_version", "generated_at", "project_count",
+                    "projects", "cli_flags_matrix", "sdk_patterns_matrix"]
+
+
+def open_summary_output(output_path: Path, compression: str | None) -> tuple[Path, Any]:
+    """Open the summary for text writing, optionally through gzip or zstd."""
+    if compression == "gzip":
+        output_path = output_path.with_name(output_path.name + ".gz")
+        return output_path, gzip.open(output_path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            console.print("[red]zstd compression needs the zstandard package[/red]")
+            console.print("  Run: uv run --with zstandard scripts/regenerate_comparison_tables_and_reports.py ...")
+            sys.exit(1)
+        output_path = output_path.with_name(output_path.name + ".zst")
+        raw = open(output_path, "wb")
+        writer = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        return output_path, io.TextIOWrapper(writer, encoding="utf-8")
+    return output_path, open(output_path, "w", encoding="utf-8")
+
+
+def project_summary(p: Project) -> dict[str, Any]:
+    """Build the summary record for one project."""
+    return {
+        "name": p.name,
+        "repository": p.metadata.repository if p.metadata else None,
+        "status": p.metadata.analysis_status if p.metadata else "pending",
+        "integration_types": p.metadata.integration_types if p.metadata else [],
+        "cli_detected": bool(p.cli and p.cli.cli_integration_detected),
+        "sdk_detected": bool(p.sdk and p.sdk.sdk_integration_detected),
     }
 
-    for p in projects:
-        proj_summary = {
-            "name": p["name"],
-            "repository": p["metadata"].get("repository") if p["metadata"] else None,
-            "status": p["metadata"].get("analysis_status") if p["metadata"] else "pending",
-            "integration_types": p["metadata"].get("integration_types", []) if p["metadata"] else [],
-            "cli_detected": bool(p.get("cli") and p["cli"].get("cli_integration_detected")),
-            "sdk_detected": bool(p.get("sdk") and p["sdk"].get("sdk_integration_detected")),
-        }
-        summary["projects"].append(proj_summary)
+
+def generate_summary_json(projects: list[Project], output_path: Path,
+                          compact: bool = False, compression: str | None = None):
+    """Stream the JSON summary section by section.
+
+    The default layout puts every top-level key, project record and matrix row
+    on its own line, so load_summary_section() can decode one section without
+    parsing the rest. --compact drops all layout whitespace instead.
+    """
+    dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+    nl, key_indent, item_indent = ("", "", "") if compact else ("\n", "  ", "    ")
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(summary, indent=2))
+    output_path, out = open_summary_output(output_path, compression)
+
+    def scalar(key: str, value: Any):
+        out.write(f"{key_indent}{dumps(key)}:{dumps(value)},{nl}")
+
+    def matrix(key: str, names: list[str], used: list[set[str]], rows: list[str], last: bool):
+        out.write(f"{key_indent}{dumps(key)}:{{{nl}")
+        for i, row in enumerate(rows):
+            cells = {name: row in used_set for name, used_set in zip(names, used)}
+            sep = "," if i < len(rows) - 1 else ""
+            out.write(f"{item_indent}{dumps(row)}:{dumps(cells)}{sep}{nl}")
+        out.write(f"{key_indent}}}{'' if last else ','}{nl}")
+
+    with out:
+        out.write(f"{{{nl}")
+        scalar("schema_version", SUMMARY_SCHEMA_VERSION)
+        scalar("generated_at", datetime.now().isoformat())
+        scalar("project_count", len(projects))
+
+        out.write(f"{key_indent}\"projects\":[{nl}")
+        for i, p in enumerate(projects):
+            sep = "," if i < len(projects) - 1 else ""
+            out.write(f"{item_indent}{dumps(project_summary(p))}{sep}{nl}")
+        out.write(f"{key_indent}],{nl}")
+
+        names = [p.name for p in projects]
+        matrix("cli_flags_matrix", names, [project_cli_flags(p) for p in projects], KNOWN_FLAGS, last=False)
+        matrix("sdk_patterns_matrix", names, [project_sdk_patterns(p) for p in projects], KNOWN_PATTERNS, last=True)
+        out.write(f"}}{nl}")
+
     console.print(f"[green]Generated:[/green] {output_path}")
 
 
+def open_summary_input(path: Path) -> Any:
+    """Open a (possibly gzip/zstd compressed) summary for text reading."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".zst":
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True),
+                                encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def load_summary_section(path: Path, section: str) -> Any:
+    """Load a single top-level section of a summary written by generate_summary_json().
+
+    Only the lines of the requested section are decoded. Compact files have no
+    line structure and fall back to a full parse.
+    """
+    if section not in SUMMARY_SECTIONS:
+        raise KeyError(f"Unknown summary section: {section}")
+
+    prefix = f'  "{section}":'
+    with open_summary_input(path) as f:
+        first = f.readline()
+        if first.strip() != "{":
+            return json.loads(first + f.read())[section]
+
+        for line in f:
+            if not line.startswith(prefix):
+                continue
+            value = line[len(prefix):].rstrip().rstrip(",")
+            if value == "[":
+                items = []
+                for item in f:
+                    if item.startswith("  ]"):
+                        return items
+                    items.append(json.loads(item.rstrip().rstrip(",")))
+            elif value == "{":
+                rows = {}
+                for item in f:
+                    if item.startswith("  }"):
+                        return rows
+                    rows.update(json.loads("{" + item.rstrip().rstrip(",") + "}"))
+            else:
+                return json.loads(value)
+    raise KeyError(f"Section not found in {path}: {section}")
+
+
+# ── HTML report ──────────────────────────────────────────────────────────────
+
+SEARCH_INDEX_VERSION = 1
+SEARCH_EXCERPT_CHARS = 160
+TOKEN_RE = re.compile(r"-{0,2}[a-z0-9][a-z0-9_.\-]*")
+
+HTML_STYLE = """
+body { font-family: -apple-system, system-ui, sans-serif; margin: 2rem auto; max-width: 72rem; padding: 0 1rem; color: #1f2328; }
+table { border-collapse: collapse; margin: 1rem 0; }
+th, td { border: 1px solid #d0d7de; padding: .3rem .6rem; text-align: left; vertical-align: top; }
+td.c { text-align: center; }
+pre { background: #f6f8fa; padding: .8rem; overflow-x: auto; }
+code { font-family: ui-monospace, monospace; font-size: .9em; }
+#q { width: 100%; font-size: 1.1rem; padding: .4rem; }
+#results li { margin: .4rem 0; }
+#results .kind { color: #57606a; font-size: .85em; }
+#results .excerpt { color: #57606a; display: block; font-size: .85em; }
+"""
+
+HTML_COMPARISON_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Claude Code Integrations Comparison</title>
+<style>{{ style|safe }}</style>
+</head>
+<body>
+<h1>Claude Code Integrations Comparison</h1>
+<p>Generated: {{ generated_at }}</p>
+
+<h2>Search</h2>
+<input id="q" type="search" placeholder="Search projects, flags, patterns, snippets, notes..." autocomplete="off" disabled>
+<ol id="results"></ol>
+
+<h2>Projects Overview</h2>
+<table>
+<tr><th>Project</th><th>Repository</th><th>Status</th><th>Integration Types</th></tr>
+{% for p in projects %}<tr>
+<td><a href="projects/{{ p.name }}.html">{{ p.name }}</a></td>
+<td>{% if p.metadata and p.metadata.repository %}<a href="{{ p.metadata.repository }}">{{ p.metadata.repository }}</a>{% else %}-{% endif %}</td>
+<td>{{ p.metadata.analysis_status if p.metadata else 'pending' }}</td>
+<td>{{ p.metadata.integration_types|join(', ') if p.metadata and p.metadata.integration_types else '-' }}</td>
+</tr>
+{% endfor %}</table>
+
+<h2>CLI Flags Usage</h2>
+<table>
+<tr><th>Flag</th>{% for p in projects %}<th>{{ p.name }}</th>{% endfor %}</tr>
+{% for flag, usage in cli_flags.items() %}<tr><td><code>{{ flag }}</code></td>{% for p in projects %}<td class="c">{{ '✓' if usage.get(p.name) else '-' }}</td>{% endfor %}</tr>
+{% endfor %}</table>
+
+<h2>SDK Patterns Usage</h2>
+<table>
+<tr><th>Pattern</th>{% for p in projects %}<th>{{ p.name }}</th>{% endfor %}</tr>
+{% for pattern, usage in sdk_patterns.items() %}<tr><td>{{ pattern }}</td>{% for p in projects %}<td class="c">{{ '✓' if usage.get(p.name) else '-' }}</td>{% endfor %}</tr>
+{% endfor %}</table>
+
+<hr>
+<p><em>Report generated by <code>scripts/regenerate_comparison_tables_and_reports.py</code></em></p>
+
+<script type="application/octet-stream" id="search-index">{{ search_index_b64 }}</script>
+<script>
+{{ search_script|safe }}
+</script>
+</body>
+</html>
+"""
+
+HTML_PROJECT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ p.name }} - Claude Code Integration</title>
+<style>{{ style|safe }}</style>
+</head>
+<body>
+<p><a href="../comparison.html">&larr; Comparison &amp; search</a></p>
+<h1>{{ meta.display_name or p.name }}</h1>
+
+<table>
+<tr><th>Repository</th><td>{% if meta.repository %}<a href="{{ meta.repository }}">{{ meta.repository }}</a>{% else %}-{% endif %}</td></tr>
+<tr><th>Analyzed commit</th><td><code>{{ meta.analyzed_commit or '-' }}</code></td></tr>
+<tr><th>Language</th><td>{{ meta.primary_language or '-' }}</td></tr>
+<tr><th>Integration types</th><td>{{ (meta.integration_types or [])|join(', ') or '-' }}</td></tr>
+<tr><th>Status</th><td>{{ meta.analysis_status or 'pending' }}</td></tr>
+</table>
+
+{% if cli.cli_integration_detected %}
+<h2 id="cli">CLI Integration</h2>
+<p>{{ cli.summary or 'CLI integration detected.' }}</p>
+{% for inv in cli.invocations or [] %}
+<h3 id="inv-{{ inv.id }}">{{ inv.id }}</h3>
+<p>{{ inv.description }}</p>
+{% if inv.reference and github_permalink(inv.reference) %}<p><strong>Source:</strong> <a href="{{ github_permalink(inv.reference) }}"><code>{{ inv.reference.path }}</code></a></p>{% endif %}
+{% if inv.command_pattern %}<p><code>{{ inv.command_pattern }}</code></p>{% endif %}
+{% if inv.flags_used %}<table>
+<tr><th>Flag</th><th>Purpose</th></tr>
+{% for f in inv.flags_used %}<tr><td><code>{{ f.flag }}</code></td><td>{{ f.purpose }}</td></tr>
+{% endfor %}</table>{% endif %}
+{% if inv.snippet %}<pre><code>{{ inv.snippet }}</code></pre>{% endif %}
+{% if inv.notes %}<blockquote>{{ inv.notes }}</blockquote>{% endif %}
+{% endfor %}
+{% endif %}
+
+{% if sdk.sdk_integration_detected %}
+<h2 id="sdk">SDK Integration</h2>
+<p>{{ sdk.summary or 'SDK integration detected.' }}</p>
+{% for usage in sdk.sdk_usage or [] %}
+<h3 id="sdk-{{ usage.id }}">{{ usage.id }} <small>({{ usage.pattern }})</small></h3>
+<p>{{ usage.description }}</p>
+{% if usage.reference and github_permalink(usage.reference) %}<p><strong>Source:</strong> <a href="{{ github_permalink(usage.reference) }}"><code>{{ usage.reference.path }}</code></a></p>{% endif %}
+{% if usage.snippet %}<pre><code>{{ usage.snippet }}</code></pre>{% endif %}
+{% if usage.notes %}<blockquote>{{ usage.notes }}</blockquote>{% endif %}
+{% endfor %}
+{% endif %}
+
+{% if p.notes %}
+<h2 id="notes">Notes</h2>
+<pre>{{ p.notes }}</pre>
+{% endif %}
+
+<hr>
+<p><em>Report generated by <code>scripts/regenerate_comparison_tables_and_reports.py</code></em></p>
+</body>
+</html>
+"""
+
+# Client side of the prebuilt index: decompress once, then answer every
+# keystroke with a binary search over the sorted term list.
+SEARCH_SCRIPT = """
+(async () => {
+  const input = document.getElementById("q");
+  const results = document.getElementById("results");
+  const b64 = document.getElementById("search-index").textContent.trim();
+  const bytes = Uint8Array.from(atob(b64), (c) => c.charCodeAt(0));
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+  const index = JSON.parse(await new Response(stream).text());
+  const tokenRe = /-{0,2}[a-z0-9][a-z0-9_.\\-]*/g;
+
+  const lowerBound = (term) => {
+    let lo = 0, hi = index.terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (index.terms[mid] < term) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  };
+
+  const lookup = (term) => {
+    const hits = new Map();
+    for (let i = lowerBound(term); i < index.terms.length && index.terms[i].startsWith(term); i++) {
+      for (const doc of index.postings[i]) hits.set(doc, (hits.get(doc) || 0) + 1);
+    }
+    return hits;
+  };
+
+  const search = (query) => {
+    const terms = query.toLowerCase().match(tokenRe) || [];
+    let scores = null;
+    for (const term of terms) {
+      const hits = lookup(term);
+      if (scores === null) { scores = hits; continue; }
+      for (const doc of scores.keys()) {
+        if (hits.has(doc)) scores.set(doc, scores.get(doc) + hits.get(doc)); else scores.delete(doc);
+      }
+    }
+    return scores ? [...scores.entries()].sort((a, b) => b[1] - a[1]).slice(0, 50) : [];
+  };
+
+  input.addEventListener("input", () => {
+    results.replaceChildren();
+    for (const [doc] of search(input.value)) {
+      const [project, kind, title, url, excerpt] = index.docs[doc];
+      const li = document.createElement("li");
+      const a = document.createElement("a");
+      a.href = url;
+      a.textContent = `${project}: ${title}`;
+      const k = document.createElement("span");
+      k.className = "kind";
+      k.textContent = ` [${kind}]`;
+      const ex = document.createElement("span");
+      ex.className = "excerpt";
+      ex.textContent = excerpt;
+      li.append(a, k, ex);
+      results.append(li);
+    }
+  });
+  input.disabled = false;
+})();
+"""
+
+
+def tokenize(text: str) -> set[str]:
+    """Split text into search terms; flags are also indexed without dashes."""
+    terms = set()
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.rstrip(".-")
+        if token:
+            terms.add(token)
+            if token.startswith("-"):
+                terms.add(token.lstrip("-"))
+    return terms
+
+
+def search_documents(projects: list[Project]) -> list[tuple[str, str, str, str, str]]:
+    """Flatten projects into (project, kind, title, url, text) search documents."""
+    docs = []
+    for p in projects:
+        name = p.name
+        page = f"projects/{name}.html"
+        meta = p.metadata or ProjectMetadata()
+        cli = p.cli or CliIntegration()
+        sdk = p.sdk or SdkIntegration()
+
+        docs.append((name, "project", meta.display_name or name, page, " ".join([
+            name,
+            meta.display_name or "",
+            meta.description or "",
+            meta.primary_language or "",
+            " ".join(meta.integration_types),
+            cli.summary or "",
+            sdk.summary or "",
+        ])))
+
+        for inv in cli.invocations:
+            flags = " ".join(f.flag for f in inv.flags_used)
+            docs.append((name, "invocation", inv.id, f"{page}#inv-{inv.id}", " ".join([
+                inv.id,
+                inv.description or "",
+                inv.command_pattern or "",
+                flags,
+                inv.snippet or "",
+                inv.notes or "",
+            ])))
+
+        for usage in sdk.sdk_usage:
+            docs.append((name, "sdk-usage", usage.id, f"{page}#sdk-{usage.id}", " ".join([
+                usage.id,
+                usage.pattern or "",
+                usage.description or "",
+                " ".join(usage.api_methods),
+                usage.snippet or "",
+                usage.notes or "",
+            ])))
+
+        if p.notes:
+            docs.append((name, "notes", "notes.md", f"{page}#notes", p.notes))
+
+    return docs
+
+
+def build_search_index(projects: list[Project]) -> dict[str, Any]:
+    """Build an inverted index (sorted terms -> posting lists) over the corpus."""
+    docs = search_documents(projects)
+    postings: dict[str, list[int]] = {}
+    for doc_id, (_, _, _, _, text) in enumerate(docs):
+        for term in tokenize(text):
+            postings.setdefault(term, []).append(doc_id)
+
+    terms = sorted(postings)
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "docs": [
+            [project, kind, title, url, " ".join(text.split())[:SEARCH_EXCERPT_CHARS]]
+            for project, kind, title, url, text in docs
+        ],
+        "terms": terms,
+        "postings": [postings[t] for t in terms],
+    }
+
+
+def html_environment() -> Environment:
+    env = Environment(loader=BaseLoader(), autoescape=True)
+    env.globals["github_permalink"] = github_permalink
+    env.globals["style"] = HTML_STYLE
+    return env
+
+
+def write_html_project_page(env: Environment, p: Project, output_dir: Path) -> Path:
+    """Render one per-project HTML page."""
+    projects_dir = output_dir / "projects"
+    projects_dir.mkdir(parents=True, exist_ok=True)
+    page = env.from_string(HTML_PROJECT_TEMPLATE).render(
+        p=p, meta=p.metadata or ProjectMetadata(), cli=p.cli or CliIntegration(), sdk=p.sdk or SdkIntegration())
+    out_path = projects_dir / f"{p.name}.html"
+    out_path.write_text(page)
+    return out_path
+
+
+def write_html_comparison(env: Environment, projects: list[Project], output_dir: Path) -> dict[str, Any]:
+    """Render comparison.html with the embedded search index; returns index stats."""
+    started = time.perf_counter()
+    index = build_search_index(projects)
+    raw_index = json.dumps(index, separators=(",", ":")).encode()
+    packed_index = gzip.compress(raw_index, compresslevel=9, mtime=0)
+    index_built = time.perf_counter()
+
+    comparison = env.from_string(HTML_COMPARISON_TEMPLATE).render(
+        generated_at=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        projects=projects,
+        cli_flags=extract_cli_flags(projects),
+        sdk_patterns=extract_sdk_patterns(projects),
+        search_index_b64=base64.b64encode(packed_index).decode(),
+        search_script=SEARCH_SCRIPT,
+    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "comparison.html").write_text(comparison)
+    (output_dir / "search-index.json.gz").write_bytes(packed_index)
+
+    return {
+        "docs": len(index["docs"]),
+        "terms": len(index["terms"]),
+        "raw_bytes": len(raw_index),
+        "packed_bytes": len(packed_index),
+        "index_seconds": index_built - started,
+    }
+
+
+def generate_html_report(projects: list[Project], output_dir: Path):
+    """Generate static HTML comparison + per-project pages with an embedded search index."""
+    started = time.perf_counter()
+    env = html_environment()
+
+    stats = write_html_comparison(env, projects, output_dir)
+    for p in projects:
+        write_html_project_page(env, p, output_dir)
+
+    finished = time.perf_counter()
+    console.print(f"[green]Generated:[/green] {output_dir / 'comparison.html'} "
+                  f"(+ {len(projects)} project page(s))")
+    console.print(
+        f"  Search index: {stats['docs']} docs, {stats['terms']} terms, "
+        f"{stats['raw_bytes'] / 1024:.1f} KiB raw -> {stats['packed_bytes'] / 1024:.1f} KiB gzip"
+    )
+    console.print(
+        f"  Build time: index {stats['index_seconds'] * 1000:.0f} ms, "
+        f"total {(finished - started) * 1000:.0f} ms"
+    )
+
+
+# ── Watch mode ───────────────────────────────────────────────────────────────
+
+def comparison_key(p: Project | None) -> str:
+    """Everything comparison.md/summary.json show about a project, as a comparable string."""
+    if p is None:
+        return ""
+    meta = p.metadata or ProjectMetadata()
+    cli = p.cli or CliIntegration()
+    sdk = p.sdk or SdkIntegration()
+    return json.dumps([
+        project_summary(p),
+        meta.analyzed_commit,
+        sorted(project_cli_flags(p)),
+        sorted(project_sdk_patterns(p)),
+        cli.summary,
+        len(cli.invocations),
+        sdk.summary,
+        len(sdk.sdk_usage),
+    ], sort_keys=True, default=str)
+
+
+def watch_and_regenerate(projects: list[Project], output_dir: Path, formats: list[str],
+                         args: argparse.Namespace, trends: str = ""):
+    """Rebuild only the outputs affected by each batch of project edits."""
+    from report_watch import watch_projects
+
+    by_name = {p.name: p for p in projects}
+    env = html_environment()
+
+    def rebuild(names: set[str]):
+        started = time.perf_counter()
+        comparison_dirty = search_dirty = False
+        written = []
+
+        for name in sorted(names):
+            project_dir = PROJECTS_DIR / name
+            old = by_name.get(name)
+            new = load_project(project_dir) if project_dir.is_dir() else None
+
+            if comparison_key(old) != comparison_key(new):
+                comparison_dirty = True
+            old_docs = search_documents([old]) if old else []
+            new_docs = search_documents([new]) if new else []
+            if old_docs != new_docs:
+                search_dirty = True
+
+            if new is None:
+                by_name.pop(name, None)
+                (output_dir / "projects" / f"{name}.html").unlink(missing_ok=True)
+                continue
+            by_name[name] = new
+            if "html" in formats:
+                written.append(write_html_project_page(env, new, output_dir))
+
+        current = [by_name[n] for n in sorted(by_name)]
+        if comparison_dirty and "md" in formats:
+            generate_markdown_report(current, output_dir / "comparison.md", trends)
+        if comparison_dirty and "json" in formats:
+            generate_summary_json(current, output_dir / "summary.json",
+                                  compact=args.compact, compression=args.compress)
+        if (comparison_dirty or search_dirty) and "html" in formats:
+            write_html_comparison(env, current, output_dir)
+            written.append(output_dir / "comparison.html")
+
+        for path in written:
+            console.print(f"[green]Generated:[/green] {path}")
+        elapsed = (time.perf_counter() - started) * 1000
+        console.print(f"[dim]{', '.join(sorted(names))} changed; rebuilt in {elapsed:.0f} ms[/dim]")
+
+    console.print(f"\n[bold]Watching {PROJECTS_DIR} for changes (Ctrl-C to stop)...[/bold]")
+    watch_projects(PROJECTS_DIR, rebuild)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate comparison reports")
     parser.add_argument("--format", choices=["md", "html", "json", "all"], default="all",
                         help="Output format")
     parser.add_argument("--output", "-o", type=Path, default=GENERATED_DIR,
                         help="Output directory")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write summary.json without layout whitespace")
+    parser.add_argument("--compress", choices=["gzip", "zstd"],
+                        help="Compress summary.json (.gz / .zst)")
+    parser.add_argument("--from-db", type=Path, metavar="DB",
+                        help="Load the corpus from a database written by export_corpus.py")
+    parser.add_argument("--snapshot", type=Path, metavar="PATH",
+                        help="Load the corpus from a snapshot written by snapshot_corpus.py")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild affected outputs when project files change")
+    parser.add_argument("--history", action="store_true",
+                        help="Also write history.json and add a trend section from the git history of projects/")
+    instrumentation.add_arguments(parser)
 
     args = parser.parse_args()
+    instrumentation.configure_from_args("regenerate_reports", args)
+    instrumentation.instrument(vars(corpus_model), {"load_yaml": "parse"})
+    instrumentation.instrument(globals(), {
+        "get_all_project_data": "load",
+        "extract_cli_flags": "matrix",
+        "extract_sdk_patterns": "matrix",
+        "generate_markdown_report": "markdown",
+        "generate_summary_json": "summary json",
+        "build_search_index": "search index",
+        "write_html_project_page": "html pages",
+        "write_html_comparison": "html comparison",
+    })
+
+    if args.watch and (args.from_db or args.snapshot):
+        parser.error("--watch reads projects/ directly and cannot be combined with --from-db/--snapshot")
+    if args.from_db and args.snapshot:
+        parser.error("--from-db and --snapshot are mutually exclusive")
+    if args.history and (args.from_db or args.snapshot):
+        parser.error("--history replays projects/ from git and cannot be combined with --from-db/--snapshot")
 
     console.print("[bold]Regenerating comparison tables and reports...[/bold]")
 
-    projects = get_all_project_data()
+    if args.from_db:
+        from export_corpus import load_projects_from_db
+        projects = load_projects_from_db(args.from_db)
+    elif args.snapshot:
+        from snapshot_corpus import CorpusSnapshot
+        with CorpusSnapshot(args.snapshot) as snapshot:
+            projects = snapshot.projects()
+    else:
+        projects = get_all_project_data()
 
     if not projects:
         console.print("[yellow]No projects found. Nothing to generate.[/yellow]")
@@ -279,18 +803,34 @@ def main():
     output_dir = args.output
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    formats = [args.format] if args.format != "all" else ["md", "json"]
+    formats = [args.format] if args.format != "all" else ["md", "json", "html"]
+
+    trends = ""
+    if args.history:
+        import corpus_history
+        instrumentation.instrument(vars(corpus_history), {"collect_history": "history"})
+        try:
+            history = corpus_history.collect_history(PROJECTS_DIR)
+        except (RuntimeError, ValueError) as e:
+            console.print(f"[red]History: {e}[/red]")
+            sys.exit(1)
+        corpus_history.write_history(history, output_dir, [f for f in formats if f == "json"])
+        trends = corpus_history.render_trend_section(history)
 
     for fmt in formats:
         if fmt == "md":
-            generate_markdown_report(projects, output_dir / "comparison.md")
+            generate_markdown_report(projects, output_dir / "comparison.md", trends)
         elif fmt == "json":
-            generate_summary_json(projects, output_dir / "summary.json")
+            generate_summary_json(projects, output_dir / "summary.json",
+                                  compact=args.compact, compression=args.compress)
         elif fmt == "html":
-            console.print("[yellow]HTML format not yet implemented[/yellow]")
+            generate_html_report(projects, output_dir)
 
     console.print("\n[bold green]Report generation complete![/bold green]")
 
+    if args.watch:
+        watch_and_regenerate(projects, output_dir, formats, args, trends)
+
 
 if __name__ == "__main__":
     main()
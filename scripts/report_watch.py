@@ -0,0 +1,171 @@
+"""
+File watching for the report generators' --watch mode.
+
+Uses Linux inotify directly (via ctypes, no extra dependency) and falls back
+to mtime polling elsewhere. Bursts of events are debounced so that an editor
+saving several files, or writing a file in several steps, triggers a single
+rebuild.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+DEBOUNCE_SECONDS = 0.1
+POLL_INTERVAL_SECONDS = 0.25
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_watched_file(path: Path) -> bool:
+    """Only project data files and notes trigger rebuilds (not editor swap files)."""
+    return path.suffix == ".yaml" or path.name == "notes.md"
+
+
+class InotifyWatcher:
+    """Recursive inotify watch over a directory tree."""
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        self.add_tree(root)
+
+    def add_tree(self, root: Path):
+        for dirpath, _, _ in os.walk(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self.dirs[wd] = Path(dirpath)
+
+    def read(self, timeout: float | None) -> set[Path]:
+        """Wait up to timeout seconds (None = forever) and return the changed paths."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        buf = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = buf[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+            offset += name_len
+
+            parent = self.dirs.get(wd)
+            if parent is None:
+                continue
+            path = parent / name if name else parent
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+                changed.add(path)
+            elif mask & IN_DELETE_SELF:
+                self.dirs.pop(wd, None)
+            elif is_watched_file(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compare mtimes of watched files on an interval."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[Path, int]:
+        stats = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                if is_watched_file(path):
+                    try:
+                        stats[path] = path.stat().st_mtime_ns
+                    except FileNotFoundError:
+                        pass
+        return stats
+
+    def read(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self.scan()
+            changed = {p for p in current.keys() | self.snapshot.keys()
+                       if current.get(p) != self.snapshot.get(p)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(POLL_INTERVAL_SECONDS)
+
+    def close(self):
+        pass
+
+
+def make_watcher(root: Path) -> InotifyWatcher | PollingWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
+
+
+def changed_projects(paths: set[Path], projects_dir: Path) -> set[str]:
+    """Map changed paths to the project directory names they belong to."""
+    names = set()
+    for path in paths:
+        try:
+            rel = path.relative_to(projects_dir)
+        except ValueError:
+            continue
+        if rel.parts and not rel.parts[0].startswith("."):
+            names.add(rel.parts[0])
+    return names
+
+
+def watch_projects(projects_dir: Path, on_change: Callable[[set[str]], None],
+                   debounce: float = DEBOUNCE_SECONDS):
+    """Block forever, calling on_change(project names) after each debounced burst."""
+    watcher = make_watcher(projects_dir)
+    try:
+        while True:
+            paths = watcher.read(None)
+            # Keep collecting until the tree has been quiet for `debounce` seconds
+            while True:
+                more = watcher.read(debounce)
+                if not more:
+                    break
+                paths |= more
+            names = changed_projects(paths, projects_dir)
+            if names:
+                on_change(names)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -0,0 +1,345 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Re-pin a project to a newer submodule commit by looking only at the diff.
+
+For each project, the recorded analyzed_commit is diffed against the new
+commit (default: the submodule's HEAD) in the local clone:
+
+* references into untouched files carry over unchanged
+* references into modified/renamed files are shifted using the -U0 hunks;
+  a reference whose range overlaps a hunk is reported as "changed"
+* references into deleted files are reported as "removed"
+* only the touched files are re-parsed (extract_call_sites.py, cached by
+  blob SHA) to report call sites that were added or removed
+
+So re-pinning a large repository costs time proportional to the diff, not
+to the tree. The carried-over references are written to
+tmp/scan/{name}/rescan.json for copying back into projects/{name}/.
+
+Usage:
+    ./scripts/rescan_changes.py cline                 # analyzed_commit -> submodule HEAD
+    ./scripts/rescan_changes.py cline --to <sha>      # ... -> a specific commit
+    ./scripts/rescan_changes.py --format json         # All projects, machine-readable
+"""
+
+import argparse
+import bisect
+import json
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from extract_call_sites import extract_source, is_parseable, read_cache, write_cache
+from scan_submodules import DEFAULT_OUTPUT, PROJECTS_DIR, SUBMODULES_DIR, load_yaml, read_gitmodules
+
+console = Console()
+
+HUNK_RE = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+# ── Git plumbing ─────────────────────────────────────────────────────────────
+
+def git(root: Path, *args: str) -> bytes:
+    return subprocess.run(["git", "-C", str(root), *args], capture_output=True, check=True).stdout
+
+
+def resolve_commit(root: Path, rev: str) -> str | None:
+    try:
+        return git(root, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}").decode().strip()
+    except subprocess.CalledProcessError:
+        return None
+
+
+def changed_paths(root: Path, old: str, new: str) -> tuple[dict[str, str | None], set[str]]:
+    """Return ({old path: new path or None if deleted}, added paths) between two commits."""
+    out = git(root, "diff", "--name-status", "-M", "-z", old, new).split(b"\0")
+    renamed: dict[str, str | None] = {}
+    added: set[str] = set()
+    i = 0
+    while i < len(out) - 1:
+        status = out[i].decode()
+        if status.startswith(("R", "C")):
+            src, dst = out[i + 1].decode(errors="replace"), out[i + 2].decode(errors="replace")
+            if status.startswith("R"):
+                renamed[src] = dst
+            else:
+                added.add(dst)
+            i += 3
+            continue
+        path = out[i + 1].decode(errors="replace")
+        if status == "D":
+            renamed[path] = None
+        elif status == "A":
+            added.add(path)
+        else:
+            renamed[path] = path
+        i += 2
+    return renamed, added
+
+
+def diff_hunks(root: Path, old: str, new: str) -> dict[str, list[tuple[int, int, int, int]]]:
+    """Return {old path: [(old_start, old_count, new_start, new_count)]} from one -U0 diff."""
+    hunks: dict[str, list[tuple[int, int, int, int]]] = {}
+    current: list[tuple[int, int, int, int]] | None = None
+    for line in git(root, "diff", "-U0", "-M", "--no-color", "--no-ext-diff", old, new).splitlines():
+        if line.startswith(b"--- "):
+            name = line[4:].decode(errors="replace")
+            current = hunks.setdefault(name[2:], []) if name.startswith("a/") else None
+        elif current is not None and line.startswith(b"@@"):
+            m = HUNK_RE.match(line)
+            if m:
+                old_start, old_count, new_start, new_count = m.groups()
+                current.append((int(old_start), int(old_count or 1), int(new_start), int(new_count or 1)))
+    return hunks
+
+
+def read_blobs(root: Path, commit: str, paths: list[str]) -> dict[str, tuple[str, bytes | None]]:
+    """Return {path: (blob sha, content or None if the result is cached)} at commit."""
+    if not paths:
+        return {}
+    listing = git(root, "ls-tree", "-z", commit, "--", *paths).split(b"\0")
+    blobs = {}
+    for record in listing:
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        _, kind, blob = meta.split()
+        if kind == b"blob":
+            blobs[path.decode(errors="replace")] = blob.decode()
+
+    result = {}
+    for path, blob in blobs.items():
+        result[path] = (blob, None if read_cache(blob) is not None else git(root, "cat-file", "blob", blob))
+    return result
+
+
+def findings_at(root: Path, commit: str, paths: list[str]) -> dict[str, list[dict[str, Any]]]:
+    """Call-site findings for the given paths at a commit, via the blob cache."""
+    findings = {}
+    for path, (blob, content) in read_blobs(root, commit, [p for p in paths if is_parseable(p)]).items():
+        if content is None:
+            findings[path] = read_cache(blob) or []
+        else:
+            findings[path] = extract_source(path, content)
+            write_cache(blob, findings[path])
+    return findings
+
+
+# ── Line mapping ─────────────────────────────────────────────────────────────
+
+class LineMap:
+    """Maps old line ranges to new ones through a file's -U0 hunks."""
+
+    def __init__(self, hunks: list[tuple[int, int, int, int]]):
+        self.hunks = sorted(hunks)
+        # Old line after which each hunk's delta applies, and the cumulative delta
+        self.ends = []
+        self.deltas = []
+        delta = 0
+        for old_start, old_count, _, new_count in self.hunks:
+            delta += new_count - old_count
+            self.ends.append(old_start + old_count - 1 if old_count else old_start)
+            self.deltas.append(delta)
+
+    def map_range(self, start: int, end: int) -> tuple[int, int] | None:
+        """Return the shifted (start, end), or None if a hunk touches the range."""
+        for old_start, old_count, _, _ in self.hunks:
+            if old_count and old_start <= end and old_start + old_count - 1 >= start:
+                return None
+            if not old_count and start <= old_start < end:
+                return None
+        i = bisect.bisect_left(self.ends, start) - 1
+        delta = self.deltas[i] if i >= 0 else 0
+        return start + delta, end + delta
+
+
+# ── Recorded references ──────────────────────────────────────────────────────
+
+def iter_references(node: Any, label: str):
+    """Yield (label, reference dict) for every {path, lines:[a, b]} object in a YAML document."""
+    if isinstance(node, dict):
+        lines = node.get("lines")
+        if isinstance(node.get("path"), str) and isinstance(lines, list) and len(lines) == 2 \
+                and all(isinstance(n, int) for n in lines):
+            yield label, node
+        for key, value in node.items():
+            if key != "highlights":
+                yield from iter_references(value, f"{label}.{key}")
+    elif isinstance(node, list):
+        for i, item in enumerate(node):
+            tag = item.get("id") or item.get("name") if isinstance(item, dict) else None
+            yield from iter_references(item, f"{label}[{tag or i}]")
+
+
+def project_references(project_dir: Path) -> list[tuple[str, dict[str, Any]]]:
+    refs = []
+    for path in sorted(project_dir.glob("*.yaml")):
+        if path.name.startswith("metadata."):
+            continue
+        doc = load_yaml(path)
+        if doc:
+            refs.extend(iter_references(doc, path.name))
+    return refs
+
+
+def finding_key(finding: dict[str, Any]) -> tuple:
+    return (finding["kind"], finding.get("command_pattern") or finding.get("api_method"),
+            finding.get("function"), finding.get("class"))
+
+
+def site_entry(path: str, finding: dict[str, Any]) -> dict[str, Any]:
+    return {"path": path, "lines": finding["lines"], "kind": finding["kind"],
+            "what": finding.get("command_pattern") or finding.get("api_method")}
+
+
+def rescan_project(name: str, root: Path, to: str) -> dict[str, Any]:
+    metadata = load_yaml(PROJECTS_DIR / name / "metadata.project.yaml") or {}
+    old = str(metadata.get("analyzed_commit") or "")
+    report: dict[str, Any] = {"project": name, "from": old, "to": None}
+    if not root.is_dir():
+        report["error"] = f"{root} is not checked out"
+        return report
+    old_sha, new_sha = resolve_commit(root, old) if old else None, resolve_commit(root, to)
+    if old_sha is None or new_sha is None:
+        missing = (old or "analyzed_commit") if old_sha is None else to
+        report["error"] = f"commit {missing} not found in {root} (fetch it, or unshallow the clone)"
+        return report
+    report["to"] = new_sha
+
+    renamed, added_paths = changed_paths(root, old_sha, new_sha)
+    hunks = diff_hunks(root, old_sha, new_sha)
+
+    references = {"carried": 0, "moved": [], "changed": [], "removed": []}
+    carried_over = []
+    for label, ref in project_references(PROJECTS_DIR / name):
+        path = ref["path"]
+        start, end = ref["lines"]
+        updated = dict(ref)
+        if "commit" in updated:
+            updated["commit"] = new_sha
+        if path not in renamed:
+            references["carried"] += 1
+            carried_over.append({"at": label, "reference": updated})
+            continue
+        new_path = renamed[path]
+        entry = {"at": label, "path": path, "lines": [start, end]}
+        if new_path is None:
+            references["removed"].append(entry)
+            continue
+        mapped = LineMap(hunks.get(path, [])).map_range(start, end)
+        if mapped is None:
+            references["changed"].append(dict(entry, new_path=new_path))
+            continue
+        updated["path"], updated["lines"] = new_path, list(mapped)
+        carried_over.append({"at": label, "reference": updated})
+        if new_path != path or mapped != (start, end):
+            references["moved"].append(dict(entry, new_path=new_path, new_lines=list(mapped)))
+        else:
+            references["carried"] += 1
+
+    # Re-parse only the touched files, on both sides of the diff
+    before = findings_at(root, old_sha, sorted(renamed))
+    after = findings_at(root, new_sha, sorted({q for q in renamed.values() if q} | added_paths))
+    call_sites = {"added": [], "removed": []}
+    pairs = list(renamed.items()) + [(None, path) for path in sorted(added_paths)]
+    for old_path, new_path in pairs:
+        old_findings = before.get(old_path, []) if old_path else []
+        remaining = Counter(finding_key(f) for f in old_findings)
+        for finding in after.get(new_path, []) if new_path else []:
+            key = finding_key(finding)
+            if remaining[key]:
+                remaining[key] -= 1
+            else:
+                call_sites["added"].append(site_entry(new_path, finding))
+        for finding in old_findings:
+            key = finding_key(finding)
+            if remaining[key]:
+                remaining[key] -= 1
+                call_sites["removed"].append(site_entry(old_path, finding))
+
+    report.update(
+        files_changed=len(renamed) + len(added_paths),
+        files_parsed=len(before) + len(after),
+        references=references,
+        call_sites=call_sites,
+        carried_over=carried_over,
+    )
+    return report
+
+
+def print_report(report: dict[str, Any]):
+    name = report["project"]
+    if "error" in report:
+        console.print(f"[yellow]{name}:[/yellow] {report['error']}")
+        return
+    refs, sites = report["references"], report["call_sites"]
+    console.print(f"\n[bold cyan]{name}[/bold cyan] {report['from'][:12]} → {report['to'][:12]}: "
+                  f"{report['files_changed']} files changed, {report['files_parsed']} parsed")
+
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Change")
+    table.add_column("Where", overflow="fold")
+    table.add_column("Detail")
+    for entry in refs["moved"]:
+        target = entry["new_path"] if entry["new_path"] != entry["path"] else ""
+        table.add_row("[blue]moved[/blue]", entry["at"],
+                      f"{entry['path']}:{entry['lines'][0]} → {target}:{entry['new_lines'][0]}".replace(" → :", " → "))
+    for entry in refs["changed"]:
+        table.add_row("[yellow]changed[/yellow]", entry["at"], f"{entry['path']}:{entry['lines'][0]}-{entry['lines'][1]}")
+    for entry in refs["removed"]:
+        table.add_row("[red]removed[/red]", entry["at"], f"{entry['path']} deleted")
+    for entry in sites["added"]:
+        table.add_row("[green]+ call site[/green]", f"{entry['path']}:{entry['lines'][0]}", entry["what"])
+    for entry in sites["removed"]:
+        table.add_row("[red]- call site[/red]", f"{entry['path']}:{entry['lines'][0]}", entry["what"])
+    if table.row_count:
+        console.print(table)
+    console.print(f"  {refs['carried']} references carried over unchanged")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental re-scan between analyzed_commit and a newer commit")
+    parser.add_argument("names", nargs="*", help="Project names (default: all with a submodule)")
+    parser.add_argument("--to", default="HEAD", help="Target commit in the submodule clone (default: HEAD)")
+    parser.add_argument("--submodules-dir", type=Path, default=SUBMODULES_DIR,
+                        help="Directory holding the checked-out submodules")
+    parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
+                        help="Where rescan.json files are written (default: tmp/scan/)")
+    parser.add_argument("--format", choices=["table", "json"], default="table", help="Report format")
+    args = parser.parse_args()
+
+    names = args.names or [m["name"] for m in read_gitmodules() if (PROJECTS_DIR / m["name"]).is_dir()]
+    reports = []
+    for name in names:
+        if not (PROJECTS_DIR / name).is_dir():
+            console.print(f"[red]Unknown project:[/red] {name}")
+            sys.exit(1)
+        report = rescan_project(name, args.submodules_dir / name, args.to)
+        reports.append(report)
+        if "error" not in report:
+            out = args.output / name / "rescan.json"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.format == "json":
+        print(json.dumps([{k: v for k, v in r.items() if k != "carried_over"} for r in reports], indent=2))
+        return
+    for report in reports:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,27 @@ Usage:
     ./scripts/research_status.py --verbose           # Detailed output
     ./scripts/research_status.py --checklist cli     # Coverage for specific checklist
     ./scripts/research_status.py --missing           # Show only missing items
+    ./scripts/research_status.py --query 'primary_language = Python and analysis_status = comprehensive'
+    ./scripts/research_status.py --query 'environment_variables.name = ANTHROPIC_API_KEY' --format names
+    ./scripts/research_status.py --query 'reference.class exists and not sdk.sdk_usage.pattern ~ stream' --format json
+    ./scripts/research_status.py --snapshot tmp/corpus.snapshot --project goose   # see snapshot_corpus.py
+
+Query field paths follow the spec structures, rooted at metadata, cli, sdk and
+code_references (e.g. cli.invocations.flags_used.flag). Lists are traversed
+transparently and a path may be abbreviated to any dotted suffix
+(reference.class). Operators: = (case-insensitive equality), != , ~ (regex
+search), a bare path or "path exists" tests existence; combine with and/or/not and parentheses.
 """
 
 import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -28,13 +45,20 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.tree import Tree
 
+import instrumentation
+from corpus_model import ProjectMetadata
+
 console = Console()
 
 REPO_ROOT = Path(__file__).parent.parent
 SPECS_DIR = REPO_ROOT / "specs"
-PROJECTS_DIR = REPO_ROOT / "projects"
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
 CHECKLISTS_DIR = REPO_ROOT / "checklists"
 
+# Set by --snapshot: read projects from a snapshot_corpus.py snapshot instead of PROJECTS_DIR
+SNAPSHOT = None
+
 
 def load_yaml(path: Path) -> dict[str, Any] | None:
     """Load and parse a YAML file."""
@@ -47,38 +71,55 @@ def load_yaml(path: Path) -> dict[str, Any] | None:
 
 def get_projects() -> list[str]:
     """Get list of project directories."""
+    if SNAPSHOT is not None:
+        return SNAPSHOT.names()
     if not PROJECTS_DIR.exists():
         return []
     return [d.name for d in PROJECTS_DIR.iterdir() if d.is_dir()]
 
 
-def get_project_status(project_name: str) -> dict[str, Any]:
+@dataclass(slots=True)
+class ProjectStatus:
+    name: str
+    exists: bool = False
+    metadata: ProjectMetadata | None = None
+    files: list[str] = field(default_factory=list)
+    integration_types: list[str] = field(default_factory=list)
+    analysis_status: str = "pending"
+    checklist_coverage: dict[str, Any] = field(default_factory=dict)
+
+
+def get_project_status(project_name: str) -> ProjectStatus:
     """Get status information for a project."""
-    project_dir = PROJECTS_DIR / project_name
-    status = {
-        "name": project_name,
-        "exists": project_dir.exists(),
-        "metadata": None,
-        "files": [],
-        "integration_types": [],
-        "analysis_status": "pending",
-        "checklist_coverage": {},
-    }
+    if SNAPSHOT is not None:
+        # Decodes only this project's metadata and file list
+        i = SNAPSHOT.find(project_name)
+        status = ProjectStatus(name=project_name, exists=i is not None)
+        if i is None:
+            return status
+        metadata = SNAPSHOT.section(i, "metadata")
+        status.files = SNAPSHOT.section(i, "files")
+    else:
+        project_dir = PROJECTS_DIR / project_name
+        status = ProjectStatus(name=project_name, exists=project_dir.exists())
 
-    if not project_dir.exists():
-        return status
+        if not status.exists:
+            return status
 
-    # Load metadata
-    metadata_path = project_dir / "metadata.project.yaml"
-    if metadata_path.exists():
-        status["metadata"] = load_yaml(metadata_path)
-        if status["metadata"]:
-            status["integration_types"] = status["metadata"].get("integration_types", [])
-            status["analysis_status"] = status["metadata"].get("analysis_status", "pending")
+        # Load metadata
+        metadata = None
+        metadata_path = project_dir / "metadata.project.yaml"
+        if metadata_path.exists():
+            metadata = load_yaml(metadata_path)
 
-    # List data files
-    for yaml_file in project_dir.glob("*.yaml"):
-        status["files"].append(yaml_file.name)
+        # List data files
+        for yaml_file in project_dir.glob("*.yaml"):
+            status.files.append(yaml_file.name)
+
+    if metadata:
+        status.metadata = ProjectMetadata.from_dict(metadata)
+        status.integration_types = status.metadata.integration_types
+        status.analysis_status = status.metadata.analysis_status or "pending"
 
     return status
 
@@ -101,7 +142,7 @@ def get_checklist_items(checklist: dict[str, Any]) -> list[dict[str, Any]]:
     return items
 
 
-def calculate_coverage(project_status: dict[str, Any], checklist_name: str) -> dict[str, Any]:
+def calculate_coverage(project_status: ProjectStatus, checklist_name: str) -> dict[str, Any]:
     """Calculate coverage for a project against a checklist."""
     checklist = load_checklist(checklist_name)
     if not checklist:
@@ -144,25 +185,24 @@ def display_overview():
     table.add_column("Files")
     table.add_column("Commit")
 
-    for project_name in sorted(projects):
-        status = get_project_status(project_name)
-
+    statuses = [get_project_status(project_name) for project_name in sorted(projects)]
+    for status in statuses:
         status_style = {
             "pending": "[yellow]pending[/yellow]",
             "minimal": "[blue]minimal[/blue]",
             "in-progress": "[cyan]in-progress[/cyan]",
             "comprehensive": "[green]comprehensive[/green]",
-        }.get(status["analysis_status"], status["analysis_status"])
+        }.get(status.analysis_status, status.analysis_status)
 
-        integration_types = ", ".join(status["integration_types"]) or "-"
-        file_count = str(len(status["files"]))
+        integration_types = ", ".join(status.integration_types) or "-"
+        file_count = str(len(status.files))
 
         commit = "-"
-        if status["metadata"]:
-            commit = status["metadata"].get("analyzed_commit", "-")[:8]
+        if status.metadata:
+            commit = (status.metadata.analyzed_commit or "-")[:8]
 
         table.add_row(
-            project_name,
+            status.name,
             status_style,
             integration_types,
             file_count,
@@ -176,9 +216,8 @@ def display_overview():
     console.print(f"  Total projects: {len(projects)}")
 
     status_counts = {}
-    for project_name in projects:
-        status = get_project_status(project_name)
-        s = status["analysis_status"]
+    for status in statuses:
+        s = status.analysis_status
         status_counts[s] = status_counts.get(s, 0) + 1
 
     for s, count in sorted(status_counts.items()):
@@ -189,35 +228,35 @@ def display_project_details(project_name: str, verbose: bool = False):
     """Display detailed status for a specific project."""
     status = get_project_status(project_name)
 
-    if not status["exists"]:
+    if not status.exists:
         console.print(f"[red]Project not found:[/red] {project_name}")
         return
 
     console.print(Panel.fit(
         f"[bold]{project_name}[/bold]\n"
-        f"Status: {status['analysis_status']}",
+        f"Status: {status.analysis_status}",
         border_style="blue"
     ))
 
     # Metadata
-    if status["metadata"]:
-        meta = status["metadata"]
+    if status.metadata:
+        meta = status.metadata
         console.print("\n[bold]Metadata:[/bold]")
-        console.print(f"  Display name: {meta.get('display_name', '-')}")
-        console.print(f"  Repository: {meta.get('repository', '-')}")
-        console.print(f"  Analyzed commit: {meta.get('analyzed_commit', '-')}")
-        console.print(f"  Analyzed at: {meta.get('analyzed_at', '-')}")
-        console.print(f"  Primary language: {meta.get('primary_language', '-')}")
-        console.print(f"  Integration types: {', '.join(meta.get('integration_types', []))}")
+        console.print(f"  Display name: {meta.display_name or '-'}")
+        console.print(f"  Repository: {meta.repository or '-'}")
+        console.print(f"  Analyzed commit: {meta.analyzed_commit or '-'}")
+        console.print(f"  Analyzed at: {meta.analyzed_at or '-'}")
+        console.print(f"  Primary language: {meta.primary_language or '-'}")
+        console.print(f"  Integration types: {', '.join(meta.integration_types)}")
     else:
         console.print("\n[yellow]No metadata.project.yaml found[/yellow]")
 
     # Files
     console.print("\n[bold]Data files:[/bold]")
-    for f in sorted(status["files"]):
+    for f in sorted(status.files):
         console.print(f"  • {f}")
 
-    if not status["files"]:
+    if not status.files:
         console.print("  [yellow]No data files[/yellow]")
 
     # Checklist coverage (placeholder)
@@ -279,18 +318,18 @@ def display_missing():
         status = get_project_status(project_name)
         missing = []
 
-        if not status["metadata"]:
+        if not status.metadata:
             missing.append("metadata.project.yaml")
 
-        if status["analysis_status"] == "pending":
+        if status.analysis_status == "pending":
             missing.append("any analysis data")
 
-        if "cli" in status["integration_types"]:
-            if "cli.cli-integration.yaml" not in status["files"]:
+        if "cli" in status.integration_types:
+            if "cli.cli-integration.yaml" not in status.files:
                 missing.append("cli.cli-integration.yaml")
 
-        if "sdk" in status["integration_types"]:
-            if "sdk.sdk-integration.yaml" not in status["files"]:
+        if "sdk" in status.integration_types:
+            if "sdk.sdk-integration.yaml" not in status.files:
                 missing.append("sdk.sdk-integration.yaml")
 
         if missing:
@@ -299,16 +338,355 @@ def display_missing():
                 console.print(f"  [yellow]•[/yellow] Missing: {item}")
 
 
+# ── Corpus query (persistent inverted index) ─────────────────────────────────
+
+QUERY_INDEX_DIR = REPO_ROOT / "tmp" / "cache"
+QUERY_INDEX_VERSION = 2
+
+# Spec file -> root of its field paths in queries
+QUERY_ROOTS = {
+    "project": "metadata",
+    "cli-integration": "cli",
+    "sdk-integration": "sdk",
+    "code-reference": "code_references",
+}
+
+QUERY_TOKEN_RE = re.compile(r"""\s*(?:(\()|(\))|(==|!=|=|~)|"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|([^\s()=!~"']+))""")
+
+
+def flatten_fields(value: Any, path: str, out: dict[str, set[str]]):
+    """Collect every scalar under value as {dotted.path: {normalized values}}; lists are transparent."""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            flatten_fields(child, f"{path}.{key}" if path else str(key), out)
+    elif isinstance(value, list):
+        for child in value:
+            flatten_fields(child, path, out)
+    elif value is not None:
+        if isinstance(value, bool):
+            normalized = "true" if value else "false"
+        else:
+            normalized = str(value).strip().lower()
+        out.setdefault(path, set()).add(normalized)
+
+
+def index_project(project_dir: Path) -> tuple[dict[str, set[str]], dict[str, Any]]:
+    """Return (field path -> values, display row) for one project directory."""
+    fields: dict[str, set[str]] = {}
+    meta: dict[str, Any] = {}
+    for yaml_file in sorted(project_dir.glob("*.yaml")):
+        parts = yaml_file.name.rsplit(".", 2)
+        root = QUERY_ROOTS.get(parts[-2]) if len(parts) == 3 else None
+        data = load_yaml(yaml_file)
+        if root and isinstance(data, dict):
+            flatten_fields(data, root, fields)
+            if root == "metadata":
+                meta = data
+
+    row = {
+        "name": project_dir.name,
+        "analysis_status": meta.get("analysis_status") or "pending",
+        "primary_language": meta.get("primary_language") or "-",
+        "integration_types": list(meta.get("integration_types") or []),
+    }
+    return fields, row
+
+
+def scan_project_files() -> dict[str, dict[str, tuple[int, int]]]:
+    """Return {project: {file name: (mtime_ns, size)}} for every project directory."""
+    stats: dict[str, dict[str, tuple[int, int]]] = {}
+    if not PROJECTS_DIR.exists():
+        return stats
+    with os.scandir(PROJECTS_DIR) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith("_"):
+                continue
+            files = {}
+            with os.scandir(entry.path) as project_entries:
+                for f in project_entries:
+                    if f.name.endswith(".yaml"):
+                        st = f.stat()
+                        files[f.name] = (st.st_mtime_ns, st.st_size)
+            stats[entry.name] = files
+    return stats
+
+
+def query_index_path() -> Path:
+    """One index file per corpus, keyed by its resolved path, so KB_PROJECTS_DIR corpora don't share one."""
+    key = hashlib.sha256(str(PROJECTS_DIR.resolve()).encode()).hexdigest()[:16]
+    return QUERY_INDEX_DIR / f"query-index-{key}.pickle"
+
+
+def load_query_index() -> dict[str, Any]:
+    """Load the persistent index and bring it up to date with projects/."""
+    index_path = query_index_path()
+    corpus = str(PROJECTS_DIR.resolve())
+    index = None
+    if index_path.exists():
+        try:
+            with open(index_path, "rb") as f:
+                index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            index = None
+    if not index or index.get("version") != QUERY_INDEX_VERSION or index.get("corpus") != corpus:
+        index = {"version": QUERY_INDEX_VERSION, "corpus": corpus, "files": {}, "fields": {}, "rows": {},
+                 "postings": {}}
+
+    postings: dict[str, dict[str, set[str]]] = index["postings"]
+    stats = scan_project_files()
+    changed = False
+
+    for project in list(index["files"]):
+        if project in stats and stats[project] == index["files"][project]:
+            continue
+        # Drop the project's old postings (changed or removed)
+        for path, values in index["fields"].pop(project, {}).items():
+            for value in values:
+                projects = postings[path][value]
+                projects.discard(project)
+                if not projects:
+                    del postings[path][value]
+            if not postings[path]:
+                del postings[path]
+        index["rows"].pop(project, None)
+        del index["files"][project]
+        changed = True
+
+    for project, files in stats.items():
+        if project in index["files"]:
+            continue
+        fields, row = index_project(PROJECTS_DIR / project)
+        for path, values in fields.items():
+            for value in values:
+                postings.setdefault(path, {}).setdefault(value, set()).add(project)
+        index["fields"][project] = fields
+        index["rows"][project] = row
+        index["files"][project] = files
+        changed = True
+
+    if changed:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(index_path)
+
+    return index
+
+
+def tokenize_query(query: str) -> list[tuple[str, str]]:
+    """Split a query into (kind, text) tokens: lparen, rparen, op, value, word."""
+    tokens = []
+    pos = 0
+    query = query.rstrip()
+    while pos < len(query):
+        match = QUERY_TOKEN_RE.match(query, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Unexpected character at position {pos}: {query[pos:pos + 10]!r}")
+        pos = match.end()
+        lparen, rparen, op, dquoted, squoted, word = match.groups()
+        if lparen:
+            tokens.append(("lparen", lparen))
+        elif rparen:
+            tokens.append(("rparen", rparen))
+        elif op:
+            tokens.append(("op", "=" if op == "==" else op))
+        elif dquoted is not None or squoted is not None:
+            tokens.append(("value", (dquoted if dquoted is not None else squoted).replace('\\"', '"').replace("\\'", "'")))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+def parse_query(query: str) -> tuple:
+    """Parse a predicate expression into a tuple AST.
+
+    Grammar:
+        expr  := term ("or" term)*
+        term  := factor ("and" factor)*
+        factor:= "not" factor | "(" expr ")" | path ["exists" | op value]
+        op    := "=" | "!=" | "~"
+    """
+    tokens = tokenize_query(query)
+    pos = 0
+
+    def peek() -> tuple[str, str] | None:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def keyword(word: str) -> bool:
+        tok = peek()
+        return tok is not None and tok[0] == "word" and tok[1].lower() == word
+
+    def expr() -> tuple:
+        nonlocal pos
+        node = term()
+        while keyword("or"):
+            pos += 1
+            node = ("or", node, term())
+        return node
+
+    def term() -> tuple:
+        nonlocal pos
+        node = factor()
+        while keyword("and"):
+            pos += 1
+            node = ("and", node, factor())
+        return node
+
+    def factor() -> tuple:
+        nonlocal pos
+        tok = peek()
+        if tok is None:
+            raise ValueError("Unexpected end of query")
+        if keyword("not"):
+            pos += 1
+            return ("not", factor())
+        if tok[0] == "lparen":
+            pos += 1
+            node = expr()
+            if peek() is None or peek()[0] != "rparen":
+                raise ValueError("Missing closing parenthesis")
+            pos += 1
+            return node
+        if tok[0] != "word":
+            raise ValueError(f"Expected a field path, got {tok[1]!r}")
+        pos += 1
+        path = tok[1]
+        if keyword("exists"):
+            pos += 1
+            return ("exists", path)
+        op_tok = peek()
+        if op_tok is None or op_tok[0] != "op":
+            return ("exists", path)
+        pos += 1
+        value_tok = peek()
+        if value_tok is None or value_tok[0] not in ("value", "word"):
+            raise ValueError(f"Expected a value after {path} {op_tok[1]}")
+        pos += 1
+        return (op_tok[1], path, value_tok[1])
+
+    node = expr()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected token {tokens[pos][1]!r}")
+    return node
+
+
+def resolve_field_paths(index: dict[str, Any], path: str) -> list[str]:
+    """Match a query path against indexed paths, exactly or as a dotted suffix."""
+    postings = index["postings"]
+    if path in postings:
+        return [path]
+    suffix = f".{path}"
+    return [p for p in postings if p.endswith(suffix)]
+
+
+def evaluate_query(index: dict[str, Any], node: tuple) -> set[str]:
+    """Evaluate a parsed query to the set of matching project names."""
+    kind = node[0]
+    postings = index["postings"]
+    if kind == "and":
+        return evaluate_query(index, node[1]) & evaluate_query(index, node[2])
+    if kind == "or":
+        return evaluate_query(index, node[1]) | evaluate_query(index, node[2])
+    if kind == "not":
+        return set(index["rows"]) - evaluate_query(index, node[1])
+
+    path = node[1]
+    result: set[str] = set()
+    for field_path in resolve_field_paths(index, path):
+        values = postings[field_path]
+        if kind == "exists":
+            for projects in values.values():
+                result |= projects
+        elif kind in ("=", "!="):
+            result |= values.get(node[2].strip().lower(), set())
+        elif kind == "~":
+            pattern = re.compile(node[2], re.IGNORECASE)
+            for value, projects in values.items():
+                if pattern.search(value):
+                    result |= projects
+    if kind == "!=":
+        return set(index["rows"]) - result
+    return result
+
+
+def display_query(query: str, output_format: str):
+    """Run a predicate query against the corpus index and print the matches."""
+    started = time.perf_counter()
+    index = load_query_index()
+    loaded = time.perf_counter()
+
+    try:
+        matches = sorted(evaluate_query(index, parse_query(query)))
+    except (ValueError, re.error) as e:
+        console.print(f"[red]Invalid query:[/red] {e}")
+        sys.exit(2)
+    finished = time.perf_counter()
+
+    rows = [index["rows"][name] for name in matches]
+    if output_format == "names":
+        for row in rows:
+            print(row["name"])
+    elif output_format == "json":
+        print(json.dumps(rows, indent=2))
+    else:
+        table = Table(title=f"Query: {query}")
+        table.add_column("Project", style="cyan")
+        table.add_column("Status", style="green")
+        table.add_column("Language")
+        table.add_column("Integration Types")
+        for row in rows:
+            table.add_row(row["name"], row["analysis_status"], row["primary_language"],
+                          ", ".join(row["integration_types"]) or "-")
+        console.print(table)
+        console.print(
+            f"[dim]{len(rows)} match(es); index {(loaded - started) * 1000:.1f} ms, "
+            f"query {(finished - loaded) * 1000:.2f} ms[/dim]"
+        )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Research status for Claude Code integrations")
     parser.add_argument("--project", "-p", help="Show details for specific project")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--checklist", "-c", help="Show coverage for specific checklist")
     parser.add_argument("--missing", "-m", action="store_true", help="Show missing items")
+    parser.add_argument("--query", "-q", help="Find projects matching a predicate over spec field paths")
+    parser.add_argument("--format", choices=["table", "json", "names"], default="table",
+                        help="Output format for --query")
+    parser.add_argument("--snapshot", type=Path, metavar="PATH",
+                        help="Read projects from a snapshot written by snapshot_corpus.py")
+    instrumentation.add_arguments(parser)
 
     args = parser.parse_args()
-
-    if args.project:
+    instrumentation.configure_from_args("research_status", args)
+    instrumentation.instrument(globals(), {
+        "get_projects": "discover",
+        "load_yaml": "parse",
+        "get_project_status": "status",
+        "calculate_coverage": "coverage",
+        "load_query_index": "query index",
+        "evaluate_query": "query eval",
+        "display_overview": "render",
+        "display_project_details": "render",
+        "display_checklist_coverage": "render",
+        "display_missing": "render",
+    })
+
+    if args.snapshot:
+        if args.query:
+            parser.error("--query uses its own index over projects/ and cannot be combined with --snapshot")
+        from snapshot_corpus import CorpusSnapshot
+        global SNAPSHOT
+        try:
+            SNAPSHOT = CorpusSnapshot(args.snapshot)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Cannot open snapshot:[/red] {e}")
+            sys.exit(1)
+
+    if args.query:
+        display_query(args.query, args.format)
+    elif args.project:
         display_project_details(args.project, args.verbose)
     elif args.checklist:
         display_checklist_coverage(args.checklist)
@@ -0,0 +1,549 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Scan checked-out submodules for Claude Code CLI and Anthropic SDK usage.
+
+Every submodule is walked once. Each source file is matched against all known
+CLI flags and SDK import/call patterns at the same time, using one compiled
+regex. Nearby matches are grouped into draft invocation / sdk_usage entries
+with reference.path, lines and commit filled in. The drafts are a starting
+point for cli.cli-integration.yaml / sdk.sdk-integration.yaml; they are
+written to tmp/scan/ and are never copied into projects/ automatically.
+
+Usage:
+    ./scripts/scan_submodules.py                        # Scan every submodule in .gitmodules
+    ./scripts/scan_submodules.py goose cline            # Scan selected submodules
+    ./scripts/scan_submodules.py --jobs 16              # Worker processes (default: CPU count)
+    ./scripts/scan_submodules.py --output tmp/scan/     # Where drafts are written
+"""
+
+import argparse
+import configparser
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+PROJECTS_DIR = REPO_ROOT / "projects"
+SPECS_DIR = REPO_ROOT / "specs"
+CHECKLISTS_DIR = REPO_ROOT / "checklists"
+SUBMODULES_DIR = REPO_ROOT / "submodules"
+DEFAULT_OUTPUT = REPO_ROOT / "tmp" / "scan"
+
+# Directories that hold dependencies, build output or VCS data, never analyzed code
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "bower_components", "vendor", "vendors",
+    "third_party", "third-party", "external", "dist", "build", "out", "target",
+    ".next", ".nuxt", ".turbo", ".cache", "coverage", "__pycache__", ".venv", "venv",
+    "env", ".tox", ".nox", ".mypy_cache", ".pytest_cache", "site-packages", ".yarn",
+}
+
+# Flags whose value_type is drafted as enum, with the literal seen as an option
+ENUM_FLAGS = {"--output-format", "--input-format", "--permission-mode"}
+# Switches from the spec's known_flags: what follows them is another argument
+SWITCH_FLAGS = {
+    "-p", "--print", "-c", "--continue", "--verbose", "--dangerously-skip-permissions",
+    "--help", "--version", "--no-color",
+}
+# A quoted string, a bare token, or a closing bracket that ends an argument list
+ARG_TOKEN_RE = re.compile(r"""(["'`])(.*?)\1|([^\s"'`,;()\[\]{}]+)|([)\]}])""")
+
+SKIP_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".svg", ".pdf", ".zip", ".gz",
+    ".tgz", ".bz2", ".xz", ".zst", ".7z", ".jar", ".woff", ".woff2", ".ttf", ".otf",
+    ".eot", ".mp3", ".mp4", ".mov", ".wav", ".so", ".dylib", ".dll", ".exe", ".bin",
+    ".pyc", ".class", ".o", ".a", ".wasm", ".map", ".lock", ".sqlite", ".db",
+}
+
+MAX_FILE_BYTES = 2 * 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+GROUP_GAP_LINES = 12
+SNIPPET_CONTEXT_LINES = 2
+
+LANGUAGES = {
+    ".py": "python", ".ts": "typescript", ".tsx": "typescript", ".mts": "typescript",
+    ".cts": "typescript", ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript",
+    ".cjs": "javascript", ".go": "go", ".rs": "rust", ".java": "java", ".kt": "kotlin",
+    ".swift": "swift", ".c": "c", ".h": "c", ".cc": "cpp", ".cpp": "cpp", ".hpp": "cpp",
+    ".cs": "csharp", ".rb": "ruby", ".sh": "shell", ".bash": "shell", ".zsh": "shell",
+}
+
+# Cheap whole-file prefilter: nothing below can match without one of these
+PREFILTER = re.compile(rb"claude|anthropic", re.IGNORECASE)
+
+# Flags that mark `claude <flag>` in a shell line as a CLI invocation
+COMMAND_FLAGS = [
+    "-p", "--print", "-c", "--continue", "--resume", "--output-format", "--input-format",
+    "--dangerously-skip-permissions", "--model",
+]
+
+# (kind, regex) pairs; CLI flags are appended at runtime from specs/checklists/corpus
+BASE_PATTERNS: list[tuple[str, str]] = [
+    # Zero-width after `claude`: matches cannot overlap, so consuming the flag here
+    # would hide it from its own flag: pattern
+    ("cli-command", r"\bclaude(?=\s+(?:" + "|".join(re.escape(f) + r"(?![\w-])" for f in COMMAND_FLAGS)
+                    + r"|mcp\s+add\b))"),
+    ("cli-binary", r"""(?<![\w/.-])["'`]claude["'`]"""),
+    ("sdk-import-python", r"^\s*(?:from\s+anthropic(?:\.\w+)*\s+import\b|import\s+anthropic\b)"),
+    ("sdk-import-agent-python", r"^\s*(?:from\s+claude_(?:agent|code)_sdk\b|import\s+claude_(?:agent|code)_sdk\b)"),
+    ("sdk-import-typescript", r"""["']@anthropic-ai/sdk(?:/[\w./-]*)?["']"""),
+    ("sdk-import-agent-typescript", r"""["']@anthropic-ai/claude-(?:agent|code)(?:-sdk)?(?:/[\w./-]*)?["']"""),
+    ("sdk-import-go", r"github\.com/anthropics/anthropic-sdk-go"),
+    ("sdk-import-rust", r"\banthropic(?:_sdk)?::"),
+    ("sdk-messages-stream", r"\.messages\.stream\s*\("),
+    ("sdk-messages-create", r"\.messages\.create\s*\("),
+    ("sdk-agent-query", r"\b(?:ClaudeSDKClient|query)\s*\(\s*(?:prompt\s*=|\{\s*prompt\b)"),
+]
+
+SDK_NAMES = {
+    "sdk-import-python": "anthropic-python",
+    "sdk-import-agent-python": "claude-agents-sdk",
+    "sdk-import-typescript": "anthropic-typescript",
+    "sdk-import-agent-typescript": "claude-agents-sdk",
+    "sdk-import-go": "anthropic-go",
+    "sdk-import-rust": "anthropic-rust",
+}
+
+SDK_PATTERNS = {
+    "sdk-messages-stream": "messages-stream",
+    "sdk-messages-create": "messages-create",
+    "sdk-agent-query": "agent-run",
+}
+
+
+def load_yaml(path: Path) -> dict[str, Any] | None:
+    """Load and parse a YAML file."""
+    try:
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+    except (yaml.YAMLError, FileNotFoundError):
+        return None
+
+
+class DraftDumper(yaml.SafeDumper):
+    """Dump multi-line strings (snippets) as literal blocks and line ranges inline."""
+
+
+def _str_representer(dumper: yaml.SafeDumper, value: str) -> yaml.Node:
+    style = "|" if "\n" in value else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+
+def _list_representer(dumper: yaml.SafeDumper, value: list) -> yaml.Node:
+    flow = bool(value) and all(isinstance(v, int) for v in value)
+    return dumper.represent_sequence("tag:yaml.org,2002:seq", value, flow_style=flow)
+
+
+DraftDumper.add_representer(str, _str_representer)
+DraftDumper.add_representer(list, _list_representer)
+
+
+def split_flag_names(entry: str) -> list[str]:
+    """'-c, --continue' -> ['-c', '--continue']"""
+    return [part.strip() for part in entry.split(",") if part.strip().startswith("-")]
+
+
+def known_cli_flags() -> list[str]:
+    """Collect every CLI flag named in the spec, the checklists and the corpus."""
+    flags: set[str] = set(COMMAND_FLAGS)
+
+    spec = load_yaml(SPECS_DIR / "cli-integration.spec.yaml") or {}
+    for group in (spec.get("known_flags") or {}).values():
+        for entry in group or []:
+            flags.update(split_flag_names(entry))
+
+    checklist = load_yaml(CHECKLISTS_DIR / "cli-flags.checklist.yaml") or {}
+    for category in (checklist.get("categories") or {}).values():
+        for item in category.get("items") or []:
+            if item.get("flag"):
+                flags.update(split_flag_names(item["flag"]))
+
+    for cli_path in PROJECTS_DIR.glob("*/cli.cli-integration.yaml"):
+        cli = load_yaml(cli_path) or {}
+        for inv in cli.get("invocations") or []:
+            for f in inv.get("flags_used") or []:
+                if isinstance(f.get("flag"), str) and f["flag"].startswith("-"):
+                    flags.add(f["flag"])
+
+    return sorted(flags, key=lambda f: (-len(f), f))
+
+
+def build_matcher(flags: list[str]) -> tuple[re.Pattern[bytes], list[tuple[str, str]]]:
+    """Compile all patterns into one alternation with a named group per pattern."""
+    patterns = list(BASE_PATTERNS)
+    for flag in flags:
+        # Flags count when they appear as a string literal or argument token
+        patterns.append((f"flag:{flag}", rf"""(?<![\w-]){re.escape(flag)}(?=["'`=\s,\]])"""))
+
+    groups = [f"(?P<g{i}>{regex})" for i, (_, regex) in enumerate(patterns)]
+    return re.compile("|".join(groups).encode(), re.MULTILINE), patterns
+
+
+# ── Worker side ──────────────────────────────────────────────────────────────
+
+_MATCHER: re.Pattern[bytes] | None = None
+_KINDS: list[str] = []
+
+
+def _init_worker(flags: list[str]):
+    global _MATCHER, _KINDS
+    _MATCHER, patterns = build_matcher(flags)
+    _KINDS = [kind for kind, _ in patterns]
+
+
+def scan_file(root: str, rel_path: str) -> list[tuple[str, int, str, str]]:
+    """Return (rel_path, line, kind, matched text) for every match in one file."""
+    try:
+        with open(os.path.join(root, rel_path), "rb") as f:
+            data = f.read(MAX_FILE_BYTES + 1)
+    except OSError:
+        return []
+    if len(data) > MAX_FILE_BYTES or b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return []
+    if not PREFILTER.search(data):
+        return []
+
+    matches = []
+    line = 1
+    pos = 0
+    for m in _MATCHER.finditer(data):
+        line += data.count(b"\n", pos, m.start())
+        pos = m.start()
+        kind = _KINDS[int(m.lastgroup[1:])]
+        matches.append((rel_path, line, kind, m.group().decode(errors="replace")))
+    return matches
+
+
+def scan_chunk(root: str, rel_paths: list[str]) -> list[tuple[str, int, str, str]]:
+    results = []
+    for rel_path in rel_paths:
+        results.extend(scan_file(root, rel_path))
+    return results
+
+
+# ── Repository walking ───────────────────────────────────────────────────────
+
+def list_source_files(root: Path) -> tuple[list[str], int]:
+    """Walk a tree once, pruning vendored/build dirs and binary file types."""
+    files = []
+    total_bytes = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            suffix = os.path.splitext(filename)[1].lower()
+            if suffix in SKIP_SUFFIXES or filename.endswith((".min.js", ".min.css")):
+                continue
+            full = os.path.join(dirpath, filename)
+            try:
+                size = os.path.getsize(full)
+            except OSError:
+                continue
+            if size > MAX_FILE_BYTES:
+                continue
+            total_bytes += size
+            files.append(os.path.relpath(full, root))
+    return files, total_bytes
+
+
+def read_gitmodules() -> list[dict[str, str]]:
+    """Return [{name, path, url}] from .gitmodules."""
+    config = configparser.ConfigParser()
+    config.read(REPO_ROOT / ".gitmodules")
+    modules = []
+    for section in config.sections():
+        path = config[section].get("path", "")
+        modules.append({
+            "name": Path(path).name,
+            "path": path,
+            "url": config[section].get("url", ""),
+        })
+    return modules
+
+
+def head_commit(root: Path) -> str:
+    """HEAD of the checkout at root, or "" if there is none (git's error, if any, is printed)."""
+    result = subprocess.run(["git", "-C", str(root), "rev-parse", "--show-toplevel", "HEAD"],
+                            capture_output=True, text=True, check=False)
+    if result.returncode:
+        error = result.stderr.strip().splitlines()[0] if result.stderr.strip() else result.returncode
+        console.print(f"[red]git rev-parse in {root}:[/red] {error}")
+        return ""
+    toplevel, commit = result.stdout.splitlines()
+    # An uninitialized submodule is an empty directory, which git resolves to the superproject
+    return commit if Path(toplevel).resolve() == root.resolve() else ""
+
+
+def project_repository(name: str, url: str) -> str:
+    meta = load_yaml(PROJECTS_DIR / name / "metadata.project.yaml") or {}
+    if meta.get("repository"):
+        return meta["repository"]
+    return url.removesuffix(".git")
+
+
+# ── Draft generation ─────────────────────────────────────────────────────────
+
+def group_matches(matches: list[tuple[str, int, str, str]]) -> list[list[tuple[str, int, str, str]]]:
+    """Group matches of the same file that lie within GROUP_GAP_LINES of each other."""
+    groups: list[list[tuple[str, int, str, str]]] = []
+    for match in sorted(matches):
+        if groups and groups[-1][-1][0] == match[0] and match[1] - groups[-1][-1][1] <= GROUP_GAP_LINES:
+            groups[-1].append(match)
+        else:
+            groups.append([match])
+    return groups
+
+
+def read_snippet(root: Path, rel_path: str, start: int, end: int) -> str:
+    try:
+        lines = (root / rel_path).read_text(errors="replace").splitlines()
+    except OSError:
+        return ""
+    return "\n".join(lines[start - 1:end]) + "\n"
+
+
+PACKAGE_RE = re.compile(r"@anthropic-ai/[\w-]+|github\.com/anthropics/anthropic-sdk-go|claude_(?:agent|code)_sdk|anthropic(?:_sdk)?")
+
+
+def package_name(import_text: str) -> str:
+    """'from anthropic import' -> 'anthropic', '"@anthropic-ai/sdk/x"' -> '@anthropic-ai/sdk'"""
+    m = PACKAGE_RE.search(import_text)
+    return m.group() if m else import_text.strip()
+
+
+def value_type_for(flag: str, value: str | None, literal: bool) -> tuple[str, list[str] | None]:
+    """Spec value_type (and value_options) of a flag given the argument after it."""
+    if value is None:
+        return "none", None
+    if literal and value.isdigit():
+        return "integer", None
+    if flag in ENUM_FLAGS and literal:
+        return "enum", [value]
+    if literal and value.lstrip().startswith(("{", "[")):
+        return "json", None
+    return "string", None
+
+
+def flag_value(flag: str, text: str) -> tuple[str | None, bool]:
+    """(argument after `flag` in a line of source, whether it is a literal), or (None, False)."""
+    tokens: list[tuple[str, bool] | None] = []
+    for m in ARG_TOKEN_RE.finditer(text):
+        quoted, bare, closing = m.group(2), m.group(3), m.group(4)
+        if quoted is not None:
+            # A quoted command line ("claude -p --output-format json") holds several arguments
+            tokens += [(t, True) for t in quoted.split()] or [("", True)]
+        elif bare is not None:
+            tokens.append((bare, bare.isdigit()))
+        elif closing:
+            tokens.append(None)
+    for i, token in enumerate(tokens):
+        if token is None or not (token[0] == flag or token[0].startswith(flag + "=")):
+            continue
+        if "=" in token[0]:
+            return token[0].split("=", 1)[1], token[1]
+        following = tokens[i + 1] if i + 1 < len(tokens) else None
+        if flag in SWITCH_FLAGS or following is None or following[0].startswith("-"):
+            return None, False
+        return following
+    return None, False
+
+
+def flag_value_type(flag: str, texts: list[str]) -> tuple[str, list[str] | None]:
+    """value_type from the first of the matched lines that passes the flag a value."""
+    for text in texts:
+        value, literal = flag_value(flag, text)
+        if value is not None:
+            return value_type_for(flag, value, literal)
+    return "none", None
+
+
+def draft_id(rel_path: str, line: int) -> str:
+    stem = re.sub(r"[^a-z0-9]+", "-", Path(rel_path).stem.lower()).strip("-")
+    return f"scan-{stem}-l{line}"
+
+
+def build_drafts(name: str, root: Path, repository: str, commit: str,
+                 matches: list[tuple[str, int, str, str]]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Turn raw matches into draft cli/sdk documents shaped like the specs."""
+    invocations = []
+    usages = []
+    sdks_used: dict[str, dict[str, Any]] = {}
+
+    for group in group_matches(matches):
+        rel_path = group[0][0]
+        kinds = [kind for _, _, kind, _ in group]
+        first, last = group[0][1], group[-1][1]
+        start = max(1, first - SNIPPET_CONTEXT_LINES)
+        end = last + SNIPPET_CONTEXT_LINES
+        reference = {
+            "repository": repository,
+            "commit": commit,
+            "path": rel_path,
+            "lines": [first, last],
+            "language": LANGUAGES.get(Path(rel_path).suffix.lower(), "other"),
+        }
+
+        if any(k in ("cli-command", "cli-binary") for k in kinds):
+            # A flag's line and the next, for arguments listed one per line
+            source_lines = read_snippet(root, rel_path, 1, last + 1).splitlines()
+            flag_lines: dict[str, list[str]] = {}
+            for _, line, kind, _ in group:
+                if kind.startswith("flag:"):
+                    flag_lines.setdefault(kind.split(":", 1)[1], []).append(" ".join(source_lines[line - 1:line + 1]))
+            flags_used = []
+            for flag in sorted(flag_lines):
+                vtype, options = flag_value_type(flag, flag_lines[flag])
+                entry = {"flag": flag, "value_type": vtype}
+                if options:
+                    entry["value_options"] = options
+                flags_used.append(entry)
+            invocations.append({
+                "id": draft_id(rel_path, first),
+                "description": "DRAFT: Claude Code CLI invocation found by scan_submodules.py",
+                "reference": reference,
+                "command_pattern": " ".join(["claude", *sorted(flag_lines)]),
+                "flags_used": flags_used,
+                "snippet": read_snippet(root, rel_path, start, end),
+            })
+
+        sdk_kinds = [k for k in kinds if k.startswith("sdk-")]
+        for kind, (_, line, _, text) in zip(kinds, group):
+            if kind in SDK_NAMES and SDK_NAMES[kind] not in sdks_used:
+                sdks_used[SDK_NAMES[kind]] = {
+                    "name": SDK_NAMES[kind],
+                    "package": package_name(text),
+                    "import_reference": {
+                        "path": rel_path,
+                        "lines": [line, line],
+                        "snippet": read_snippet(root, rel_path, line, line),
+                    },
+                }
+        call_kinds = [k for k in sdk_kinds if k in SDK_PATTERNS]
+        if call_kinds:
+            import_kinds = [k for k in sdk_kinds if k in SDK_NAMES]
+            usages.append({
+                "id": draft_id(rel_path, first),
+                "sdk": SDK_NAMES[import_kinds[0]] if import_kinds else "other",
+                "pattern": SDK_PATTERNS[call_kinds[0]],
+                "description": "DRAFT: SDK call found by scan_submodules.py",
+                "reference": reference,
+                "api_methods": sorted({text.strip().rstrip("(").strip() for k, (_, _, _, text)
+                                       in zip(kinds, group) if k in SDK_PATTERNS}),
+                "snippet": read_snippet(root, rel_path, start, end),
+            })
+
+    cli_doc = {
+        "project": name,
+        "cli_integration_detected": bool(invocations),
+        "summary": "",
+        "invocations": invocations,
+    }
+    sdk_doc = {
+        "project": name,
+        "sdk_integration_detected": bool(usages or sdks_used),
+        "summary": "",
+        "sdks_used": list(sdks_used.values()),
+        "sdk_usage": usages,
+    }
+    return cli_doc, sdk_doc
+
+
+def write_draft(path: Path, header: str, doc: dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(header)
+        yaml.dump(doc, f, Dumper=DraftDumper, sort_keys=False, allow_unicode=True, width=120)
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+def scan_repository(pool: ProcessPoolExecutor, root: Path, jobs: int) -> tuple[list[tuple[str, int, str, str]], int, int]:
+    """Scan one tree in parallel chunks. Returns (matches, files, bytes)."""
+    files, total_bytes = list_source_files(root)
+    chunk_size = max(64, len(files) // (jobs * 8) + 1)
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    matches = []
+    for result in pool.map(scan_chunk, [str(root)] * len(chunks), chunks):
+        matches.extend(result)
+    return matches, len(files), total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan submodules for Claude Code integrations")
+    parser.add_argument("names", nargs="*", help="Submodule names to scan (default: all)")
+    parser.add_argument("--submodules-dir", type=Path, default=SUBMODULES_DIR,
+                        help="Directory holding the checked-out submodules")
+    parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
+                        help="Draft output directory (default: tmp/scan/)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4,
+                        help="Worker processes")
+    args = parser.parse_args()
+
+    modules = read_gitmodules()
+    if args.names:
+        wanted = set(args.names)
+        modules = [m for m in modules if m["name"] in wanted]
+        missing = wanted - {m["name"] for m in modules}
+        for name in sorted(missing):
+            console.print(f"[yellow]Not in .gitmodules:[/yellow] {name}")
+
+    flags = known_cli_flags()
+    console.print(f"[bold]Scanning {len(modules)} submodule(s)[/bold] "
+                  f"({len(BASE_PATTERNS)} SDK/CLI patterns + {len(flags)} flags, {args.jobs} workers)")
+
+    table = Table(title="Scan results")
+    table.add_column("Submodule", style="cyan")
+    table.add_column("Commit")
+    table.add_column("Files", justify="right")
+    table.add_column("MB", justify="right")
+    table.add_column("Matches", justify="right")
+    table.add_column("CLI drafts", justify="right")
+    table.add_column("SDK drafts", justify="right")
+    table.add_column("Seconds", justify="right")
+
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(flags,)) as pool:
+        for module in modules:
+            root = args.submodules_dir / module["name"]
+            commit = head_commit(root) if root.is_dir() else ""
+            if not commit:
+                console.print(f"[yellow]Skipping {module['name']}:[/yellow] not checked out "
+                              f"(git submodule update --init {module['path']})")
+                continue
+
+            started = time.perf_counter()
+            matches, file_count, total_bytes = scan_repository(pool, root, args.jobs)
+            repository = project_repository(module["name"], module["url"])
+            cli_doc, sdk_doc = build_drafts(module["name"], root, repository, commit, matches)
+            elapsed = time.perf_counter() - started
+
+            header = (f"# DRAFT generated by scripts/scan_submodules.py from {module['path']} @ {commit}\n"
+                      f"# Review every entry before copying it into projects/{module['name']}/\n\n")
+            out_dir = args.output / module["name"]
+            write_draft(out_dir / "cli.draft.yaml", header, cli_doc)
+            write_draft(out_dir / "sdk.draft.yaml", header, sdk_doc)
+
+            table.add_row(module["name"], commit[:8], str(file_count), f"{total_bytes / 1e6:.1f}",
+                          str(len(matches)), str(len(cli_doc["invocations"])),
+                          str(len(sdk_doc["sdk_usage"])), f"{elapsed:.2f}")
+
+    console.print(table)
+    console.print(f"Drafts written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Replay the corpus's SDK usage patterns against the mock Messages API.
+
+Every sdk_usage whose pattern has a known request shape (PATTERN_SHAPES) is
+replayed as --sessions concurrent multi-turn conversations. All usages run
+at once through asyncio against one in-process mock_messages_api.py
+server, so they share its rate limits like clients sharing an API key.
+Prompt-caching usages expand into the variants their description names:
+continue's four caching strategies, aider's background cache warming.
+
+Per usage and variant the table shows request latency (p50/p99), time to
+first token for streamed requests, the share of input tokens read from the
+prompt cache, 429s seen, and the cost per conversation turn at list prices.
+Time is scaled so a run takes seconds: the cache TTL is --cache-ttl seconds
+instead of 5 minutes, and users pause between turns for exponentially
+distributed times averaging --think-ms (seeded, so runs are comparable), so
+some pauses outlive the cache and some do not.
+
+    ./scripts/sdk_replay_lab.py                              # every replayable usage
+    ./scripts/sdk_replay_lab.py --only prompt-caching --sessions 8 --turns 6
+    ./scripts/sdk_replay_lab.py --rpm 120 --itpm 400000      # with rate limits
+    ./scripts/sdk_replay_lab.py --json tmp/bench/sdk-replay.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from corpus_model import Project, SdkUsage, load_projects
+from mock_messages_api import MockConfig, MockMessagesAPI, add_config_arguments, config_from_args
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+
+MODEL = "claude-sonnet-4-5"
+# USD per million tokens (Sonnet list prices; cache writes are 5-minute writes)
+PRICES = {"input": 3.00, "cache_write": 3.75, "cache_read": 0.30, "output": 15.00}
+MAX_RETRIES = 2
+
+# Sizes of the replayed conversation, in characters (~4 per token)
+SYSTEM_CHARS = 10_000
+TOOL_CHARS = 600
+TOOL_COUNT = 8
+USER_TURN_CHARS = 1_200
+IMAGE_CHARS = 6_400
+
+# Streaming patterns share one shape
+STREAM = {"stream": True}
+
+# pattern -> base request shape; usages with other patterns are not replayed
+PATTERN_SHAPES: dict[str, dict[str, Any]] = {
+    "messages-create": {},
+    "completion": {},
+    "messages-stream": STREAM,
+    "messages-create-stream": STREAM,
+    "sse-streaming": STREAM,
+    "stream-events": STREAM,
+    "prompt-caching": {"tools": True, "cache": "optimized"},
+    "extended-thinking": {"stream": True, "thinking": 1024},
+    "thinking": {"stream": True, "thinking": 1024},
+    "thinking-tokens": {"stream": True, "thinking": 1024},
+    "tool-use": {"tools": True},
+    "vision": {"image": True},
+}
+
+# continue's strategies (AnthropicCachingStrategies.ts): where cache_control breakpoints go
+CACHE_STRATEGIES = ("none", "system", "system+tools", "optimized")
+
+
+@dataclass(slots=True)
+class Replay:
+    project: str
+    usage_id: str
+    pattern: str
+    variant: str
+    shape: dict[str, Any]
+    latencies: list[float] = field(default_factory=list)
+    ttfts: list[float] = field(default_factory=list)
+    usage: dict[str, int] = field(default_factory=lambda: dict.fromkeys(
+        ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens"), 0))
+    turns: int = 0
+    warmups: int = 0
+    rate_limited: int = 0
+    failed: int = 0
+
+
+def parameter_value(usage: SdkUsage, param: str) -> str | None:
+    return next((p.example_value for p in usage.parameters if p.name == param and p.example_value), None)
+
+
+def usage_variants(usage: SdkUsage) -> list[tuple[str, dict[str, Any]]]:
+    """(variant name, request shape) to replay for one sdk_usage."""
+    shape = dict(PATTERN_SHAPES[usage.pattern])
+    if (parameter_value(usage, "stream") or "").lower() == "true":
+        shape["stream"] = True
+    for param in ("max_tokens", "budget_tokens"):
+        value = parameter_value(usage, param)
+        if value and value.isdigit():
+            shape["thinking" if param == "budget_tokens" else param] = int(value)
+
+    if usage.pattern != "prompt-caching":
+        return [(usage.pattern, shape)]
+    description = (usage.description or "").lower()
+    variants = []
+    if "strateg" in description:
+        variants += [(f"cache: {strategy}", dict(shape, cache=strategy)) for strategy in CACHE_STRATEGIES]
+    else:
+        variants.append(("cache: optimized", shape))
+    if "warm" in description:
+        variants.append(("cache: optimized + warming", dict(shape, warm=True)))
+    return variants
+
+
+# ── Request shapes ───────────────────────────────────────────────────────────
+
+def filler(label: str, chars: int) -> str:
+    line = f"{label}: keep the repository map, coding conventions and tool docs in context. "
+    return (line * (chars // len(line) + 1))[:chars]
+
+
+def build_request(replay: Replay, session: int, history: list[dict[str, Any]], max_tokens: int = 0) -> dict[str, Any]:
+    shape = replay.shape
+    cache = shape.get("cache", "none")
+    ephemeral = {"type": "ephemeral"}
+    # The prefix is unique per replay and session, so nothing is shared across rows
+    prefix = f"{replay.project}/{replay.usage_id}/{replay.variant}/{session}"
+
+    system = [{"type": "text", "text": filler(f"system {prefix}", SYSTEM_CHARS)}]
+    if cache in ("system", "system+tools", "optimized"):
+        system[-1]["cache_control"] = ephemeral
+    body: dict[str, Any] = {"model": MODEL, "max_tokens": max_tokens or shape.get("max_tokens", 1024),
+                            "system": system, "messages": [dict(m) for m in history]}
+    if shape.get("tools"):
+        body["tools"] = [{"name": f"tool_{i}", "description": filler(f"tool {i} {prefix}", TOOL_CHARS),
+                          "input_schema": {"type": "object", "properties": {"path": {"type": "string"}}}}
+                         for i in range(TOOL_COUNT)]
+        if cache in ("system+tools", "optimized"):
+            body["tools"][-1]["cache_control"] = ephemeral
+    if cache == "optimized":
+        # Breakpoints on the last two user messages: the next turn reads the previous turn's prefix
+        user_turns = [m for m in body["messages"] if m["role"] == "user"][-2:]
+        for m in user_turns:
+            m["content"] = [*m["content"][:-1], dict(m["content"][-1], cache_control=ephemeral)]
+    if shape.get("thinking"):
+        body["thinking"] = {"type": "enabled", "budget_tokens": shape["thinking"]}
+        body["max_tokens"] = max(body["max_tokens"], shape["thinking"] + 1024)
+    if shape.get("stream"):
+        body["stream"] = True
+    return body
+
+
+def user_message(replay: Replay, turn: int) -> dict[str, Any]:
+    content = [{"type": "text", "text": filler(f"turn {turn}", USER_TURN_CHARS)}]
+    if replay.shape.get("image") and turn == 0:
+        content.insert(0, {"type": "image", "source": {"type": "base64", "media_type": "image/png",
+                                                         "data": "A" * IMAGE_CHARS}})
+    return {"role": "user", "content": content}
+
+
+# ── HTTP client ──────────────────────────────────────────────────────────────
+
+async def post_messages(port: int, body: dict[str, Any]) -> tuple[int, dict[str, str], dict[str, Any], float | None]:
+    """POST /v1/messages; returns status, headers, the (reassembled) message and time to first token."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode()
+    writer.write(f"POST /v1/messages HTTP/1.1\r\nhost: 127.0.0.1\r\ncontent-type: application/json\r\n"
+                 f"anthropic-version: 2023-06-01\r\ncontent-length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    try:
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if headers.get("content-type") != "text/event-stream":
+            return status, headers, json.loads(await reader.read()), None
+
+        message: dict[str, Any] = {}
+        text: list[str] = []
+        ttft = None
+        async for line in reader:
+            if not line.startswith(b"data: "):
+                continue
+            event = json.loads(line[6:])
+            if event["type"] == "message_start":
+                message = event["message"]
+            elif event["type"] == "content_block_delta" and event["delta"]["type"] == "text_delta":
+                ttft = ttft if ttft is not None else time.perf_counter() - started
+                text.append(event["delta"]["text"])
+            elif event["type"] == "message_delta":
+                message["usage"]["output_tokens"] = event["usage"]["output_tokens"]
+        message["content"] = [{"type": "text", "text": "".join(text)}]
+        return status, headers, message, ttft
+    finally:
+        writer.close()
+
+
+async def send(replay: Replay, port: int, body: dict[str, Any]) -> dict[str, Any] | None:
+    """Send with the SDK's retry behaviour on 429 (honouring retry-after); None if it still fails."""
+    for attempt in range(MAX_RETRIES + 1):
+        status, headers, message, ttft = await post_messages(port, body)
+        if status == 200:
+            for key, value in message["usage"].items():
+                replay.usage[key] = replay.usage.get(key, 0) + value
+            message["ttft"] = ttft
+            return message
+        if status != 429:
+            break
+        replay.rate_limited += 1
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(float(headers.get("retry-after", 1)))
+    replay.failed += 1
+    return None
+
+
+async def run_session(replay: Replay, session: int, port: int, turns: int, think: float, warm_every: float):
+    history: list[dict[str, Any]] = []
+    # Same pauses for the same session number in every replay
+    pauses = random.Random(session)
+    warming: asyncio.Task | None = None
+
+    async def keep_warm():
+        # aider's cache warming: a max_tokens=1 request re-reads (and so refreshes) the cached prefix
+        while True:
+            await asyncio.sleep(warm_every)
+            if await send(replay, port, build_request(replay, session, history, max_tokens=1)):
+                replay.warmups += 1
+
+    for turn in range(turns):
+        history.append(user_message(replay, turn))
+        started = time.perf_counter()
+        message = await send(replay, port, build_request(replay, session, history))
+        if message is None:
+            history.pop()
+            continue
+        replay.latencies.append(time.perf_counter() - started)
+        if message["ttft"] is not None:
+            replay.ttfts.append(message["ttft"])
+        replay.turns += 1
+        history.append({"role": "assistant", "content": [c for c in message["content"] if c["type"] == "text"]})
+        if turn < turns - 1:
+            if replay.shape.get("warm") and warming is None:
+                warming = asyncio.create_task(keep_warm())
+            await asyncio.sleep(pauses.expovariate(1 / think) if think > 0 else 0)
+    if warming:
+        warming.cancel()
+
+
+async def replay_all(replays: list[Replay], config: MockConfig, sessions: int, turns: int, think: float):
+    server = await MockMessagesAPI(config).start()
+    port = server.sockets[0].getsockname()[1]
+    # Warm a little more often than the TTL, like aider (every 5 minutes for a 5-minute cache, minus slack)
+    warm_every = config.cache_ttl_seconds * 0.9
+    async with server:
+        await asyncio.gather(*(run_session(r, s, port, turns, think, warm_every)
+                               for r in replays for s in range(sessions)))
+
+
+# ── Report ───────────────────────────────────────────────────────────────────
+
+def cost_usd(usage: dict[str, int]) -> float:
+    return (usage["input_tokens"] * PRICES["input"] + usage["cache_creation_input_tokens"] * PRICES["cache_write"]
+            + usage["cache_read_input_tokens"] * PRICES["cache_read"] + usage["output_tokens"] * PRICES["output"]) / 1e6
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(r: Replay) -> dict[str, Any]:
+    prompt = r.usage["input_tokens"] + r.usage["cache_creation_input_tokens"] + r.usage["cache_read_input_tokens"]
+    return {
+        "project": r.project,
+        "usage": r.usage_id,
+        "pattern": r.pattern,
+        "variant": r.variant,
+        "turns": r.turns,
+        "latency_ms_p50": round(percentile(r.latencies, 50) * 1000, 1) if r.latencies else None,
+        "latency_ms_p99": round(percentile(r.latencies, 99) * 1000, 1) if r.latencies else None,
+        "ttft_ms_p50": round(percentile(r.ttfts, 50) * 1000, 1) if r.ttfts else None,
+        "cache_read_share": round(r.usage["cache_read_input_tokens"] / prompt, 3) if prompt else 0.0,
+        "rate_limited": r.rate_limited,
+        "failed": r.failed,
+        "warmups": r.warmups,
+        # Warming requests are paid for, so they count towards the cost per turn
+        "cost_usd_per_turn": round(cost_usd(r.usage) / r.turns, 5) if r.turns else None,
+        "usage_tokens": r.usage,
+    }
+
+
+def print_table(rows: list[dict[str, Any]], sessions: int, turns: int):
+    def ms(value: float | None) -> str:
+        return f"{value:.0f}" if value is not None else "-"
+
+    table = Table(title=f"SDK patterns against the mock Messages API ({sessions} sessions x {turns} turns)")
+    table.add_column("Project", style="cyan")
+    table.add_column("Usage")
+    table.add_column("Variant")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    table.add_column("TTFT p50 (ms)", justify="right")
+    table.add_column("Cache read", justify="right")
+    table.add_column("429s", justify="right")
+    table.add_column("$/turn", justify="right")
+    for row in rows:
+        rate_limited = str(row["rate_limited"]) + (f" [red]({row['failed']} failed)[/red]" if row["failed"] else "")
+        table.add_row(row["project"], row["usage"], row["variant"], ms(row["latency_ms_p50"]),
+                      ms(row["latency_ms_p99"]), ms(row["ttft_ms_p50"]), f"{row['cache_read_share']:.0%}",
+                      rate_limited, f"{row['cost_usd_per_turn']:.4f}" if row["cost_usd_per_turn"] is not None else "-")
+    console.print(table)
+
+
+def collect_replays(projects: list[Project], only: str | None) -> tuple[list[Replay], int]:
+    replays, skipped = [], 0
+    for project in projects:
+        for usage in project.sdk.sdk_usage if project.sdk else []:
+            if usage.pattern not in PATTERN_SHAPES:
+                skipped += 1
+                continue
+            if only and only not in usage.pattern and only not in project.name:
+                continue
+            for variant, shape in usage_variants(usage):
+                replays.append(Replay(project.name, usage.id or "unknown", usage.pattern, variant, shape))
+    return replays, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay SDK usage patterns against a mock Messages API")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent conversations per usage and variant")
+    parser.add_argument("--turns", type=int, default=4, help="Turns per conversation")
+    parser.add_argument("--think-ms", type=float, default=4000, help="Mean pause between turns")
+    parser.add_argument("--only", help="Replay only usages whose pattern or project contains this text")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Also write the results as JSON")
+    add_config_arguments(parser)
+    # Scaled time: a 6 s TTL with 4 s mean pauses behaves like the 5-minute cache with a slow user
+    parser.set_defaults(cache_ttl_seconds=6.0)
+    args = parser.parse_args()
+
+    if args.sessions < 1 or args.turns < 1:
+        parser.error("--sessions and --turns must be at least 1")
+
+    projects = load_projects(PROJECTS_DIR, skip={"_template"})
+    replays, skipped = collect_replays(projects, args.only)
+    if not replays:
+        console.print("[yellow]No replayable SDK usages found.[/yellow]")
+        sys.exit(1)
+    console.print(f"Replaying {len(replays)} usage variant(s) "
+                  f"([dim]{skipped} usage(s) with patterns that have no request shape skipped[/dim])")
+
+    config = config_from_args(args)
+    started = time.perf_counter()
+    asyncio.run(replay_all(replays, config, args.sessions, args.turns, args.think_ms / 1000))
+    rows = [summarize(r) for r in replays]
+    print_table(rows, args.sessions, args.turns)
+    console.print(f"[dim]{time.perf_counter() - started:.1f} s, cache TTL {config.cache_ttl_seconds:g} s, "
+                  f"{args.think_ms:g} ms mean pause between turns[/dim]")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({
+            "model": MODEL,
+            "prices_usd_per_mtok": PRICES,
+            "mock": {name: getattr(config, name) for name in MockConfig.__slots__},
+            "sessions": args.sessions,
+            "turns": args.turns,
+            "think_ms": args.think_ms,
+            "results": rows,
+        }, indent=2) + "\n")
+        console.print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,660 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Search the free text of the corpus: YAML string values and notes.md files.
+
+Grepping projects/ also matches YAML keys and comments, and rereads every
+file per query. This script keeps a trigram index of the text instead, in
+SQLite (tmp/search.sqlite), and brings it up to date before each query:
+only files whose size, mtime and content hash changed are re-indexed.
+
+    ./scripts/search_corpus.py stream-json                       # a regex, like grep
+    ./scripts/search_corpus.py -i 'resume|continue' field:snippet
+    ./scripts/search_corpus.py -F 'os.environ["ANTHROPIC' project:cline project:aider
+    ./scripts/search_corpus.py 'max.?turns' field:notes.md --limit 5 --json
+    ./scripts/search_corpus.py --stats                          # index size, update only
+
+Filters: `project:NAME` and `field:NAME` (globs; repeat a filter to allow
+several values). A field is the YAML key holding the text (snippet,
+summary, notes, description, ...) or notes.md.
+
+How it works: every string value is one chunk (notes.md is split at its
+headings), and the index maps each trigram of the case-folded text to the
+chunks containing it. The regex is parsed into an AND/OR query of the
+trigrams any match must contain (literal runs, alternations, character
+classes of a few characters); chunks are narrowed from the rarest trigram
+up, probing the primary key once few candidates remain, and the regex is
+then run on the candidate lines only. Results are ranked by matching lines
+per chunk, weighted by field (summaries above snippets) and normalized by
+chunk length. Patterns without three consecutive known characters fall back
+to scanning every chunk.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import re._constants as sre_constants
+import re._parser as sre_parse
+import sqlite3
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from rich.text import Text
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+DEFAULT_INDEX = REPO_ROOT / "tmp" / "search.sqlite"
+
+SCHEMA_VERSION = 1
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+STR_TAG = "tag:yaml.org,2002:str"
+NOTES_FIELD = "notes.md"
+
+# Matching lines per chunk count more in short, descriptive fields
+FIELD_WEIGHTS = {
+    "summary": 3.0,
+    "description": 2.0,
+    "title": 2.0,
+    "claim": 2.0,
+    "purpose": 1.5,
+    "notes": 1.5,
+    NOTES_FIELD: 1.5,
+}
+# Below this many candidates, the remaining trigrams are probed by primary key
+PROBE_LIMIT = 2000
+# Literal alternatives tracked per regex node before giving up on exact strings
+MAX_EXACT = 16
+# Character classes up to this size become alternatives
+MAX_CLASS = 8
+SQL_BATCH = 500
+# Postings buffered before they are sorted and written
+FLUSH_POSTINGS = 1_000_000
+LINES_SHOWN = 3
+
+FILTER_RE = re.compile(r"^(project|field):(.+)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    project TEXT NOT NULL,
+    field TEXT NOT NULL,
+    location TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    line_step INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram INTEGER NOT NULL,
+    chunk INTEGER NOT NULL,
+    PRIMARY KEY (trigram, chunk)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trigram_counts (
+    trigram INTEGER PRIMARY KEY,
+    chunks INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_path ON chunks(path);
+CREATE INDEX IF NOT EXISTS idx_chunks_project ON chunks(project);
+CREATE INDEX IF NOT EXISTS idx_chunks_field ON chunks(field);
+"""
+
+
+@dataclass(slots=True)
+class Chunk:
+    """One indexed piece of text: a YAML string value or a notes.md section."""
+    field: str
+    location: str
+    # First line of the text in its file; line_step is 0 when the text's
+    # lines do not map onto file lines (folded or quoted scalars)
+    line: int
+    line_step: int
+    text: str
+
+
+@dataclass(slots=True)
+class Hit:
+    path: str
+    project: str
+    field: str
+    location: str
+    score: float
+    lines: list[tuple[int, str]] = field(default_factory=list)
+
+
+# ── Chunking ─────────────────────────────────────────────────────────────────
+
+def item_label(node: yaml.Node, position: int) -> str:
+    """List items are labelled by their id where they have one."""
+    if isinstance(node, yaml.MappingNode):
+        for key, value in node.value:
+            if key.value == "id" and isinstance(value, yaml.ScalarNode):
+                return value.value
+    return str(position)
+
+
+def yaml_chunks(content: str) -> Iterator[Chunk]:
+    """Every non-empty string value, with its key path; keys and comments are not text."""
+    def walk(node: yaml.Node, location: str, key: str) -> Iterator[Chunk]:
+        if isinstance(node, yaml.ScalarNode):
+            if node.tag == STR_TAG and node.value.strip():
+                block = node.style in ("|", ">")
+                yield Chunk(key, location, node.start_mark.line + (2 if block else 1), int(node.style == "|"),
+                            node.value.rstrip("\n"))
+        elif isinstance(node, yaml.MappingNode):
+            for k, v in node.value:
+                if isinstance(k, yaml.ScalarNode):
+                    yield from walk(v, f"{location}.{k.value}" if location else k.value, k.value)
+        elif isinstance(node, yaml.SequenceNode):
+            for i, item in enumerate(node.value):
+                yield from walk(item, f"{location}[{item_label(item, i)}]", key)
+
+    root = yaml.compose(content, Loader=YAML_LOADER)
+    if root is not None:
+        yield from walk(root, "", "")
+
+
+def notes_chunks(content: str) -> Iterator[Chunk]:
+    """notes.md split at its headings, so a hit points at a section."""
+    heading, start, lines = NOTES_FIELD, 1, []
+    for number, line in enumerate(content.split("\n"), 1):
+        if line.startswith("#"):
+            if "".join(lines).strip():
+                yield Chunk(NOTES_FIELD, heading, start, 1, "\n".join(lines).rstrip("\n"))
+            heading, start, lines = line.lstrip("#").strip() or NOTES_FIELD, number, []
+        lines.append(line)
+    if "".join(lines).strip():
+        yield Chunk(NOTES_FIELD, heading, start, 1, "\n".join(lines).rstrip("\n"))
+
+
+def file_chunks(file_name: str, content: str) -> list[Chunk]:
+    if file_name == NOTES_FIELD:
+        return list(notes_chunks(content))
+    return list(yaml_chunks(content))
+
+
+def trigrams(text: str) -> set[int]:
+    """The case-folded trigrams of each line, packed into 24 bits.
+
+    The packing is exact for ASCII; other trigrams may share a key, which only
+    adds candidates for the regex to reject.
+    """
+    grams: set[str] = set()
+    for line in text.casefold().split("\n"):
+        grams.update(line[i:i + 3] for i in range(len(line) - 2))
+    return {((ord(g[0]) << 16) ^ (ord(g[1]) << 8) ^ ord(g[2])) & 0xFFFFFF for g in grams}
+
+
+# ── Index maintenance ────────────────────────────────────────────────────────
+
+def connect(index_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(index_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    # Posting inserts touch pages all over the B-tree; a larger cache keeps them in memory
+    conn.execute("PRAGMA cache_size = -262144")
+    return conn
+
+
+def remove_index(index_path: Path):
+    for suffix in ("", "-wal", "-shm"):
+        index_path.with_name(index_path.name + suffix).unlink(missing_ok=True)
+
+
+def open_index(index_path: Path, projects_dir: Path, rebuild: bool = False) -> sqlite3.Connection:
+    """Open (and if needed create) the index; an index of another corpus is discarded."""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    if rebuild:
+        remove_index(index_path)
+
+    conn = connect(index_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    corpus = None
+    if version == SCHEMA_VERSION:
+        row = conn.execute("SELECT value FROM settings WHERE key = 'projects_dir'").fetchone()
+        corpus = row[0] if row else None
+    if version not in (0, SCHEMA_VERSION) or (version and corpus != str(projects_dir)):
+        conn.close()
+        remove_index(index_path)
+        conn = connect(index_path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT OR REPLACE INTO settings VALUES ('projects_dir', ?)", (str(projects_dir),))
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+    return conn
+
+
+def corpus_files(projects_dir: Path) -> dict[str, tuple[int, int]]:
+    """{project/file: (mtime_ns, size)} for every YAML and notes.md file."""
+    files = {}
+    with os.scandir(projects_dir) as projects:
+        for project in projects:
+            if not project.is_dir() or project.name.startswith("_"):
+                continue
+            with os.scandir(project.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".yaml") or entry.name == NOTES_FIELD:
+                        st = entry.stat()
+                        files[f"{project.name}/{entry.name}"] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+@dataclass(slots=True)
+class PendingWrites:
+    """New postings and trigram count changes, buffered across files."""
+    postings: list[tuple[int, int]] = field(default_factory=list)
+    counts: Counter[int] = field(default_factory=Counter)
+
+
+def flush(conn: sqlite3.Connection, pending: PendingWrites):
+    # Inserting in key order keeps the posting B-tree writes local
+    pending.postings.sort()
+    conn.executemany("INSERT INTO postings VALUES (?, ?)", pending.postings)
+    conn.executemany(
+        "INSERT INTO trigram_counts VALUES (?, ?) ON CONFLICT(trigram) DO UPDATE SET chunks = chunks + excluded.chunks",
+        ((g, n) for g, n in pending.counts.items() if n),
+    )
+    pending.postings.clear()
+    pending.counts.clear()
+
+
+def remove_file(conn: sqlite3.Connection, path: str, pending: PendingWrites):
+    """Drop a file's chunks, their postings and their share of the trigram counts."""
+    postings: list[tuple[int, int]] = []
+    for chunk, text in conn.execute("SELECT id, text FROM chunks WHERE path = ?", (path,)).fetchall():
+        grams = trigrams(text)
+        postings += ((g, chunk) for g in grams)
+        pending.counts.subtract(grams)
+    conn.executemany("DELETE FROM postings WHERE trigram = ? AND chunk = ?", postings)
+    conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+
+def index_file(conn: sqlite3.Connection, path: str, raw: bytes, mtime_ns: int, pending: PendingWrites) -> int:
+    """Add a file's chunks, buffering their postings; returns the number of chunks."""
+    project, file_name = path.split("/", 1)
+    conn.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                 (path, project, mtime_ns, len(raw), hashlib.sha256(raw).hexdigest()))
+    try:
+        chunks = file_chunks(file_name, raw.decode(errors="replace"))
+    except yaml.YAMLError as e:
+        console.print(f"[yellow]Not indexed, YAML parse error in {escape(path)}:[/yellow] {escape(str(e))}")
+        return 0
+
+    for c in chunks:
+        chunk = conn.execute(
+            "INSERT INTO chunks (path, project, field, location, line, line_step, text) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, project, c.field, c.location, c.line, c.line_step, c.text),
+        ).lastrowid
+        grams = trigrams(c.text)
+        pending.postings += ((g, chunk) for g in grams)
+        pending.counts.update(grams)
+    return len(chunks)
+
+
+def update_index(conn: sqlite3.Connection, projects_dir: Path) -> tuple[int, int, int]:
+    """Bring the index in sync with the corpus. Returns (indexed, unchanged, removed) files."""
+    indexed = unchanged = removed = 0
+    current = corpus_files(projects_dir)
+    stored = {path: (mtime_ns, size, sha) for path, mtime_ns, size, sha
+              in conn.execute("SELECT path, mtime_ns, size, sha256 FROM files")}
+    pending = PendingWrites()
+
+    with conn:
+        for path, (mtime_ns, size) in sorted(current.items()):
+            old = stored.get(path)
+            if old and old[:2] == (mtime_ns, size):
+                unchanged += 1
+                continue
+            raw = (projects_dir / path).read_bytes()
+            if old and old[1] == len(raw) and hashlib.sha256(raw).hexdigest() == old[2]:
+                # Touched but unchanged
+                conn.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (mtime_ns, path))
+                unchanged += 1
+                continue
+            if old:
+                remove_file(conn, path, pending)
+            index_file(conn, path, raw, mtime_ns, pending)
+            indexed += 1
+            if len(pending.postings) >= FLUSH_POSTINGS:
+                flush(conn, pending)
+
+        for path in sorted(stored.keys() - current.keys()):
+            remove_file(conn, path, pending)
+            removed += 1
+        flush(conn, pending)
+        if indexed or removed:
+            conn.execute("DELETE FROM trigram_counts WHERE chunks <= 0")
+
+    return indexed, unchanged, removed
+
+
+# ── Regex to trigram query ───────────────────────────────────────────────────
+#
+# A query is None (no constraint), a packed trigram, or ("and" | "or", [queries]).
+
+@dataclass(slots=True)
+class Info:
+    """What every match of a regex node contains: exact strings, or else a query."""
+    exact: set[str] | None
+    query: Any = None
+
+
+def and_query(a: Any, b: Any) -> Any:
+    parts: list[Any] = []
+    for q in (a, b):
+        if isinstance(q, tuple) and q[0] == "and":
+            parts += q[1]
+        elif q is not None:
+            parts.append(q)
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else ("and", parts)
+
+
+def or_query(queries: list[Any]) -> Any:
+    return None if any(q is None for q in queries) else ("or", queries)
+
+
+def exact_query(strings: set[str]) -> Any:
+    """Each match contains one of the strings, so all trigrams of one of them."""
+    alternatives = []
+    for s in strings:
+        grams = trigrams(s)
+        if not grams:
+            return None
+        alternatives.append(("and", sorted(grams)) if len(grams) > 1 else next(iter(grams)))
+    return alternatives[0] if len(alternatives) == 1 else or_query(alternatives)
+
+
+def to_query(info: Info) -> Any:
+    return and_query(info.query, exact_query(info.exact)) if info.exact is not None else info.query
+
+
+def concat(a: Info, b: Info) -> Info:
+    if b.exact is None:
+        return Info(None, and_query(to_query(a), b.query))
+    if a.exact is not None and len(a.exact) * len(b.exact) <= MAX_EXACT:
+        return Info({x + y for x in a.exact for y in b.exact}, and_query(a.query, b.query))
+    # Keep what `a` requires and start a new run of exact strings at `b`
+    return Info(b.exact, and_query(to_query(a), b.query))
+
+
+def analyze(pattern: sre_parse.SubPattern | list) -> Info:
+    info = Info({""})
+    for op, arg in pattern:
+        info = concat(info, analyze_node(op, arg))
+    return info
+
+
+def analyze_node(op: Any, arg: Any) -> Info:
+    c = sre_constants
+    if op is c.LITERAL:
+        return Info({chr(arg).casefold()})
+    if op is c.IN and len(arg) <= MAX_CLASS and all(o is c.LITERAL for o, _ in arg):
+        return Info({chr(v).casefold() for _, v in arg})
+    if op is c.SUBPATTERN:
+        return analyze(arg[-1])
+    if op is c.BRANCH:
+        branches = [analyze(b) for b in arg[1]]
+        if all(b.exact is not None and b.query is None for b in branches):
+            strings = set().union(*(b.exact for b in branches))
+            if len(strings) <= MAX_EXACT:
+                return Info(strings)
+        return Info(None, or_query([to_query(b) for b in branches]))
+    if op in (c.MAX_REPEAT, c.MIN_REPEAT, getattr(c, "POSSESSIVE_REPEAT", None)):
+        low, high, sub = arg
+        if low == 0:
+            return Info(None)
+        inner = analyze(sub)
+        return inner if low == high == 1 else Info(None, to_query(inner))
+    if op in (c.AT, c.ASSERT, c.ASSERT_NOT):
+        # Zero-width: consumes nothing, so the strings around it stay adjacent
+        return Info({""})
+    return Info(None)
+
+
+def regex_query(pattern: str) -> Any:
+    return to_query(analyze(sre_parse.parse(pattern)))
+
+
+# ── Searching ────────────────────────────────────────────────────────────────
+
+def filter_clause(column: str, values: list[str]) -> tuple[str, list[str]]:
+    terms = [f"{column} GLOB ?" if any(ch in v for ch in "*?[") else f"{column} = ?" for v in values]
+    return "(" + " OR ".join(terms) + ")", values
+
+
+def filtered_chunks(conn: sqlite3.Connection, projects: list[str], fields: list[str]) -> set[int] | None:
+    if not projects and not fields:
+        return None
+    clauses, params = [], []
+    for column, values in (("project", projects), ("field", fields)):
+        if values:
+            clause, values = filter_clause(column, values)
+            clauses.append(clause)
+            params += values
+    return {row[0] for row in conn.execute(f"SELECT id FROM chunks WHERE {' AND '.join(clauses)}", params)}
+
+
+def batches(ids: list[int]) -> Iterator[list[int]]:
+    for start in range(0, len(ids), SQL_BATCH):
+        yield ids[start:start + SQL_BATCH]
+
+
+def posting_list(conn: sqlite3.Connection, trigram: int, within: set[int] | None) -> set[int]:
+    if within is not None and len(within) <= PROBE_LIMIT:
+        found: set[int] = set()
+        for batch in batches(sorted(within)):
+            found.update(row[0] for row in conn.execute(
+                f"SELECT chunk FROM postings WHERE trigram = ? AND chunk IN ({','.join('?' * len(batch))})",
+                (trigram, *batch)))
+        return found
+    chunks = {row[0] for row in conn.execute("SELECT chunk FROM postings WHERE trigram = ?", (trigram,))}
+    return chunks if within is None else chunks & within
+
+
+def evaluate(conn: sqlite3.Connection, query: Any, within: set[int] | None,
+             counts: dict[int, int]) -> set[int] | None:
+    """Chunks (among `within`) that can match; None when the query does not narrow `within`."""
+    if query is None:
+        return within
+    if isinstance(query, int):
+        return posting_list(conn, query, within) if counts.get(query) else set()
+    op, parts = query
+    if op == "and":
+        # Rarest trigrams first; sub-queries (alternations) after the plain trigrams
+        parts = sorted(parts, key=lambda q: (not isinstance(q, int), counts.get(q, 0) if isinstance(q, int) else 0))
+        for part in parts:
+            within = evaluate(conn, part, within, counts)
+            if within is not None and not within:
+                break
+        return within
+    results = [evaluate(conn, part, within, counts) for part in parts]
+    if any(r is None for r in results):
+        return within
+    return set().union(*results)
+
+
+def query_trigrams(query: Any) -> set[int]:
+    if query is None:
+        return set()
+    if isinstance(query, int):
+        return {query}
+    return set().union(*(query_trigrams(q) for q in query[1]))
+
+
+def search(conn: sqlite3.Connection, regex: re.Pattern, projects: list[str],
+           fields: list[str]) -> tuple[list[Hit], int, bool]:
+    """Ranked hits, the number of chunks verified, and whether the trigram index was used."""
+    query = regex_query(regex.pattern)
+    within = filtered_chunks(conn, projects, fields)
+    grams = sorted(query_trigrams(query))
+    counts: dict[int, int] = {}
+    for batch in batches(grams):
+        counts.update(conn.execute(
+            f"SELECT trigram, chunks FROM trigram_counts WHERE trigram IN ({','.join('?' * len(batch))})", batch))
+    candidates = evaluate(conn, query, within, counts)
+
+    columns = "id, path, project, field, location, line, line_step, text"
+    if candidates is None:
+        rows: Iterator[tuple] = iter(conn.execute(f"SELECT {columns} FROM chunks"))
+    else:
+        rows = (row for batch in batches(sorted(candidates)) for row in conn.execute(
+            f"SELECT {columns} FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch))
+
+    hits: list[Hit] = []
+    verified = 0
+    for _, path, project, field_name, location, line, line_step, text in rows:
+        verified += 1
+        lines = text.split("\n")
+        matched = [(line + i * line_step, ln) for i, ln in enumerate(lines) if regex.search(ln)]
+        if matched:
+            score = FIELD_WEIGHTS.get(field_name, 1.0) * len(matched) / math.sqrt(len(lines))
+            hits.append(Hit(path, project, field_name, location, score, matched))
+    hits.sort(key=lambda h: (-h.score, h.path, h.lines[0][0]))
+    return hits, verified, query is not None
+
+
+def index_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    def count(table: str) -> int:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    return {
+        "files": count("files"),
+        "chunks": count("chunks"),
+        "lines": conn.execute("SELECT COALESCE(SUM(LENGTH(text) - LENGTH(REPLACE(text, char(10), '')) + 1), 0) "
+                              "FROM chunks").fetchone()[0],
+        "trigrams": count("trigram_counts"),
+        "postings": count("postings"),
+    }
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def print_hits(hits: list[Hit], regex: re.Pattern, projects_dir: Path):
+    for hit in hits:
+        first = hit.lines[0][0]
+        console.print(f"[cyan]{escape(f'{projects_dir.name}/{hit.path}:{first}')}[/cyan]  "
+                      f"[dim]{escape(hit.location)}[/dim]")
+        for number, line in hit.lines[:LINES_SHOWN]:
+            text = Text(f"  {number:>6} │ ", style="dim")
+            content = Text(line.strip()[:200])
+            content.highlight_regex(regex, "bold yellow")
+            console.print(text + content)
+        if len(hit.lines) > LINES_SHOWN:
+            console.print(f"  [dim]... {len(hit.lines) - LINES_SHOWN} more matching line(s)[/dim]")
+
+
+def print_stats(stats: dict[str, int], index_path: Path):
+    table = Table(title="Search index")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    for key, value in stats.items():
+        table.add_row(key.capitalize(), f"{value:,}")
+    size = sum(p.stat().st_size for p in (index_path, index_path.with_name(index_path.name + "-wal")) if p.exists())
+    table.add_row("Size", f"{size / 2**20:.1f} MiB")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trigram-indexed search over the corpus's free text")
+    parser.add_argument("query", nargs="*", help="Regex to search for, plus project:NAME / field:NAME filters")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="Case-insensitive match")
+    parser.add_argument("-F", "--fixed-strings", action="store_true", help="Treat the query as literal text")
+    parser.add_argument("--limit", "-n", type=int, default=20, help="Chunks listed, best first (0: all)")
+    parser.add_argument("--json", action="store_true", help="Print the hits as JSON")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX, help="Index path (default: tmp/search.sqlite)")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the index and re-index everything")
+    parser.add_argument("--no-update", action="store_true", help="Query the index as is, without checking files")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics")
+    args = parser.parse_args()
+
+    projects, fields, terms = [], [], []
+    for token in args.query:
+        m = FILTER_RE.match(token)
+        if m:
+            (projects if m.group(1) == "project" else fields).append(m.group(2))
+        else:
+            terms.append(token)
+    if not terms and not args.stats:
+        parser.error("nothing to search for")
+    pattern = " ".join(terms)
+    try:
+        regex = re.compile(re.escape(pattern) if args.fixed_strings else pattern,
+                           re.IGNORECASE if args.ignore_case else 0)
+    except re.error as e:
+        parser.error(f"invalid regex: {e}")
+
+    conn = open_index(args.index, PROJECTS_DIR, rebuild=args.rebuild)
+    if not args.no_update:
+        started = time.perf_counter()
+        indexed, unchanged, removed = update_index(conn, PROJECTS_DIR)
+        if (indexed or removed) and not args.json:
+            elapsed = (time.perf_counter() - started) * 1000
+            console.print(f"[dim]Index updated: {indexed} file(s) indexed, {unchanged} unchanged, "
+                          f"{removed} removed ({elapsed:.0f} ms)[/dim]")
+    if args.stats:
+        print_stats(index_stats(conn), args.index)
+    if not terms:
+        conn.close()
+        return
+
+    started = time.perf_counter()
+    hits, verified, indexed_query = search(conn, regex, projects, fields)
+    elapsed = (time.perf_counter() - started) * 1000
+    conn.close()
+    total = len(hits)
+    hits = hits[:args.limit] if args.limit else hits
+
+    if args.json:
+        print(json.dumps([
+            {"path": h.path, "project": h.project, "field": h.field, "location": h.location,
+             "score": round(h.score, 3), "lines": [{"line": n, "text": t} for n, t in h.lines]}
+            for h in hits
+        ], indent=2))
+        return
+
+    if not indexed_query:
+        console.print("[yellow]No three-character literal to look up: scanned every chunk[/yellow]")
+    print_hits(hits, regex, PROJECTS_DIR)
+    shown = f", showing {len(hits)}" if len(hits) < total else ""
+    console.print(f"[dim]{total} matching chunk(s){shown}; {verified} candidate(s) verified in {elapsed:.1f} ms[/dim]")
+    if not total:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
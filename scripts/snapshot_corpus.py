@@ -0,0 +1,332 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Write the parsed corpus into one memory-mappable snapshot file.
+
+Parsing thousands of YAML files dominates every cold start of the status
+and report scripts. A snapshot stores the parsed documents once, in a
+binary layout that is read through mmap without deserializing the whole
+file: opening it costs a header read, and a command decodes only the
+project records (and the sections of a record) it actually touches.
+
+    ./scripts/snapshot_corpus.py                        # -> tmp/corpus.snapshot
+    ./scripts/snapshot_corpus.py -o /tmp/c.snapshot -j 16
+    ./scripts/snapshot_corpus.py --info                 # header, counts, sizes
+
+    ./scripts/research_status.py --snapshot tmp/corpus.snapshot --project goose
+    ./scripts/regenerate_comparison_tables_and_reports.py --snapshot tmp/corpus.snapshot
+
+The snapshot is a point-in-time copy of projects/ (or KB_PROJECTS_DIR):
+re-run this script after editing project files.
+
+Layout (little endian):
+
+    header      magic, version, project/string counts, section offsets
+    strings     (count + 1) u64 offsets, then the UTF-8 data of every distinct string
+    index       per project, sorted by name: name string id u32, record offset u64, length u32
+    records     per project: SECTIONS u32 offsets (relative to the record), then
+                one encoded value per section
+
+Values are tagged: None/False/True, i64, f64, string id (u32), list and map
+(u32 length; map keys are string ids). Every string, including map keys,
+is stored once in the string table.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+
+from corpus_model import Project, load_documents
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+DEFAULT_OUTPUT = REPO_ROOT / "tmp" / "corpus.snapshot"
+
+MAGIC = b"KBCORPUS"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIQQQQd")
+INDEX_ENTRY = struct.Struct("<IQI")
+STRING_OFFSET = struct.Struct("<Q")
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+
+# Record sections, in storage order
+SECTIONS = ("metadata", "cli", "sdk", "code_references", "notes", "files")
+RECORD_HEADER = struct.Struct(f"<{len(SECTIONS)}I")
+
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_LIST, TAG_MAP = range(8)
+
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+def load_sections(project_dir: Path) -> tuple[str, dict[str, Any]]:
+    """Parse one project directory into its snapshot sections (runs in a worker)."""
+    sections = load_documents(project_dir)
+    sections["files"] = [f.name for f in project_dir.glob("*.yaml")]
+    return project_dir.name, sections
+
+
+# ── Writing ──────────────────────────────────────────────────────────────────
+
+class SnapshotWriter:
+    def __init__(self):
+        self.string_ids: dict[str, int] = {}
+        self.records = bytearray()
+        self.index: list[tuple[str, int, int]] = []
+
+    def string_id(self, value: str) -> int:
+        sid = self.string_ids.get(value)
+        if sid is None:
+            sid = self.string_ids[value] = len(self.string_ids)
+        return sid
+
+    def encode(self, value: Any, out: bytearray):
+        if value is None:
+            out.append(TAG_NONE)
+        elif value is True:
+            out.append(TAG_TRUE)
+        elif value is False:
+            out.append(TAG_FALSE)
+        elif isinstance(value, int) and -2**63 <= value < 2**63:
+            out.append(TAG_INT)
+            out += I64.pack(value)
+        elif isinstance(value, float):
+            out.append(TAG_FLOAT)
+            out += F64.pack(value)
+        elif isinstance(value, list):
+            out.append(TAG_LIST)
+            out += U32.pack(len(value))
+            for item in value:
+                self.encode(item, out)
+        elif isinstance(value, dict):
+            out.append(TAG_MAP)
+            out += U32.pack(len(value))
+            for key, item in value.items():
+                out += U32.pack(self.string_id(str(key)))
+                self.encode(item, out)
+        else:
+            # Strings, and scalars YAML parses into other types (dates): stored as
+            # str(), which is what corpus_model.text() would turn them into anyway
+            out.append(TAG_STR)
+            out += U32.pack(self.string_id(value if isinstance(value, str) else str(value)))
+
+    def add(self, name: str, sections: dict[str, Any]):
+        record = bytearray(RECORD_HEADER.size)
+        offsets = []
+        for section in SECTIONS:
+            offsets.append(len(record))
+            self.encode(sections[section], record)
+        RECORD_HEADER.pack_into(record, 0, *offsets)
+        self.index.append((name, len(self.records), len(record)))
+        self.records += record
+
+    def write(self, path: Path):
+        self.index.sort()
+        name_ids = [self.string_id(name) for name, _, _ in self.index]
+        strings = [s.encode("utf-8") for s in self.string_ids]
+
+        string_offsets_pos = HEADER.size
+        string_data_pos = string_offsets_pos + STRING_OFFSET.size * (len(strings) + 1)
+        string_data_size = sum(map(len, strings))
+        index_pos = string_data_pos + string_data_size
+        records_pos = index_pos + INDEX_ENTRY.size * len(self.index)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.index), len(strings),
+                                string_offsets_pos, string_data_pos, index_pos, records_pos, time.time()))
+            offset = 0
+            offsets = bytearray()
+            for s in strings:
+                offsets += STRING_OFFSET.pack(offset)
+                offset += len(s)
+            offsets += STRING_OFFSET.pack(offset)
+            f.write(offsets)
+            f.write(b"".join(strings))
+            f.write(b"".join(INDEX_ENTRY.pack(name_id, offset, length)
+                             for name_id, (_, offset, length) in zip(name_ids, self.index)))
+            f.write(self.records)
+        tmp_path.replace(path)
+
+
+def write_snapshot(output: Path, jobs: int | None = None) -> tuple[int, int]:
+    """Snapshot every project directory; returns (projects, distinct strings)."""
+    # Imported here: readers of the snapshot should not pay for it at startup
+    from concurrent.futures import ProcessPoolExecutor
+
+    project_dirs = sorted(d for d in PROJECTS_DIR.iterdir() if d.is_dir()) if PROJECTS_DIR.exists() else []
+    writer = SnapshotWriter()
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 4) as pool:
+        for name, sections in pool.map(load_sections, project_dirs, chunksize=64):
+            writer.add(name, sections)
+    writer.write(output)
+    return len(project_dirs), len(writer.string_ids)
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+class CorpusSnapshot:
+    """Read-only, lazily decoded view of a snapshot file.
+
+    Projects are addressed by their position in the name-sorted index;
+    find() maps a name to that position with a binary search.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buf) < HEADER.size:
+            raise ValueError(f"{path}: not a corpus snapshot")
+        (magic, version, self.project_count, self.string_count, self.string_offsets_pos,
+         self.string_data_pos, self.index_pos, self.records_pos, self.created) = HEADER.unpack_from(self.buf)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a corpus snapshot")
+        if version != VERSION:
+            raise ValueError(f"{path}: snapshot version {version}, expected {VERSION}; re-run snapshot_corpus.py")
+        self._strings: dict[int, str] = {}
+
+    def close(self):
+        self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return self.project_count
+
+    def string(self, sid: int) -> str:
+        value = self._strings.get(sid)
+        if value is None:
+            start, end = struct.unpack_from("<QQ", self.buf, self.string_offsets_pos + sid * STRING_OFFSET.size)
+            base = self.string_data_pos
+            value = self._strings[sid] = sys.intern(str(self.buf[base + start:base + end], "utf-8"))
+        return value
+
+    def entry(self, i: int) -> tuple[int, int, int]:
+        return INDEX_ENTRY.unpack_from(self.buf, self.index_pos + i * INDEX_ENTRY.size)
+
+    def name(self, i: int) -> str:
+        return self.string(self.entry(i)[0])
+
+    def names(self) -> list[str]:
+        return [self.name(i) for i in range(self.project_count)]
+
+    def find(self, name: str) -> int | None:
+        i = bisect_left(range(self.project_count), name, key=self.name)
+        return i if i < self.project_count and self.name(i) == name else None
+
+    def decode(self, pos: int) -> tuple[Any, int]:
+        buf = self.buf
+        tag = buf[pos]
+        pos += 1
+        if tag == TAG_STR:
+            return self.string(U32.unpack_from(buf, pos)[0]), pos + 4
+        if tag == TAG_MAP:
+            count = U32.unpack_from(buf, pos)[0]
+            pos += 4
+            value = {}
+            for _ in range(count):
+                key = self.string(U32.unpack_from(buf, pos)[0])
+                value[key], pos = self.decode(pos + 4)
+            return value, pos
+        if tag == TAG_LIST:
+            count = U32.unpack_from(buf, pos)[0]
+            pos += 4
+            value = []
+            for _ in range(count):
+                item, pos = self.decode(pos)
+                value.append(item)
+            return value, pos
+        if tag == TAG_INT:
+            return I64.unpack_from(buf, pos)[0], pos + 8
+        if tag == TAG_FLOAT:
+            return F64.unpack_from(buf, pos)[0], pos + 8
+        if tag == TAG_NONE:
+            return None, pos
+        if tag == TAG_TRUE:
+            return True, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        raise ValueError(f"{self.path}: corrupt value tag {tag} at offset {pos - 1}")
+
+    def section(self, i: int, section: str) -> Any:
+        """Decode one section of project i (see SECTIONS) without touching the others."""
+        record = self.records_pos + self.entry(i)[1]
+        offset = RECORD_HEADER.unpack_from(self.buf, record)[SECTIONS.index(section)]
+        return self.decode(record + offset)[0]
+
+    def project(self, i: int) -> Project:
+        return Project.from_documents(
+            self.name(i),
+            metadata=self.section(i, "metadata"),
+            cli=self.section(i, "cli"),
+            sdk=self.section(i, "sdk"),
+            code_references=self.section(i, "code_references"),
+            notes=self.section(i, "notes"),
+        )
+
+    def projects(self) -> list[Project]:
+        return [self.project(i) for i in range(self.project_count)]
+
+
+def print_info(path: Path):
+    with CorpusSnapshot(path) as snapshot:
+        console.print(f"[bold]{path}[/bold] (version {VERSION}, "
+                      f"written {datetime.fromtimestamp(snapshot.created):%Y-%m-%d %H:%M:%S})")
+        console.print(f"  Projects: {snapshot.project_count}")
+        console.print(f"  Strings: {snapshot.string_count} "
+                      f"({(snapshot.index_pos - snapshot.string_offsets_pos) / 2**20:.1f} MiB)")
+        console.print(f"  Records: {(len(snapshot.buf) - snapshot.records_pos) / 2**20:.1f} MiB")
+        console.print(f"  Total: {len(snapshot.buf) / 2**20:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a memory-mappable snapshot of the corpus")
+    parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
+                        help="Snapshot path (default: tmp/corpus.snapshot)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Worker processes")
+    parser.add_argument("--info", action="store_true", help="Describe an existing snapshot instead of writing one")
+    args = parser.parse_args()
+
+    if args.info:
+        try:
+            print_info(args.output)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]{e}[/red]")
+            sys.exit(1)
+        return
+
+    started = time.perf_counter()
+    projects, strings = write_snapshot(args.output, args.jobs)
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Wrote:[/green] {args.output} ({projects} projects, {strings} distinct strings, "
+                  f"{args.output.stat().st_size / 2**20:.1f} MiB, {elapsed:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Group near-identical code snippets across the corpus.
+
+Many projects copy the same cookbook patterns, so the `snippet` bodies of
+CLI invocations and SDK usages repeat from project to project. This module
+clusters them and picks one canonical snippet per cluster; the project pages
+render the other members as "same as X" links instead of repeating the code.
+
+    ./scripts/snippet_clusters.py                     # cluster counts and size saved
+    ./scripts/snippet_clusters.py --top 20            # also list the largest clusters
+    ./scripts/snippet_clusters.py --json tmp/snippet-clusters.json
+
+How it scales: identical snippets (after whitespace normalization) are
+grouped by a dict lookup first. Each distinct text then gets a MinHash
+signature (one-permutation hashing: every token shingle is hashed once and
+kept as the minimum of one of SIGNATURE_BINS bins), and signatures are
+bucketed by bands (LSH). Each bucket member is compared against the bucket's
+first member only, so the whole pass is linear in the number of snippets.
+Candidate pairs are confirmed against SIMILARITY_THRESHOLD before they are
+merged, and chained members that end up below the threshold against the
+canonical snippet are left on their own.
+
+Watch mode keeps a ClusterInputs between passes: each project's normalized
+snippets and each distinct text's signature are computed once, so after an
+edit only the edited projects' snippets are normalized and hashed again.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from corpus_model import Project, load_projects
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+
+# Snippets shorter than this (normalized) are cheaper to repeat than to link
+MIN_SNIPPET_CHARS = 80
+SHINGLE_TOKENS = 4
+SIGNATURE_BINS = 64
+BAND_ROWS = 4
+SIMILARITY_THRESHOLD = 0.8
+EMPTY_BIN = -1
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# (project, kind, id), kind being "invocation" or "sdk_usage"
+SnippetKey = tuple[str, str, str]
+
+
+@dataclass(slots=True, frozen=True)
+class Duplicate:
+    """A snippet that pages render as a link to its cluster's canonical snippet."""
+    canonical: SnippetKey
+    similarity: float
+    identical: bool
+
+
+def normalize(snippet: str) -> str:
+    return " ".join(snippet.split())
+
+
+def iter_snippets(projects: list[Project]) -> Iterator[tuple[SnippetKey, str]]:
+    """(key, snippet) for every invocation and SDK usage snippet, in corpus order."""
+    for project in projects:
+        if project.cli:
+            for inv in project.cli.invocations:
+                if inv.snippet:
+                    yield (project.name, "invocation", inv.id or "unknown"), inv.snippet
+        if project.sdk:
+            for usage in project.sdk.sdk_usage:
+                if usage.snippet:
+                    yield (project.name, "sdk_usage", usage.id or "unknown"), usage.snippet
+
+
+def project_texts(project: Project) -> list[tuple[SnippetKey, str]]:
+    """(key, normalized snippet) for the project's snippets long enough to link."""
+    return [(key, text) for key, snippet in iter_snippets([project])
+            if len(text := normalize(snippet)) >= MIN_SNIPPET_CHARS]
+
+
+class ClusterInputs:
+    """Per-project normalized snippets and per-text signatures, reused across cluster_snippets() calls."""
+
+    __slots__ = ("texts", "signatures")
+
+    def __init__(self):
+        self.texts: dict[str, list[tuple[SnippetKey, str]]] = {}
+        self.signatures: dict[str, tuple[int, ...]] = {}
+
+    def project_texts(self, project: Project) -> list[tuple[SnippetKey, str]]:
+        texts = self.texts.get(project.name)
+        if texts is None:
+            texts = self.texts[project.name] = project_texts(project)
+        return texts
+
+    def forget(self, name: str):
+        """Drop a project's snippets after it was edited or removed."""
+        self.texts.pop(name, None)
+
+
+def signature(text: str) -> tuple[int, ...]:
+    """One-permutation MinHash signature of the token shingles of a normalized snippet."""
+    tokens = TOKEN_RE.findall(text)
+    bins = [EMPTY_BIN] * SIGNATURE_BINS
+    for i in range(max(len(tokens) - SHINGLE_TOKENS + 1, 1)):
+        shingle = " ".join(tokens[i:i + SHINGLE_TOKENS])
+        h = int.from_bytes(blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        b, value = h % SIGNATURE_BINS, h // SIGNATURE_BINS
+        if bins[b] == EMPTY_BIN or value < bins[b]:
+            bins[b] = value
+    return tuple(bins)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: agreeing bins among the bins either signature fills."""
+    filled = agree = 0
+    for x, y in zip(a, b):
+        if x != EMPTY_BIN or y != EMPTY_BIN:
+            filled += 1
+            agree += x == y
+    return agree / filled if filled else 1.0
+
+
+def cluster_snippets(projects: list[Project], threshold: float = SIMILARITY_THRESHOLD,
+                     inputs: ClusterInputs | None = None) -> dict[SnippetKey, Duplicate]:
+    """Map every non-canonical snippet in a cluster to its canonical snippet."""
+    # Exact duplicates share one distinct text
+    keys_by_text: dict[str, list[SnippetKey]] = {}
+    for project in projects:
+        for key, text in inputs.project_texts(project) if inputs else project_texts(project):
+            keys_by_text.setdefault(text, []).append(key)
+    texts = list(keys_by_text)
+    if inputs:
+        known = inputs.signatures
+        signatures = [known.get(t) or signature(t) for t in texts]
+        # Only the texts still in the corpus stay cached
+        inputs.signatures = dict(zip(texts, signatures))
+    else:
+        signatures = [signature(t) for t in texts]
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: dict[tuple[int, tuple[int, ...]], int] = {}
+    for i, sig in enumerate(signatures):
+        for start in range(0, SIGNATURE_BINS, BAND_ROWS):
+            band = sig[start:start + BAND_ROWS]
+            # Bands no shingle landed in say nothing about similarity
+            if all(v == EMPTY_BIN for v in band):
+                continue
+            first = buckets.setdefault((start, band), i)
+            if first == i:
+                continue
+            a, b = find(first), find(i)
+            if a != b and similarity(signatures[first], sig) >= threshold:
+                parent[max(a, b)] = min(a, b)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(texts)):
+        clusters.setdefault(find(i), []).append(i)
+
+    duplicates: dict[SnippetKey, Duplicate] = {}
+    for members in clusters.values():
+        if len(members) == 1 and len(keys_by_text[texts[members[0]]]) == 1:
+            continue
+        # The most copied text is canonical; ties go to the text seen first
+        canonical_text = max(members, key=lambda i: (len(keys_by_text[texts[i]]), -i))
+        canonical = keys_by_text[texts[canonical_text]][0]
+        for i in members:
+            identical = i == canonical_text
+            score = 1.0 if identical else similarity(signatures[i], signatures[canonical_text])
+            if score < threshold:
+                continue
+            for key in keys_by_text[texts[i]]:
+                if key != canonical:
+                    duplicates[key] = Duplicate(canonical, score, identical)
+    return duplicates
+
+
+def duplicates_by_project(duplicates: dict[SnippetKey, Duplicate]) -> dict[str, dict[SnippetKey, Duplicate]]:
+    grouped: dict[str, dict[SnippetKey, Duplicate]] = {}
+    for key, dup in duplicates.items():
+        grouped.setdefault(key[0], {})[key] = dup
+    return grouped
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def print_summary(projects: list[Project], duplicates: dict[SnippetKey, Duplicate], top: int):
+    snippets = dict(iter_snippets(projects))
+    clusters: dict[SnippetKey, list[SnippetKey]] = {}
+    for key, dup in duplicates.items():
+        clusters.setdefault(dup.canonical, []).append(key)
+    exact = sum(1 for dup in duplicates.values() if dup.identical)
+    total_bytes = sum(len(s.encode()) for s in snippets.values())
+    saved_bytes = sum(len(snippets[key].encode()) for key in duplicates)
+
+    table = Table(title="Snippet clusters")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Snippets", str(len(snippets)))
+    table.add_row("Clusters", str(len(clusters)))
+    table.add_row("Linked to a canonical snippet", f"{len(duplicates)} ({exact} identical)")
+    table.add_row("Snippet text", f"{total_bytes / 1024:.1f} KiB")
+    table.add_row("Not repeated on pages", f"{saved_bytes / 1024:.1f} KiB")
+    console.print(table)
+
+    if top and clusters:
+        largest = sorted(clusters.items(), key=lambda kv: (-len(kv[1]), kv[0]))[:top]
+        table = Table(title=f"Largest {len(largest)} clusters")
+        table.add_column("Canonical snippet")
+        table.add_column("Copies", justify="right")
+        table.add_column("Projects", justify="right")
+        for canonical, keys in largest:
+            table.add_row(" › ".join((canonical[0], canonical[2])), str(len(keys)),
+                          str(len({k[0] for k in keys} | {canonical[0]})))
+        console.print(table)
+
+
+def write_clusters_json(duplicates: dict[SnippetKey, Duplicate], path: Path):
+    clusters: dict[SnippetKey, list[dict]] = {}
+    for key, dup in sorted(duplicates.items()):
+        clusters.setdefault(dup.canonical, []).append(
+            {"project": key[0], "kind": key[1], "id": key[2], "similarity": round(dup.similarity, 3),
+             "identical": dup.identical})
+    data = [
+        {"canonical": {"project": c[0], "kind": c[1], "id": c[2]}, "duplicates": members}
+        for c, members in sorted(clusters.items())
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    console.print(f"[green]Wrote:[/green] {path} ({len(data)} clusters)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-identical snippets across projects")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD,
+                        help=f"Minimum estimated similarity to link snippets (default: {SIMILARITY_THRESHOLD})")
+    parser.add_argument("--top", type=int, default=0, help="List the N largest clusters")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write the clusters as JSON")
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        console.print("[red]--threshold must be in (0, 1][/red]")
+        sys.exit(1)
+
+    projects = load_projects(PROJECTS_DIR, skip={"_template"})
+    duplicates = cluster_snippets(projects, args.threshold)
+    print_summary(projects, duplicates, args.top)
+    if args.json:
+        write_clusters_json(duplicates, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0",
+# ]
+# ///
+"""
+Materialize only the files the corpus references, at the commits it references.
+
+`git submodule update` checks out every analyzed repository in full, but the
+analysis only points into a few hundred files. For each project this script
+collects the reference.path / reference.commit pairs in projects/{name}/,
+then builds submodules/{name} as a partial clone:
+
+* `git init` with the source as a promisor remote (`blob:none` filter), so
+  commits and trees are fetched but file contents only on demand;
+* sparse-checkout patterns for exactly the referenced files;
+* a shallow (`--depth 1`) fetch of the referenced commits into
+  refs/kb-sync/, skipped for commits fetched before, so a re-run is cheap;
+* a detached checkout of analyzed_commit (or else the most referenced
+  commit): only the blobs of the sparse paths are downloaded.
+  Referenced files at any other commit are prefetched so that
+  `git show <commit>:<path>` works offline.
+
+Sources are local mirrors (--mirrors DIR holding {name}.git or {name}), a
+remote URL template (--remote "file:///srv/git/{name}.git"), or else the
+.gitmodules URL. Local mirrors are fetched over file:// with filtering
+and by-SHA wants enabled for that upload-pack only, so mirrors need no
+configuration. Projects are synced in parallel (--jobs).
+
+    ./scripts/sync_submodules.py --mirrors /srv/mirrors            # every project with references
+    ./scripts/sync_submodules.py cline openhands --jobs 2
+    ./scripts/sync_submodules.py --remote "file:///cache/{name}.git" --dest /tmp/checkouts
+    ./scripts/sync_submodules.py --dry-run                          # paths and commits per project
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from corpus_model import Project, Reference, load_projects
+from scan_submodules import SUBMODULES_DIR, read_gitmodules
+
+console = Console()
+
+REPO_ROOT = Path(__file__).parent.parent
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+
+# Used for file:// sources, whose upload-pack runs locally with the mirror's own config
+LOCAL_UPLOAD_PACK = "git -c uploadpack.allowFilter=true -c uploadpack.allowAnySHA1InWant=true upload-pack"
+SPARSE_SPECIAL = "\\*?[!#"
+
+
+@dataclass(slots=True)
+class SyncPlan:
+    name: str
+    source: str
+    dest: Path
+    # The commit checked out; the others are only prefetched
+    primary: str
+    # commit -> referenced paths at that commit
+    paths: dict[str, set[str]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SyncResult:
+    name: str
+    commit: str = ""
+    paths: int = 0
+    materialized: int = 0
+    missing: list[str] = field(default_factory=list)
+    fetched: bool = False
+    size_bytes: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+# ── Planning ─────────────────────────────────────────────────────────────────
+
+def project_references(project: Project) -> list[Reference]:
+    refs: list[Reference] = []
+    if project.cli:
+        refs += [inv.reference for inv in project.cli.invocations if inv.reference]
+    if project.sdk:
+        refs += [usage.reference for usage in project.sdk.sdk_usage if usage.reference]
+    for ref_file in project.code_references:
+        refs += ref_file.references
+    return refs
+
+
+def referenced_paths(project: Project) -> tuple[str | None, dict[str, set[str]]]:
+    """(commit to check out, commit -> paths); references without a commit use analyzed_commit."""
+    default = project.metadata.analyzed_commit if project.metadata else None
+    paths: dict[str, set[str]] = {}
+    counts: Counter[str] = Counter()
+    for ref in project_references(project):
+        commit = ref.commit or default
+        if commit and ref.path:
+            paths.setdefault(commit, set()).add(ref.path.lstrip("/"))
+            counts[commit] += 1
+    if not paths:
+        return None, {}
+    primary = default if default in paths else max(counts, key=lambda c: (counts[c], c))
+    return primary, paths
+
+
+def source_url(name: str, gitmodules_url: str, mirrors: Path | None, remote: str | None) -> str:
+    if mirrors:
+        for candidate in (mirrors / f"{name}.git", mirrors / name):
+            if candidate.is_dir():
+                return candidate.absolute().as_uri()
+    if remote:
+        return remote.format(name=name)
+    return gitmodules_url
+
+
+def plan_sync(names: list[str], dest_dir: Path, mirrors: Path | None, remote: str | None) -> list[SyncPlan]:
+    modules = {m["name"]: m for m in read_gitmodules()}
+    projects = {p.name: p for p in load_projects(PROJECTS_DIR, skip={"_template"})}
+    plans = []
+    for name in names or sorted(modules.keys() & projects.keys()):
+        if name not in projects:
+            raise ValueError(f"unknown project: {name}")
+        primary, paths = referenced_paths(projects[name])
+        if not primary:
+            continue
+        url = modules.get(name, {}).get("url") or (projects[name].metadata.repository
+                                                   if projects[name].metadata else None) or ""
+        plans.append(SyncPlan(name, source_url(name, url, mirrors, remote), dest_dir / name, primary, paths))
+    return plans
+
+
+# ── Git ──────────────────────────────────────────────────────────────────────
+
+def run_git(root: Path, *args: str, stdin: str | None = None, ok: tuple[int, ...] = (0,)) -> subprocess.CompletedProcess:
+    """Run git in root; an exit status outside ok raises RuntimeError with git's last error line."""
+    result = subprocess.run(["git", "-C", str(root), *args], input=stdin, capture_output=True, text=True, check=False)
+    if result.returncode not in ok:
+        raise RuntimeError(f"git {args[0]}: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode}")
+    return result
+
+
+def git(root: Path, *args: str, stdin: str | None = None) -> str:
+    return run_git(root, *args, stdin=stdin).stdout
+
+
+def fetched_ref(commit: str) -> str:
+    return f"refs/kb-sync/{commit}"
+
+
+def was_fetched(root: Path, commit: str) -> bool:
+    # Not `cat-file -e`: in a partial clone, asking for a missing object fetches it
+    # Exit status 1: no such ref; anything else is an error, not "not fetched"
+    return run_git(root, "show-ref", "--verify", "--quiet", fetched_ref(commit), ok=(0, 1)).returncode == 0
+
+
+def sparse_pattern(path: str) -> str:
+    """An anchored non-cone pattern matching exactly one file."""
+    return "/" + "".join(f"\\{c}" if c in SPARSE_SPECIAL else c for c in path)
+
+
+def directory_size(root: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def sync_project(plan: SyncPlan) -> SyncResult:
+    started = time.perf_counter()
+    result = SyncResult(plan.name, commit=plan.primary, paths=len(plan.paths[plan.primary]))
+    try:
+        dest = plan.dest
+        if not (dest / ".git").exists():
+            dest.mkdir(parents=True, exist_ok=True)
+            git(dest, "init", "--quiet")
+            git(dest, "remote", "add", "origin", plan.source)
+        else:
+            git(dest, "remote", "set-url", "origin", plan.source)
+        git(dest, "config", "remote.origin.promisor", "true")
+        git(dest, "config", "remote.origin.partialclonefilter", "blob:none")
+        if plan.source.startswith("file://"):
+            git(dest, "config", "remote.origin.uploadpack", LOCAL_UPLOAD_PACK)
+        else:
+            # Exit status 5: the key was not set
+            run_git(dest, "config", "--unset", "remote.origin.uploadpack", ok=(0, 5))
+
+        git(dest, "sparse-checkout", "set", "--no-cone", "--stdin",
+            stdin="".join(sparse_pattern(p) + "\n" for p in sorted(plan.paths[plan.primary])))
+
+        wanted = [c for c in sorted(plan.paths) if not was_fetched(dest, c)]
+        if wanted:
+            git(dest, "fetch", "--quiet", "--no-tags", "--filter=blob:none", "--depth=1", "origin",
+                *(f"{c}:{fetched_ref(c)}" for c in wanted))
+            result.fetched = True
+        # Checking out downloads just the blobs the sparse patterns match
+        git(dest, "-c", "advice.detachedHead=false", "checkout", "--quiet", "--detach", plan.primary)
+
+        for commit, paths in plan.paths.items():
+            listed = set(git(dest, "ls-tree", "-r", "--name-only", "-z", commit, "--", *sorted(paths)).split("\0"))
+            result.missing += sorted(f"{p}@{commit[:12]}" for p in paths - listed)
+            if commit == plan.primary:
+                result.materialized = sum(1 for p in paths & listed if (dest / p).is_file())
+            elif paths & listed:
+                # Reading the blobs makes the promisor remote fetch them now rather than when first needed
+                git(dest, "cat-file", "--batch", stdin="".join(f"{commit}:{p}\n" for p in sorted(paths & listed)))
+        result.size_bytes = directory_size(dest)
+    except (OSError, RuntimeError) as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def print_plans(plans: list[SyncPlan]):
+    for plan in plans:
+        console.print(f"[bold]{plan.name}[/bold] <- {plan.source}")
+        for commit, paths in sorted(plan.paths.items(), key=lambda kv: kv[0] != plan.primary):
+            label = "checkout" if commit == plan.primary else "prefetch"
+            console.print(f"  {label} {commit[:12]}: {len(paths)} path(s)")
+            for path in sorted(paths):
+                console.print(f"    {path}", style="dim")
+
+
+def print_results(results: list[SyncResult], elapsed: float):
+    table = Table(title="Sparse submodule sync")
+    table.add_column("Project", style="cyan")
+    table.add_column("Commit")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Status")
+    for r in results:
+        status = f"[red]{r.error}[/red]" if r.error else "fetched" if r.fetched else "up to date"
+        if r.missing and not r.error:
+            status += f" [yellow]({len(r.missing)} path(s) not in the tree)[/yellow]"
+        table.add_row(r.name, r.commit[:12], f"{r.materialized}/{r.paths}", f"{r.size_bytes / 2**20:.1f} MiB",
+                      f"{r.seconds:.1f}", status)
+    console.print(table)
+    for r in results:
+        for missing in r.missing:
+            console.print(f"  [yellow]{r.name}: {missing} is referenced but not in the repository[/yellow]")
+    total = sum(r.size_bytes for r in results)
+    console.print(f"[dim]{len(results)} project(s), {total / 2**20:.1f} MiB on disk, {elapsed:.1f} s[/dim]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize only the referenced files of each submodule")
+    parser.add_argument("names", nargs="*", help="Project names (default: every submodule with references)")
+    parser.add_argument("--mirrors", type=Path, metavar="DIR", help="Directory of local mirrors ({name}.git or {name})")
+    parser.add_argument("--remote", metavar="URL", help='Source URL template, e.g. "file:///srv/git/{name}.git"')
+    parser.add_argument("--dest", type=Path, default=SUBMODULES_DIR, help="Where checkouts go (default: submodules/)")
+    parser.add_argument("--jobs", "-j", type=int, default=4, help="Projects synced in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Print what would be fetched and exit")
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    try:
+        plans = plan_sync(args.names, args.dest, args.mirrors, args.remote)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    if not plans:
+        console.print("[yellow]No referenced paths to materialize.[/yellow]")
+        return
+    if args.dry_run:
+        print_plans(plans)
+        return
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(sync_project, plans))
+    print_results(results, time.perf_counter() - started)
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,16 @@ Usage:
     ./scripts/verify_yamls.py                    # Verify all
     ./scripts/verify_yamls.py projects/goose/    # Verify specific project
     ./scripts/verify_yamls.py --spec-only        # Only validate specs
+
+Data files are validated while they are parsed: each references[] item of
+a code-reference file is checked against the spec's item_fields and
+discarded before the next one is read, so memory is bounded by one item
+even for generated files with tens of thousands of references. Errors
+carry the line and column of the offending value.
 """
 
+import functools
+import os
 import sys
 from pathlib import Path
 from typing import Any
@@ -23,14 +31,24 @@ import yaml
 from rich.console import Console
 from rich.table import Table
 
+import instrumentation
+from corpus_model import spec_drift
+
 console = Console()
 
 REPO_ROOT = Path(__file__).parent.parent
 SPECS_DIR = REPO_ROOT / "specs"
-PROJECTS_DIR = REPO_ROOT / "projects"
+# KB_PROJECTS_DIR points the script at another corpus (e.g. a synthetic one for benchmarks)
+PROJECTS_DIR = Path(os.environ.get("KB_PROJECTS_DIR", REPO_ROOT / "projects")).absolute()
+# libyaml's parser when available; the events are composed here either way
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Top-level lists checked item by item while parsing. The other lists with
+# item_fields (invocations, sdk_usage) are short and not item-checked: the
+# corpus uses enum values those item specs do not list yet.
+STREAMED_LISTS = {"references"}
 
 
-def load_yaml(path: Path) -> dict[str, Any] | None:
+def read_yaml(path: Path) -> dict[str, Any] | None:
     """Load and parse a YAML file."""
     try:
         with open(path) as f:
@@ -43,6 +61,11 @@ def load_yaml(path: Path) -> dict[str, Any] | None:
         return None
 
 
+def load_yaml(path: Path) -> dict[str, Any] | None:
+    """read_yaml() for the data files being verified: the "parse" stage of --timings."""
+    return read_yaml(path)
+
+
 def get_spec_type_from_filename(filename: str) -> str | None:
     """Extract spec type from filename pattern: name.{type}.yaml"""
     parts = filename.rsplit(".", 2)
@@ -52,17 +75,42 @@ def get_spec_type_from_filename(filename: str) -> str | None:
 
 
 def load_spec(spec_type: str) -> dict[str, Any] | None:
-    """Load a spec file by type."""
+    """Load a spec file by type.
+
+    Reads with read_yaml() rather than load_yaml() so that "spec load" and
+    "parse" are separate stages, not one counted inside the other.
+    """
     spec_path = SPECS_DIR / f"{spec_type}.spec.yaml"
-    return load_yaml(spec_path)
+    return read_yaml(spec_path)
+
+
+@functools.cache
+def spec_for(spec_type: str) -> dict[str, Any] | None:
+    """The spec of a file type, loaded once per run however many files use it."""
+    return load_spec(spec_type)
+
+
+def display_path(path: Path) -> str:
+    """Path relative to the repository, or absolute for a KB_PROJECTS_DIR corpus outside it."""
+    path, root = path.absolute(), REPO_ROOT.absolute()
+    return str(path.relative_to(root) if path.is_relative_to(root) else path)
+
+
+def position(mark: yaml.Mark) -> str:
+    return f"(line {mark.line + 1}, column {mark.column + 1})"
 
 
 def validate_required_fields(
     data: dict[str, Any],
     spec: dict[str, Any],
-    path: str = ""
+    path: str = "",
+    marks: dict[str, yaml.Mark] | None = None,
 ) -> list[str]:
-    """Validate required fields are present."""
+    """Validate required fields are present.
+
+    marks: field name -> where its value starts ("" = the mapping itself),
+    appended to each error as a line/column position.
+    """
     errors = []
     fields = spec.get("fields", {})
 
@@ -70,6 +118,7 @@ def validate_required_fields(
         if not isinstance(field_spec, dict):
             continue
 
+        reported = len(errors)
         field_path = f"{path}.{field_name}" if path else field_name
         is_required = field_spec.get("required", False)
 
@@ -103,32 +152,136 @@ def validate_required_fields(
                 if isinstance(value, str) and value and not (value.startswith("http://") or value.startswith("https://")):
                     errors.append(f"Field {field_path} should be a URL, got: {value[:50]}...")
 
+        mark = marks and (marks.get(field_name) or marks.get(""))
+        if mark:
+            errors[reported:] = [f"{error} {position(mark)}" for error in errors[reported:]]
+
     return errors
 
 
+# ── Streaming validation ─────────────────────────────────────────────────────
+
+def compose(loader: yaml.SafeLoader, anchors: dict[str, yaml.Node]) -> yaml.Node:
+    """Build the node of the next value from parser events.
+
+    This is the loader's composer, which libyaml's parser only exposes for
+    whole documents; composing one value at a time is what lets a list be
+    read item by item.
+    """
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(None, None, f"found undefined alias {event.anchor!r}", event.start_mark)
+        return anchors[event.anchor]
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+    elif isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(compose(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+    else:
+        tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.MappingNode, None, event.implicit)
+        node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = compose(loader, anchors)
+            node.value.append((key, compose(loader, anchors)))
+        node.end_mark = loader.get_event().end_mark
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    return node
+
+
+def value_marks(node: yaml.MappingNode) -> dict[str, yaml.Mark]:
+    marks = {"": node.start_mark}
+    for key, value in node.value:
+        if isinstance(key, yaml.ScalarNode):
+            marks[key.value] = value.start_mark
+    return marks
+
+
+def validate_item(loader: yaml.SafeLoader, node: yaml.Node, spec: dict[str, Any], path: str) -> list[str]:
+    if not isinstance(node, yaml.MappingNode):
+        return [f"Field {path} should be object {position(node.start_mark)}"]
+    # construct_document() also drops the loader's references to the constructed item
+    return validate_required_fields(loader.construct_document(node), spec, path, value_marks(node))
+
+
+def validate_stream(file_path: Path, spec: dict[str, Any]) -> list[str]:
+    """Validate a data file against its spec while parsing it."""
+    fields = spec.get("fields", {})
+    streamed = {
+        name: {"fields": field_spec["item_fields"]} for name, field_spec in fields.items()
+        if name in STREAMED_LISTS and isinstance(field_spec, dict) and isinstance(field_spec.get("item_fields"), dict)
+    }
+    errors = []
+    anchors: dict[str, yaml.Node] = {}
+    with open(file_path, "rb") as f:
+        loader = YAML_LOADER(f)
+        try:
+            loader.get_event()
+            if loader.check_event(yaml.StreamEndEvent):
+                # An empty file is an empty mapping, as for load_yaml()
+                return validate_required_fields({}, spec)
+            loader.get_event()
+            if not loader.check_event(yaml.MappingStartEvent):
+                node = compose(loader, anchors)
+                return [f"Document should be a mapping {position(node.start_mark)}"]
+
+            start = loader.get_event()
+            data, marks = {}, {"": start.start_mark}
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = compose(loader, anchors)
+                key = loader.construct_document(key_node)
+                if key in streamed and loader.check_event(yaml.SequenceStartEvent):
+                    marks[key] = loader.get_event().start_mark
+                    data[key] = []
+                    index = 0
+                    while not loader.check_event(yaml.SequenceEndEvent):
+                        errors += validate_item(loader, compose(loader, anchors), streamed[key], f"{key}[{index}]")
+                        index += 1
+                    loader.get_event()
+                else:
+                    node = compose(loader, anchors)
+                    marks[key] = node.start_mark
+                    data[key] = loader.construct_document(node)
+            loader.get_event()
+            loader.get_event()
+            if not loader.check_event(yaml.StreamEndEvent):
+                extra = loader.get_event()
+                return [f"Expected a single document, found another {position(extra.start_mark)}"]
+        except yaml.YAMLError as e:
+            mark = getattr(e, "problem_mark", None)
+            problem = getattr(e, "problem", None) or str(e)
+            return [f"Failed to parse YAML: {problem}" + (f" {position(mark)}" if mark else "")]
+        finally:
+            loader.dispose()
+
+    return validate_required_fields(data, spec, marks=marks) + errors
+
+
 def validate_file(file_path: Path) -> tuple[bool, list[str]]:
     """Validate a single YAML file against its spec."""
     errors = []
 
-    # Load the file
-    data = load_yaml(file_path)
-    if data is None:
-        return False, ["Failed to parse YAML"]
-
     # Determine spec type from filename
     spec_type = get_spec_type_from_filename(file_path.name)
     if not spec_type:
         # Not a typed file, just check valid YAML
+        if load_yaml(file_path) is None:
+            return False, ["Failed to parse YAML"]
         return True, []
 
     # Load the spec
-    spec = load_spec(spec_type)
+    spec = spec_for(spec_type)
     if spec is None:
         errors.append(f"Unknown spec type: {spec_type}")
         return False, errors
 
-    # Validate against spec
-    errors.extend(validate_required_fields(data, spec))
+    # Validate against spec, item by item as the file is parsed
+    errors.extend(validate_stream(file_path, spec))
 
     return len(errors) == 0, errors
 
@@ -138,17 +291,24 @@ def validate_specs() -> tuple[int, int]:
     valid = 0
     invalid = 0
 
+    specs = {}
+
     console.print("\n[bold]Validating spec files...[/bold]")
 
     for spec_file in SPECS_DIR.glob("*.spec.yaml"):
-        data = load_yaml(spec_file)
+        data = read_yaml(spec_file)
         if data is not None:
             console.print(f"  [green]✓[/green] {spec_file.name}")
             valid += 1
+            specs[spec_file.name.removesuffix(".spec.yaml")] = data
         else:
             console.print(f"  [red]✗[/red] {spec_file.name}")
             invalid += 1
 
+    # The typed model in corpus_model.py mirrors the specs by hand
+    for field_path in spec_drift(specs):
+        console.print(f"  [yellow]![/yellow] corpus_model.py has no attribute for {field_path}")
+
     return valid, invalid
 
 
@@ -164,7 +324,7 @@ def validate_project(project_path: Path) -> tuple[int, int, list[tuple[str, list
             valid += 1
         else:
             invalid += 1
-            all_errors.append((str(yaml_file.relative_to(REPO_ROOT)), errors))
+            all_errors.append((display_path(yaml_file), errors))
 
     return valid, invalid, all_errors
 
@@ -192,6 +352,14 @@ def main():
     args = sys.argv[1:]
 
     spec_only = "--spec-only" in args
+    instrumentation.configure("verify_yamls", timings="--timings" in args, profile="--profile" in args)
+    instrumentation.instrument(globals(), {
+        "load_yaml": "parse",
+        "load_spec": "spec load",
+        "validate_required_fields": "validate",
+        "validate_stream": "stream",
+        "validate_specs": "specs",
+    })
     args = [a for a in args if not a.startswith("--")]
 
     # Validate specs